@@ -0,0 +1,79 @@
+"""Add per-user dashboard counter tables
+
+Revision ID: 003_add_user_dashboard_stats
+Revises: 002_update_password_hash_length
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_user_dashboard_stats'
+down_revision: Union[str, Sequence[str], None] = '002_update_password_hash_length'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def upgrade() -> None:
+    """Upgrade schema - add dashboard counters and backfill them from the applications table."""
+    op.create_table('user_dashboard_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_applications', sa.Integer(), nullable=False),
+        sa.Column('interviews_scheduled', sa.Integer(), nullable=False),
+        sa.Column('offers_received', sa.Integer(), nullable=False),
+        sa.Column('high_priority_applications', sa.Integer(), nullable=False),
+        sa.Column('rate_sum', sa.Float(), nullable=False),
+        sa.Column('rate_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Daily buckets keyed by applied_date for the "this week" and "today" metrics
+    op.create_table('user_daily_application_count',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from existing applications; `flask reconcile-dashboard-stats` does the same at any time
+    applications = _applications_table()
+    op.execute(f"""
+        INSERT INTO user_dashboard_stats (user_id, total_applications, interviews_scheduled, offers_received,
+                                          high_priority_applications, rate_sum, rate_count, updated_at)
+        SELECT user_id,
+               COUNT(id),
+               SUM(CASE WHEN lower(status) LIKE '%interview%' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN lower(status) LIKE '%offer%' AND lower(status) NOT LIKE '%interview%' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN lower(priority_level) = 'high' THEN 1 ELSE 0 END),
+               COALESCE(SUM(hourly_rate), 0),
+               COUNT(hourly_rate),
+               CURRENT_TIMESTAMP
+        FROM {applications}
+        GROUP BY user_id
+    """)
+    op.execute(f"""
+        INSERT INTO user_daily_application_count (user_id, day, count)
+        SELECT user_id, applied_date, COUNT(id)
+        FROM {applications}
+        WHERE applied_date IS NOT NULL
+        GROUP BY user_id, applied_date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop dashboard counters."""
+    op.drop_table('user_daily_application_count')
+    op.drop_table('user_dashboard_stats')
@@ -0,0 +1,45 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 004_add_keyset_pagination_indexes
+Revises: 003_add_user_dashboard_stats
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_keyset_pagination_indexes'
+down_revision: Union[str, Sequence[str], None] = '003_add_user_dashboard_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name):
+    return name in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def upgrade() -> None:
+    """Upgrade schema - index (user_id, updated_at, id) for cursor pagination."""
+    op.create_index('ix_job_applications_user_id_updated_at_id', _applications_table(),
+                    ['user_id', 'updated_at', 'id'], unique=False)
+    # target_company is created by db.create_all() rather than by an earlier revision
+    if _has_table('target_company'):
+        op.create_index('ix_target_company_user_id_updated_at_id', 'target_company',
+                        ['user_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the pagination indexes."""
+    if _has_table('target_company'):
+        op.drop_index('ix_target_company_user_id_updated_at_id', table_name='target_company')
+    op.drop_index('ix_job_applications_user_id_updated_at_id', table_name=_applications_table())
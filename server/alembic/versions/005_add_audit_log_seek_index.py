@@ -0,0 +1,41 @@
+"""Add audit log seek index and per-user row counter
+
+Revision ID: 005_add_audit_log_seek_index
+Revises: 004_add_keyset_pagination_indexes
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_audit_log_seek_index'
+down_revision: Union[str, Sequence[str], None] = '004_add_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index (user_id, timestamp, id) and add audit_log_counter."""
+    op.create_index('ix_audit_log_user_id_timestamp_id', 'audit_log',
+                    ['user_id', 'timestamp', 'id'], unique=False)
+
+    op.create_table('audit_log_counter',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.execute("""
+        INSERT INTO audit_log_counter (user_id, total)
+        SELECT user_id, COUNT(id) FROM audit_log GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop audit_log_counter and the seek index."""
+    op.drop_table('audit_log_counter')
+    op.drop_index('ix_audit_log_user_id_timestamp_id', table_name='audit_log')
@@ -0,0 +1,40 @@
+"""Add composite indexes for per-user status and applied_date filters
+
+Revision ID: 006_add_per_user_filter_indexes
+Revises: 005_add_audit_log_seek_index
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_per_user_filter_indexes'
+down_revision: Union[str, Sequence[str], None] = '005_add_audit_log_seek_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def upgrade() -> None:
+    """Upgrade schema - index applications by (user_id, status) and (user_id, applied_date)."""
+    applications = _applications_table()
+    op.create_index('ix_job_applications_user_id_status', applications,
+                    ['user_id', 'status'], unique=False)
+    op.create_index('ix_job_applications_user_id_applied_date', applications,
+                    ['user_id', 'applied_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the per-user filter indexes."""
+    applications = _applications_table()
+    op.drop_index('ix_job_applications_user_id_applied_date', table_name=applications)
+    op.drop_index('ix_job_applications_user_id_status', table_name=applications)
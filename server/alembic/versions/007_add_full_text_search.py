@@ -0,0 +1,41 @@
+"""Add full-text search over applications and target companies
+
+Revision ID: 007_add_full_text_search
+Revises: 006_add_per_user_filter_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from search import install_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_full_text_search'
+down_revision: Union[str, Sequence[str], None] = '006_add_per_user_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def _companies_table():
+    # target_company is created by db.create_all() rather than by an earlier revision
+    return 'target_company' if 'target_company' in sa.inspect(op.get_bind()).get_table_names() else None
+
+
+def upgrade() -> None:
+    """Upgrade schema - FTS5 tables and triggers on SQLite, tsvector + GIN on PostgreSQL."""
+    install_search_index(op.get_bind(), _applications_table(), _companies_table())
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the search structures."""
+    drop_search_index(op.get_bind(), _applications_table(), _companies_table())
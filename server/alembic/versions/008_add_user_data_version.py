@@ -0,0 +1,34 @@
+"""Add per-user data version for conditional GETs
+
+Revision ID: 008_add_user_data_version
+Revises: 007_add_full_text_search
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_user_data_version'
+down_revision: Union[str, Sequence[str], None] = '007_add_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add user_data_version."""
+    # No backfill: a missing row reads as version 0, and no ETag has been issued yet
+    op.create_table('user_data_version',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop user_data_version."""
+    op.drop_table('user_data_version')
@@ -0,0 +1,73 @@
+"""Hash-partition job_applications and audit_log on user_id
+
+Revision ID: 010_partition_by_user_id
+Revises: 009_add_revoked_tokens
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import logging
+import os
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from partitioning import MONTHS_AHEAD, is_partitioned, month_range, partition_table, unpartition_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_partition_by_user_id'
+down_revision: Union[str, Sequence[str], None] = '009_add_revoked_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+log = logging.getLogger('alembic.runtime.migration')
+
+# Rows copied per transaction, and seconds to sleep between batches to leave the database room
+BATCH_SIZE = int(os.environ.get('PARTITION_BATCH_SIZE', 5000))
+BATCH_PAUSE = float(os.environ.get('PARTITION_BATCH_PAUSE', 0))
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def _audit_months():
+    # Months still inside the audit retention window, and the next MONTHS_AHEAD. Older rows stay in the
+    # DEFAULT partitions until archive-audit-log moves them out.
+    today = date.today()
+    retention = int(os.environ.get('AUDIT_RETENTION_DAYS', 90))
+    return list(month_range(today - timedelta(days=retention), today + timedelta(days=MONTHS_AHEAD * 31)))
+
+
+def upgrade() -> None:
+    """Upgrade schema - online, batched conversion to hash partitions (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Each batch and the swap commit on their own, so the copy holds no long transaction
+    with op.get_context().autocommit_block():
+        engine = op.get_bind().engine
+        options = {'batch_size': BATCH_SIZE, 'pause': BATCH_PAUSE, 'log': log.info}
+        applications = _applications_table()
+        if not is_partitioned(op.get_bind(), applications):
+            partition_table(engine, applications, ('id', 'user_id'), **options)
+        if not is_partitioned(op.get_bind(), 'audit_log'):
+            partition_table(engine, 'audit_log', ('id', 'user_id', 'timestamp'),
+                            month_column='timestamp', months=_audit_months(), **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema - copy both tables back into plain tables."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        engine = op.get_bind().engine
+        options = {'batch_size': BATCH_SIZE, 'pause': BATCH_PAUSE, 'log': log.info}
+        if is_partitioned(op.get_bind(), 'audit_log'):
+            unpartition_table(engine, 'audit_log', nullable=('timestamp',), **options)
+        applications = _applications_table()
+        if is_partitioned(op.get_bind(), applications):
+            unpartition_table(engine, applications, **options)
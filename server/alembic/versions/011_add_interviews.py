@@ -0,0 +1,52 @@
+"""Add interview
+
+Revision ID: 011_add_interviews
+Revises: 010_partition_by_user_id
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_add_interviews'
+down_revision: Union[str, Sequence[str], None] = '010_partition_by_user_id'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add interview."""
+    # application_id has no foreign key: the applications table is hash-partitioned on
+    # PostgreSQL (010), where id alone can't be referenced
+    op.create_table('interview',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('company', sa.String(length=200), nullable=False),
+        sa.Column('role_title', sa.String(length=200), nullable=False),
+        sa.Column('interview_type', sa.String(length=100), nullable=False),
+        sa.Column('scheduled_at', sa.DateTime(), nullable=False),
+        sa.Column('interviewer', sa.String(length=200), nullable=True),
+        sa.Column('questions', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Date windows scan one user's range of scheduled_at; application_id serves unlinking
+    op.create_index('ix_interview_user_id_scheduled_at_id', 'interview',
+                    ['user_id', 'scheduled_at', 'id'], unique=False)
+    op.create_index('ix_interview_user_id_application_id', 'interview',
+                    ['user_id', 'application_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop interview."""
+    op.drop_index('ix_interview_user_id_application_id', table_name='interview')
+    op.drop_index('ix_interview_user_id_scheduled_at_id', table_name='interview')
+    op.drop_table('interview')
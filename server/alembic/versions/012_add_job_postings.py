@@ -0,0 +1,41 @@
+"""Add job_posting
+
+Revision ID: 012_add_job_postings
+Revises: 011_add_interviews
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012_add_job_postings'
+down_revision: Union[str, Sequence[str], None] = '011_add_interviews'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add job_posting."""
+    # Shared by every user and only appended to: workers load new rows by id
+    op.create_table('job_posting',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company', sa.String(length=200), nullable=False),
+        sa.Column('position', sa.String(length=200), nullable=False),
+        sa.Column('industry', sa.String(length=100), nullable=True),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('salary_range', sa.String(length=100), nullable=True),
+        sa.Column('remote_policy', sa.String(length=50), nullable=True),
+        sa.Column('apply_link', sa.String(length=500), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop job_posting."""
+    op.drop_table('job_posting')
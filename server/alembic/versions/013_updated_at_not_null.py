@@ -0,0 +1,52 @@
+"""Backfill updated_at and make it NOT NULL
+
+Revision ID: 013_updated_at_not_null
+Revises: 012_add_job_postings
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from search import install_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_updated_at_not_null'
+down_revision: Union[str, Sequence[str], None] = '012_add_job_postings'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables():
+    # The initial revision names the applications table job_applications, db.create_all()
+    # job_application; target_company is created by db.create_all() rather than by a revision
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    applications = 'job_applications' if 'job_applications' in tables else 'job_application'
+    return applications, 'target_company' if 'target_company' in tables else None
+
+
+def _alter_updated_at(nullable):
+    applications, companies = _tables()
+    for table in filter(None, (applications, companies)):
+        if not nullable:
+            op.execute(f'UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) '
+                       f'WHERE updated_at IS NULL')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=nullable)
+    if op.get_bind().dialect.name == 'sqlite':
+        # Batch mode rebuilds SQLite tables, which drops the search triggers installed by 007
+        drop_search_index(op.get_bind(), applications, companies)
+        install_search_index(op.get_bind(), applications, companies)
+
+
+def upgrade() -> None:
+    """Upgrade schema - keyset pagination cursors need a non-NULL updated_at."""
+    _alter_updated_at(nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - allow NULL updated_at again."""
+    _alter_updated_at(nullable=True)
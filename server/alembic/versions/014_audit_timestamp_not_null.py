@@ -0,0 +1,36 @@
+"""Make audit_log.timestamp NOT NULL
+
+Revision ID: 014_audit_timestamp_not_null
+Revises: 013_updated_at_not_null
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from partitioning import is_partitioned
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_audit_timestamp_not_null'
+down_revision: Union[str, Sequence[str], None] = '013_updated_at_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - the audit log pages on (timestamp, id), which a NULL timestamp can't take part in."""
+    # A row of unknown age is kept for the full retention window rather than archived at once
+    op.execute('UPDATE audit_log SET timestamp = CURRENT_TIMESTAMP WHERE timestamp IS NULL')
+    with op.batch_alter_table('audit_log') as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - allow a NULL timestamp again, unless it is the partition key."""
+    if op.get_bind().dialect.name == 'postgresql' and is_partitioned(op.get_bind(), 'audit_log'):
+        return
+    with op.batch_alter_table('audit_log') as batch_op:
+        batch_op.alter_column('timestamp', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,50 @@
+"""Index the owner in the PostgreSQL search vectors
+
+Revision ID: 015_search_owner_lexeme
+Revises: 014_audit_timestamp_not_null
+Create Date: 2026-10-20 10:00:00.000000
+
+The search_vector columns of 007 are rebuilt with an "@u<user_id>" lexeme, so
+the GIN index finds a user's matches without visiting every tenant's. Like
+007, this drops and re-adds a generated column, which rewrites each table and
+holds an ACCESS EXCLUSIVE lock on it until the rewrite and the index build are
+done: reads and writes to the table wait meanwhile. Run it in a maintenance
+window on large tables. Nothing changes on SQLite, whose FTS5 tables already
+index the owner.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from search import install_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015_search_owner_lexeme'
+down_revision: Union[str, Sequence[str], None] = '014_audit_timestamp_not_null'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _applications_table():
+    # The initial revision names it job_applications, db.create_all() job_application
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    return 'job_applications' if 'job_applications' in tables else 'job_application'
+
+
+def _companies_table():
+    # target_company is created by db.create_all() rather than by an earlier revision
+    return 'target_company' if 'target_company' in sa.inspect(op.get_bind()).get_table_names() else None
+
+
+def upgrade() -> None:
+    """Upgrade schema - rebuild the search vectors with the owner lexeme (PostgreSQL only)."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    drop_search_index(op.get_bind(), _applications_table(), _companies_table())
+    install_search_index(op.get_bind(), _applications_table(), _companies_table())
+
+
+def downgrade() -> None:
+    """Downgrade schema - nothing to undo: earlier releases' searches ignore the owner lexeme."""
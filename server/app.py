@@ -1,23 +1,53 @@
-from flask import Flask, render_template, jsonify, send_from_directory, request
+from flask import Flask, render_template, jsonify, send_from_directory, request, Response, stream_with_context, has_request_context
 from flask_cors import CORS
-from flask_restful import Api, Resource, reqparse
+from flask_restful import Api, Resource
+from flask_restful.utils import unpack
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity, get_jwt
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from flask_jwt_extended import (JWTManager, create_access_token, create_refresh_token, decode_token, jwt_required,
+                                get_jwt_identity, get_jwt, verify_jwt_in_request)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, date, timezone
 import os
 import uuid
 import requests
 import json
+import click
+import base64
+import threading
+import csv
+import io
+import time
+import hashlib
+import functools
+import itertools
+from audit_writer import AsyncAuditWriter
+from audit_archive import AuditArchive
+from search import install_search_index, search_ids, search_terms
+from serializers import RowSerializer, dumps, output_json
+from schemas import Schema, Field
+from password_hasher import PasswordHasher, HasherBusy
+from response_cache import MemoryResponseCache, SQLiteResponseCache
+from token_revocation import RevocationStore
+from db_tuning import engine_options, engine_settings, install_sqlite_pragmas, pool_status
+from replica_router import ReplicaRouter
+from partitioning import MONTHS_AHEAD, ensure_month_partitions, is_partitioned, month_range
+from resume_parser import parse_resume
+from resume_store import ParserBusy, ResumeStore, ResumeTooLarge
+from job_matcher import JobMatcher
 
 # Initialize Flask app and extensions
 app = Flask(__name__, static_folder='../src', template_folder='../templates')
 
 # Enable CORS for all routes, allowing requests from localhost:3000 (React dev server)
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000"]
 CORS(app, resources={
-    r"/api/*": {"origins": ["http://localhost:3000", "http://127.0.0.1:3000"]},
-    r"/": {"origins": ["http://localhost:3000", "http://127.0.0.1:3000"]}
+    r"/api/*": {"origins": CORS_ORIGINS},
+    r"/": {"origins": CORS_ORIGINS}
 })
 
 # Configuration - try to use PostgreSQL if available, fallback to SQLite
@@ -30,16 +60,124 @@ if use_postgresql:
         # Fix for Heroku-style postgres:// URLs
         database_url = database_url.replace('postgres://', 'postgresql://', 1)
 else:
-    database_url = 'sqlite:///jobtracker.db'  # Use SQLite for testing
+    # Use SQLite for testing; SQLITE_DATABASE_URL points it elsewhere (the test suite uses a temporary file)
+    database_url = os.environ.get('SQLITE_DATABASE_URL', 'sqlite:///jobtracker.db')
 
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+# Optional read replicas, as comma-separated URLs (absolute paths for SQLite). GET requests read
+# from them, except for users who wrote within the last REPLICA_STICKY_SECONDS; a replica that
+# fails is skipped for REPLICA_RETRY_SECONDS.
+app.config['SQLALCHEMY_REPLICA_URLS'] = [
+    url.strip().replace('postgres://', 'postgresql://', 1)
+    for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()
+]
+app.config['REPLICA_STICKY_SECONDS'] = float(os.environ.get('REPLICA_STICKY_SECONDS', 5.0))
+app.config['REPLICA_RETRY_SECONDS'] = float(os.environ.get('REPLICA_RETRY_SECONDS', 30.0))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool and driver limits; unset ones take the defaults for the database in use
+# (db_tuning.DIALECT_DEFAULTS)
+for key in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE',
+            'DB_STATEMENT_TIMEOUT_MS', 'DB_CONNECT_TIMEOUT'):
+    app.config[key] = int(os.environ[key]) if os.environ.get(key) else None
+app.config['DB_POOL_PRE_PING'] = os.environ['DB_POOL_PRE_PING'].lower() == 'true' if os.environ.get('DB_POOL_PRE_PING') else None
+# PRAGMAs run on every new SQLite connection
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+}
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(database_url, app.config)
 app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-this')  # Change this in production
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600  # 1 hour
-
-db = SQLAlchemy(app)
-api = Api(app)
+# Refresh tokens are single use: /api/auth/refresh revokes the one presented and issues a new pair
+app.config['JWT_REFRESH_TOKEN_EXPIRES'] = int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', 30 * 24 * 3600))
+# Seconds between each worker's reads of revocations made by other workers
+app.config['TOKEN_REVOCATION_SYNC_INTERVAL'] = float(os.environ.get('TOKEN_REVOCATION_SYNC_INTERVAL', 5.0))
+# Audit log writes: 'sync' writes them in the same transaction as the change, 'async' hands
+# them to a background batch writer after the change commits
+app.config['AUDIT_MODE'] = os.environ.get('AUDIT_MODE', 'sync').lower()
+app.config['AUDIT_QUEUE_SIZE'] = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+app.config['AUDIT_BATCH_SIZE'] = int(os.environ.get('AUDIT_BATCH_SIZE', 500))
+app.config['AUDIT_FLUSH_INTERVAL'] = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 1.0))
+app.config['AUDIT_SPOOL_PATH'] = os.environ.get('AUDIT_SPOOL_PATH', 'audit_spool.jsonl')
+# Audit rows older than the retention window are moved to compressed archive files
+app.config['AUDIT_RETENTION_DAYS'] = int(os.environ.get('AUDIT_RETENTION_DAYS', 90))
+app.config['AUDIT_ARCHIVE_DIR'] = os.environ.get('AUDIT_ARCHIVE_DIR', 'audit_archive')
+# Cache of serialised GET responses: 'memory' (per process), 'sqlite' (shared by workers) or 'off'
+app.config['RESPONSE_CACHE'] = os.environ.get('RESPONSE_CACHE', 'memory').lower()
+app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+app.config['RESPONSE_CACHE_MAX_BYTES'] = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+app.config['RESPONSE_CACHE_PATH'] = os.environ.get('RESPONSE_CACHE_PATH', 'response_cache.db')
+# Password hashing: a werkzeug method, optionally with its cost ('scrypt:65536:8:1',
+# 'pbkdf2:sha256:600000'), run in a pool of worker processes (0 hashes inline). Stored hashes
+# made with other parameters are upgraded on the next successful login.
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 0)) or None
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10.0))
+# ASGI entry point (asgi.py): threads running the Flask views it doesn't serve natively, and
+# connections in its async database pool
+app.config['ASGI_WSGI_THREADS'] = int(os.environ.get('ASGI_WSGI_THREADS', 16))
+app.config['ASYNC_DB_POOL_SIZE'] = int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+# Uploaded resumes: a content-addressed store (blobs, cached parse results and jobs) and the
+# processes that parse them (0 parses inline). Jobs can be polled for RESUME_JOB_TTL seconds;
+# every RESUME_SWEEP_INTERVAL seconds (0 turns it off) expired jobs are deleted with the files
+# no other job refers to.
+app.config['RESUME_STORE_DIR'] = os.environ.get('RESUME_STORE_DIR', 'resume_store')
+app.config['RESUME_PARSE_WORKERS'] = int(os.environ.get('RESUME_PARSE_WORKERS', 2))
+app.config['RESUME_PARSE_MAX_PENDING'] = int(os.environ.get('RESUME_PARSE_MAX_PENDING', 0)) or None
+app.config['RESUME_MAX_BYTES'] = int(os.environ.get('RESUME_MAX_BYTES', 10 * 1024 * 1024))
+app.config['RESUME_JOB_TTL'] = int(os.environ.get('RESUME_JOB_TTL', 24 * 3600))
+app.config['RESUME_SWEEP_INTERVAL'] = float(os.environ.get('RESUME_SWEEP_INTERVAL', 3600))
+# Resume matching: matches returned per resume, hashed feature space (a power of two) and seconds
+# between each worker's checks for newly stored job postings
+app.config['JOB_MATCH_LIMIT'] = int(os.environ.get('JOB_MATCH_LIMIT', 10))
+app.config['JOB_MATCH_FEATURES'] = int(os.environ.get('JOB_MATCH_FEATURES', 2 ** 20))
+app.config['JOB_POSTING_SYNC_INTERVAL'] = float(os.environ.get('JOB_POSTING_SYNC_INTERVAL', 30.0))
+
+class ReplicaRoutingSession(FlaskSession):
+    # Reads of GET requests go to the replica read_replica() picks; flushes and explicit DML
+    # always go to the primary
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False):
+            replica = read_replica(self)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(app, session_options={'class_': ReplicaRoutingSession})
+with app.app_context():
+    install_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+class JobTrackerApi(Api):
+    def handle_error(self, e):
+        # Token errors go on to the handlers flask_jwt_extended registers on the app (401/422)
+        # instead of becoming Flask-RESTful's generic 500
+        if isinstance(e, (JWTExtendedException, PyJWTError)):
+            raise e
+        return super().handle_error(e)
+
+
+api = JobTrackerApi(app)
+api.representation('application/json')(output_json)
 jwt = JWTManager(app)
+password_hasher = PasswordHasher(
+    method=app.config['PASSWORD_HASH_METHOD'],
+    workers=app.config['PASSWORD_HASH_WORKERS'],
+    max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+    timeout=app.config['PASSWORD_HASH_TIMEOUT']
+)
+resume_store = ResumeStore(
+    app.config['RESUME_STORE_DIR'],
+    parse_resume,
+    workers=app.config['RESUME_PARSE_WORKERS'],
+    max_pending=app.config['RESUME_PARSE_MAX_PENDING'],
+    max_bytes=app.config['RESUME_MAX_BYTES'],
+    job_ttl=app.config['RESUME_JOB_TTL'],
+    sweep_interval=app.config['RESUME_SWEEP_INTERVAL']
+)
+job_matcher = JobMatcher(n_features=app.config['JOB_MATCH_FEATURES'])
 
 # Database Models
 class User(db.Model):
@@ -51,10 +189,10 @@ class User(db.Model):
     is_active = db.Column(db.Boolean, default=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
 class AuditLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -64,10 +202,230 @@ class AuditLog(db.Model):
     record_id = db.Column(db.String(100))  # ID of the record being modified
     old_values = db.Column(db.Text)  # JSON string of old values
     new_values = db.Column(db.Text)  # JSON string of new values
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     ip_address = db.Column(db.String(45))
     user_agent = db.Column(db.Text)
 
+    __table_args__ = (
+        db.Index('ix_audit_log_user_id_timestamp_id', 'user_id', 'timestamp', 'id'),
+    )
+
+
+class AuditLogCounter(db.Model):
+    # Running count of audit rows per user, so the audit log total never needs COUNT(*)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+def bump_audit_log_count(connection, user_id, count=1):
+    # Increment a user's audit row counter on the given connection, creating it on first use
+    counter = AuditLogCounter.__table__
+    updated = connection.execute(
+        counter.update().where(counter.c.user_id == user_id).values(total=counter.c.total + count)
+    )
+    if updated.rowcount == 0:
+        connection.execute(counter.insert().values(user_id=user_id, total=count))
+
+
+class RevokedToken(db.Model):
+    # JWTs revoked before their expiry: rotated refresh tokens and tokens ended by logout.
+    # Rows are pruned once the token has expired anyway.
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class UserDataVersion(db.Model):
+    # Per-user version number, bumped by every write to that user's data. Read endpoints derive
+    # their ETag from it, so a conditional GET is answered without touching the data itself.
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+def bump_data_version(connection, user_ids):
+    # Advance the data version of each user on the given connection, in the caller's transaction
+    versions = UserDataVersion.__table__
+    for user_id in user_ids:
+        updated = connection.execute(
+            versions.update().where(versions.c.user_id == user_id).values(version=versions.c.version + 1)
+        )
+        if updated.rowcount == 0:
+            connection.execute(versions.insert().values(user_id=user_id, version=1))
+
+
+@db.event.listens_for(AuditLog, 'after_insert')
+def _count_audit_log_insert(mapper, connection, target):
+    bump_audit_log_count(connection, target.user_id)
+    bump_data_version(connection, [target.user_id])
+
+
+def write_audit_rows(connection, rows):
+    # Insert audit rows with one executemany and bump each user's counter and data version once
+    connection.execute(AuditLog.__table__.insert(), rows)
+    per_user = {}
+    for row in rows:
+        per_user[row['user_id']] = per_user.get(row['user_id'], 0) + 1
+    for user_id, count in per_user.items():
+        bump_audit_log_count(connection, user_id, count)
+    bump_data_version(connection, per_user)
+
+
+def _write_audit_batch(records):
+    # Flush callback for the background writer, which runs outside any request
+    with app.app_context():
+        with db.engine.begin() as connection:
+            write_audit_rows(connection, records)
+    if response_cache is not None:
+        for user_id in {record['user_id'] for record in records}:
+            response_cache.invalidate_user(user_id)
+
+
+audit_archive = AuditArchive(app.config['AUDIT_ARCHIVE_DIR'])
+
+response_cache = None
+if app.config['RESPONSE_CACHE'] == 'memory':
+    response_cache = MemoryResponseCache(max_bytes=app.config['RESPONSE_CACHE_MAX_BYTES'],
+                                         ttl=app.config['RESPONSE_CACHE_TTL'])
+elif app.config['RESPONSE_CACHE'] == 'sqlite':
+    response_cache = SQLiteResponseCache(app.config['RESPONSE_CACHE_PATH'], ttl=app.config['RESPONSE_CACHE_TTL'])
+
+audit_writer = None
+if app.config['AUDIT_MODE'] == 'async':
+    audit_writer = AsyncAuditWriter(
+        _write_audit_batch,
+        queue_size=app.config['AUDIT_QUEUE_SIZE'],
+        batch_size=app.config['AUDIT_BATCH_SIZE'],
+        flush_interval=app.config['AUDIT_FLUSH_INTERVAL'],
+        spool_path=app.config['AUDIT_SPOOL_PATH']
+    )
+
+revocation_store = RevocationStore(lambda: db.engine, RevokedToken.__table__,
+                                   sync_interval=app.config['TOKEN_REVOCATION_SYNC_INTERVAL'])
+
+
+@jwt.token_in_blocklist_loader
+def _token_revoked(jwt_header, jwt_payload):
+    return revocation_store.is_revoked(jwt_payload['jti'])
+
+
+def revoke_token(payload):
+    # Revoke a decoded JWT until it expires; False when it had already been revoked
+    return revocation_store.revoke(payload['jti'], datetime.utcfromtimestamp(payload['exp']),
+                                   payload['type'], int(payload['sub']))
+
+
+replica_router = None
+
+
+def read_replica(session):
+    # The replica engine this request reads from, chosen on first use; None for the primary
+    if replica_router is None or not has_request_context():
+        return None
+    if 'replica' not in session.info:
+        replica = None
+        if request.method in ('GET', 'HEAD'):
+            try:
+                identity = get_jwt_identity()
+            except RuntimeError:
+                # Not a JWT-protected view
+                identity = None
+            replica = replica_router.read_engine(int(identity) if identity is not None else None)
+        session.info['replica'] = replica
+    return session.info['replica']
+
+
+def retry_on_primary(view):
+    # Re-run a view on the primary when the replica it read from fails; reads are idempotent
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        except OperationalError:
+            replica = db.session.info.get('replica')
+            if replica is None:
+                raise
+            replica_router.mark_down(replica)
+            db.session.rollback()
+            db.session.info['replica'] = None
+            return view(*args, **kwargs)
+    return wrapper
+
+
+if app.config['SQLALCHEMY_REPLICA_URLS']:
+    replica_engines = []
+    for replica_url in app.config['SQLALCHEMY_REPLICA_URLS']:
+        replica_engine = create_engine(replica_url, **engine_options(replica_url, app.config))
+        install_sqlite_pragmas(replica_engine, app.config['SQLITE_PRAGMAS'])
+        replica_engines.append(replica_engine)
+    replica_router = ReplicaRouter(replica_engines, sticky_seconds=app.config['REPLICA_STICKY_SECONDS'],
+                                   retry_seconds=app.config['REPLICA_RETRY_SECONDS'])
+    api.decorators.append(retry_on_primary)
+
+
+def issue_tokens(user_id):
+    # A fresh access/refresh pair for the user
+    identity = str(user_id)
+    return {'access_token': create_access_token(identity=identity),
+            'refresh_token': create_refresh_token(identity=identity)}
+
+
+def audit_entry(user_id, action, table_name, record_id, old_values=None, new_values=None):
+    # Build an audit row for the current request
+    return {
+        'user_id': user_id,
+        'action': action,
+        'table_name': table_name,
+        'record_id': record_id,
+        'old_values': old_values,
+        'new_values': new_values,
+        'timestamp': datetime.utcnow(),
+        'ip_address': request.remote_addr,
+        'user_agent': request.user_agent.string if request.user_agent else None
+    }
+
+
+def record_audit(*entries):
+    # Record audit entries for the change in the current session. In sync mode they are
+    # written in the same transaction; in async mode they are queued once it commits.
+    # Every write path records audit entries, so this is also where the data versions of the
+    # affected users move forward (write_audit_rows does it in sync mode).
+    user_ids = {entry['user_id'] for entry in entries}
+    if audit_writer is None:
+        write_audit_rows(db.session.connection(), list(entries))
+        db.session.info.setdefault('stale_users', set()).update(user_ids)
+    else:
+        touch_user_data(user_ids)
+        db.session.info.setdefault('pending_audit', []).extend(entries)
+
+
+def touch_user_data(user_ids):
+    # Bump the users' data versions in the current transaction; their cached responses are
+    # dropped once it commits
+    bump_data_version(db.session.connection(), user_ids)
+    db.session.info.setdefault('stale_users', set()).update(user_ids)
+
+
+@db.event.listens_for(db.orm.Session, 'after_commit')
+def _submit_pending_audit(session):
+    for entry in session.info.pop('pending_audit', ()):
+        audit_writer.submit(entry)
+    stale_users = session.info.pop('stale_users', ())
+    if replica_router is not None:
+        # Their next reads go to the primary until the replicas have caught up
+        replica_router.note_writes(stale_users)
+    for user_id in stale_users:
+        if response_cache is not None:
+            response_cache.invalidate_user(user_id)
+
+
+@db.event.listens_for(db.orm.Session, 'after_rollback')
+def _discard_pending_audit(session):
+    session.info.pop('pending_audit', None)
+    session.info.pop('stale_users', None)
+
 class JobApplication(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -81,7 +439,14 @@ class JobApplication(db.Model):
     contact_email = db.Column(db.String(200))
     priority_level = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Keyset pagination sorts on it, so it is never NULL (migration 013 backfills older rows)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_job_applications_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+        db.Index('ix_job_applications_user_id_status', 'user_id', 'status'),
+        db.Index('ix_job_applications_user_id_applied_date', 'user_id', 'applied_date'),
+    )
 
 
 class TargetCompany(db.Model):
@@ -96,49 +461,450 @@ class TargetCompany(db.Model):
     application_status = db.Column(db.String(50), default='To Apply')
     priority = db.Column(db.String(20), default='Medium')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_target_company_user_id_updated_at_id', 'user_id', 'updated_at', 'id'),
+    )
+
+
+class Interview(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # The application the interview is for, if any. job_application is hash-partitioned on
+    # PostgreSQL, where id alone can't be referenced, so ownership is checked by the API and
+    # deleting an application unlinks its interviews (unlink_interviews).
+    application_id = db.Column(db.Integer)
+    company = db.Column(db.String(200), nullable=False)
+    role_title = db.Column(db.String(200), nullable=False)
+    interview_type = db.Column(db.String(100), nullable=False)
+    scheduled_at = db.Column(db.DateTime, nullable=False)  # UTC
+    interviewer = db.Column(db.String(200))
+    questions = db.Column(db.Text)
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Date windows and upcoming lists are range scans of one user's slice of this index
+        db.Index('ix_interview_user_id_scheduled_at_id', 'user_id', 'scheduled_at', 'id'),
+        db.Index('ix_interview_user_id_application_id', 'user_id', 'application_id'),
+    )
+
+
+class JobPosting(db.Model):
+    # Openings shared by every user, matched against uploaded resumes (see job_matcher.py).
+    # Postings are only ever added, which is what lets workers load them by id watermark.
+    id = db.Column(db.Integer, primary_key=True)
+    company = db.Column(db.String(200), nullable=False)
+    position = db.Column(db.String(200), nullable=False)
+    industry = db.Column(db.String(100))
+    location = db.Column(db.String(200))
+    salary_range = db.Column(db.String(100))
+    remote_policy = db.Column(db.String(50))
+    apply_link = db.Column(db.String(500))
+    description = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+def unlink_interviews(user_id, application_ids):
+    # Detach the user's interviews from deleted applications, in the current transaction
+    if application_ids:
+        db.session.execute(db.update(Interview).where(
+            Interview.user_id == user_id, Interview.application_id.in_(application_ids)
+        ).values(application_id=None))
+
+
+# Serializers: one field list per model, shared by every endpoint that returns it
+application_serializer = RowSerializer(JobApplication, (
+    'id', 'company', 'role_title', 'location', 'hourly_rate', 'applied_date', 'status',
+    'application_source', 'contact_email', 'priority_level', 'created_at', 'updated_at'
+))
+# The user-editable fields, as recorded in audit old/new values
+application_values_serializer = application_serializer.only(
+    'company', 'role_title', 'location', 'hourly_rate', 'applied_date', 'status',
+    'application_source', 'contact_email', 'priority_level'
+)
+# What create and update responses return
+application_summary_serializer = application_serializer.only('id', *application_values_serializer.keys)
+company_serializer = RowSerializer(TargetCompany, (
+    'id', 'name', ('role', 'role_title'), 'website', ('size', 'company_size'), 'industry',
+    'remote_policy', 'application_status', 'priority', 'created_at', 'updated_at'
+))
+company_values_serializer = company_serializer.only(
+    'name', 'role', 'website', 'size', 'industry', 'remote_policy', 'application_status', 'priority'
+)
+company_summary_serializer = company_serializer.only('id', *company_values_serializer.keys)
+interview_serializer = RowSerializer(Interview, (
+    'id', 'application_id', 'company', ('role', 'role_title'), ('date', 'scheduled_at'), ('type', 'interview_type'),
+    'interviewer', 'questions', 'notes', 'created_at', 'updated_at'
+))
+interview_values_serializer = interview_serializer.only(
+    'application_id', 'company', 'role', 'date', 'type', 'interviewer', 'questions', 'notes'
+)
+audit_log_serializer = RowSerializer(AuditLog, (
+    'id', 'action', 'table_name', 'record_id', 'old_values', 'new_values', 'timestamp',
+    'ip_address', 'user_agent'
+))
+
+
+# Request schemas, compiled once at import
+application_schema = Schema(
+    Field('company', required=True, message='Company name is required'),
+    Field('role_title', required=True, message='Role title is required'),
+    Field('location'),
+    Field('hourly_rate', float),
+    Field('applied_date', date),
+    Field('status', default='Applied'),
+    Field('application_source'),
+    Field('contact_email'),
+    Field('priority_level')
+)
+company_schema = Schema(
+    Field('name', required=True, message='Company name is required'),
+    Field('role'),
+    Field('website'),
+    Field('size'),
+    Field('industry'),
+    Field('remote_policy'),
+    Field('application_status', default='To Apply'),
+    Field('priority', default='Medium')
+)
+interview_schema = Schema(
+    Field('application_id', int),
+    # Taken from the application when one is given
+    Field('company'),
+    Field('role'),
+    Field('date', datetime, required=True),
+    Field('type', required=True, message='Interview type is required'),
+    Field('interviewer'),
+    Field('questions'),
+    Field('notes')
+)
+interview_window_schema = Schema(
+    Field('from', datetime),
+    Field('to', datetime),
+    Field('upcoming', int)
+)
+signup_schema = Schema(
+    Field('username', required=True, message='Username is required'),
+    Field('email', required=True, message='Email is required'),
+    Field('password', required=True, message='Password is required')
+)
+login_schema = Schema(
+    Field('username', required=True, message='Username is required'),
+    Field('password', required=True, message='Password is required')
+)
+tracker_application_schema = Schema(
+    Field('company', required=True, message='Company name'),
+    Field('role_title', required=True, message='Role title'),
+    Field('location'),
+    Field('hourly_rate', float),
+    Field('applied_date', date),
+    Field('application_source'),
+    Field('status')
+)
+company_search_schema = Schema(
+    Field('query', required=True, message='Search query is required')
+)
+
+
+class UserDashboardStats(db.Model):
+    # Per-user dashboard counters, maintained by the application write paths
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total_applications = db.Column(db.Integer, nullable=False, default=0)
+    interviews_scheduled = db.Column(db.Integer, nullable=False, default=0)
+    offers_received = db.Column(db.Integer, nullable=False, default=0)
+    high_priority_applications = db.Column(db.Integer, nullable=False, default=0)
+    rate_sum = db.Column(db.Float, nullable=False, default=0.0)
+    rate_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UserDailyApplicationCount(db.Model):
+    # Applications per user per applied_date, used for the "this week" and "today" metrics
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+DASHBOARD_COUNTERS = ('total_applications', 'interviews_scheduled', 'offers_received',
+                      'high_priority_applications', 'rate_sum', 'rate_count')
+
+
+def dashboard_snapshot(application):
+    # Capture the fields of an application that contribute to the dashboard counters
+    return (application.status, application.priority_level, application.hourly_rate, application.applied_date)
+
+
+def _dashboard_contribution(snapshot):
+    status, priority_level, hourly_rate, _ = snapshot
+    status = (status or '').lower()
+    is_interview = 'interview' in status
+    return {
+        'total_applications': 1,
+        'interviews_scheduled': int(is_interview),
+        'offers_received': int('offer' in status and not is_interview),
+        'high_priority_applications': int((priority_level or '').lower() == 'high'),
+        'rate_sum': hourly_rate if hourly_rate is not None else 0.0,
+        'rate_count': int(hourly_rate is not None)
+    }
+
+
+def update_dashboard_stats(user_id, removed=(), added=()):
+    # Subtract the `removed` snapshots from the user's counters and add the `added` ones; an
+    # update passes its before and after snapshots. Nothing is committed here so the
+    # adjustment lands in the same transaction as the application write.
+    deltas = dict.fromkeys(DASHBOARD_COUNTERS, 0)
+    day_deltas = {}
+    for snapshots, sign in ((removed, -1), (added, 1)):
+        for snapshot in snapshots:
+            for key, value in _dashboard_contribution(snapshot).items():
+                deltas[key] += sign * value
+            day = snapshot[3]
+            if day is not None:
+                day_deltas[day] = day_deltas.get(day, 0) + sign
+
+    # Create missing rows with INSERT ... ON CONFLICT DO NOTHING, so two first writes for the same
+    # user or day can't both insert one, then increment in SQL so concurrent writers don't lose updates
+    changed = {key: getattr(UserDashboardStats, key) + delta for key, delta in deltas.items() if delta}
+    if changed:
+        db.session.execute(insert_ignoring_conflicts(UserDashboardStats.__table__, ['user_id']),
+                           dict(dict.fromkeys(DASHBOARD_COUNTERS, 0), user_id=user_id, updated_at=datetime.utcnow()))
+        db.session.execute(db.update(UserDashboardStats).where(UserDashboardStats.user_id == user_id).values(changed))
+
+    for day, delta in day_deltas.items():
+        if not delta:
+            continue
+        db.session.execute(insert_ignoring_conflicts(UserDailyApplicationCount.__table__, ['user_id', 'day']),
+                           {'user_id': user_id, 'day': day, 'count': 0})
+        db.session.execute(db.update(UserDailyApplicationCount).where(
+            UserDailyApplicationCount.user_id == user_id, UserDailyApplicationCount.day == day
+        ).values(count=UserDailyApplicationCount.count + delta))
+
+
+def insert_ignoring_conflicts(table, index_elements):
+    # INSERT ... ON CONFLICT DO NOTHING in the dialect in use (SQLite or PostgreSQL)
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def backfill_dashboard_stats():
+    # Build the counters and daily buckets of users who have applications but no counter row,
+    # e.g. after db.create_all() made the counter tables on an existing database. Counters
+    # another process created in the meantime are left as they are. Returns the users filled in.
+    has_stats = db.select(UserDashboardStats.user_id).scalar_subquery()
+    rows = dashboard_aggregate_query(datetime.now().date()).filter(JobApplication.user_id.notin_(has_stats)).all()
+    if not rows:
+        return []
+    user_ids = [row[0] for row in rows]
+    now = datetime.utcnow()
+    db.session.execute(insert_ignoring_conflicts(UserDashboardStats.__table__, ['user_id']), [{
+        'user_id': user_id,
+        'total_applications': total,
+        'interviews_scheduled': interviews or 0,
+        'offers_received': offers or 0,
+        'high_priority_applications': high_priority or 0,
+        'rate_sum': float(rate_sum),
+        'rate_count': rate_count,
+        'updated_at': now
+    } for user_id, total, _, interviews, offers, high_priority, rate_sum, rate_count, _ in rows])
+    days = db.session.query(
+        JobApplication.user_id, JobApplication.applied_date, db.func.count(JobApplication.id)
+    ).filter(
+        JobApplication.user_id.in_(user_ids), JobApplication.applied_date.isnot(None)
+    ).group_by(JobApplication.user_id, JobApplication.applied_date).all()
+    if days:
+        db.session.execute(insert_ignoring_conflicts(UserDailyApplicationCount.__table__, ['user_id', 'day']),
+                           [{'user_id': user_id, 'day': day, 'count': count} for user_id, day, count in days])
+    db.session.commit()
+    return user_ids
+
+
+def dashboard_aggregate_query(today):
+    # Recompute the dashboard metrics from job applications, grouped per user
+    status = db.func.lower(JobApplication.status)
+    is_interview = status.like('%interview%')
+    is_offer = db.and_(status.like('%offer%'), db.not_(is_interview))
+
+    return db.session.query(
+        JobApplication.user_id,
+        db.func.count(JobApplication.id),
+        db.func.sum(db.case((JobApplication.applied_date >= today - timedelta(days=7), 1), else_=0)),
+        db.func.sum(db.case((is_interview, 1), else_=0)),
+        db.func.sum(db.case((is_offer, 1), else_=0)),
+        db.func.sum(db.case((db.func.lower(JobApplication.priority_level) == 'high', 1), else_=0)),
+        db.func.coalesce(db.func.sum(JobApplication.hourly_rate), 0.0),
+        db.func.count(JobApplication.hourly_rate),
+        db.func.sum(db.case((JobApplication.applied_date == today, 1), else_=0))
+    ).group_by(JobApplication.user_id)
+
+
+# Keyset pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value, row_id):
+    # Opaque cursor holding the (sort value, id) of the last row on a page
+    payload = json.dumps([sort_value.isoformat() if sort_value is not None else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def paginated(args=None):
+    # Whether the client asked for a page (?limit= or ?cursor=); args defaults to request.args
+    args = request.args if args is None else args
+    return 'limit' in args or 'cursor' in args
+
+
+def page_limit(args=None):
+    # Clamp the requested page size to [1, MAX_PAGE_SIZE]; args defaults to request.args
+    limit = (request.args if args is None else args).get('limit', DEFAULT_PAGE_SIZE, type=int)
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_query(query, sort_column, id_column, limit, cursor=None, descending=True):
+    # Restrict `query` to the page after `cursor`, ordered by (sort_column, id_column) descending
+    # (ascending with descending=False). One extra row is fetched to tell whether another page follows.
+    # If sort_column is nullable, NULLs come after every value (before them ascending) on every
+    # database, and a cursor can hold a NULL sort value; NOT NULL columns keep the plain row
+    # comparison, which the (user_id, sort, id) indexes serve.
+    nullable = sort_column.expression.nullable
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            # Only NULL rows further along by id remain, and ascending, every non-NULL row
+            following = db.and_(sort_column.is_(None), id_column < row_id if descending else id_column > row_id)
+            if not descending:
+                following = db.or_(following, sort_column.isnot(None))
+        else:
+            position = db.tuple_(sort_column, id_column)
+            following = position < (sort_value, row_id) if descending else position > (sort_value, row_id)
+            if nullable and descending:
+                following = db.or_(following, sort_column.is_(None))
+        query = query.filter(following)
+    if descending:
+        order = sort_column.desc().nulls_last() if nullable else sort_column.desc()
+        return query.order_by(order, id_column.desc()).limit(limit + 1)
+    order = sort_column.asc().nulls_first() if nullable else sort_column
+    return query.order_by(order, id_column).limit(limit + 1)
+
+
+def keyset_page(query, sort_column, id_column, limit, cursor=None, descending=True):
+    # Return one page of `query` ordered by (sort_column, id_column), plus the cursor for the next
+    # page. Seeking past the cursor keeps the cost per page constant regardless of depth, and
+    # rows inserted after the first page was served never shift later pages.
+    return keyset_result(keyset_query(query, sort_column, id_column, limit, cursor, descending).all(),
+                         sort_column, id_column, limit)
+
+
+def keyset_result(rows, sort_column, id_column, limit):
+    # Split the rows fetched by keyset_query into the page and the cursor for the next one
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+# Conditional GET
+def user_data_etag(user_id, *extra):
+    # Strong ETag for the current request: the user's data version plus everything else the
+    # response depends on (path, query string and any `extra` values)
+    version = db.session.execute(data_version_query(user_id)).scalar() or 0
+    return data_etag(user_id, version, request.full_path, *extra)
+
+
+def data_version_query(user_id):
+    return db.select(UserDataVersion.version).filter_by(user_id=user_id)
+
+
+def data_etag(user_id, version, full_path, *extra):
+    key = '|'.join(str(part) for part in (user_id, version, full_path) + extra)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional_get(varies_with=None, cache=False):
+    # Decorate a per-user GET (below @jwt_required()) so it carries an ETag and answers a matching
+    # If-None-Match with 304 before the handler runs. `varies_with` returns any extra value the
+    # response depends on besides the user's data, e.g. the current date. With cache=True the
+    # serialised 200 response is kept in response_cache under the ETag, so a write never
+    # leaves a stale entry reachable.
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            user_id = int(get_jwt_identity())
+            extra = (varies_with(),) if varies_with else ()
+            etag = user_data_etag(user_id, *extra)
+            headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache'}
+            if request.if_none_match.contains(etag):
+                return Response(status=304, headers=headers)
+
+            store = response_cache if cache else None
+            if store is not None:
+                body = store.get(user_id, etag)
+                if body is not None:
+                    return Response(body, status=200, headers=headers, mimetype='application/json')
+
+            data, code, response_headers = unpack(method(*args, **kwargs))
+            if code != 200:
+                return data, code, response_headers
+            response = api.make_response(data, code, dict(response_headers or {}, **headers))
+            if store is not None:
+                store.set(user_id, etag, response.get_data())
+            return response
+        return wrapper
+    return decorator
+
 
 class TargetCompaniesAPI(Resource):
     @jwt_required()
+    @conditional_get(cache=True)
     def get(self):
         # Get target companies for the current user
         current_user_id = int(get_jwt_identity())
 
-        companies = TargetCompany.query.filter_by(user_id=current_user_id).all()
+        # Column rows rather than ORM instances: nothing here needs identity-mapped objects
+        query = db.session.query(*company_serializer.columns).filter(TargetCompany.user_id == current_user_id)
 
-        result = []
-        for company in companies:
-            result.append({
-                'id': company.id,
-                'name': company.name,
-                'role': company.role_title,
-                'website': company.website,
-                'size': company.company_size,
-                'industry': company.industry,
-                'remote_policy': company.remote_policy,
-                'application_status': company.application_status,
-                'priority': company.priority,
-                'created_at': company.created_at.isoformat(),
-                'updated_at': company.updated_at.isoformat()
-            })
+        # Without ?limit= or ?cursor= (or with the older ?all=true) the response stays the unpaginated
+        # list existing clients expect
+        next_cursor = None
+        if request.args.get('all', 'false').lower() == 'true' or not paginated():
+            companies = query.all()
+        else:
+            try:
+                companies, next_cursor = keyset_page(query, TargetCompany.updated_at, TargetCompany.id,
+                                                     page_limit(), request.args.get('cursor'))
+            except InvalidCursor:
+                return {'message': 'Invalid cursor'}, 400
+
+        result = company_serializer.rows(companies, native_dates=True)
 
-        return {'companies': result}
+        return {'companies': result, 'next_cursor': next_cursor}
 
     @jwt_required()
     def post(self):
         # Add a new target company
         current_user_id = int(get_jwt_identity())
-        parser = reqparse.RequestParser()
-        parser.add_argument('name', type=str, required=True, help='Company name is required')
-        parser.add_argument('role', type=str, required=False)
-        parser.add_argument('website', type=str, required=False)
-        parser.add_argument('size', type=str, required=False)
-        parser.add_argument('industry', type=str, required=False)
-        parser.add_argument('remote_policy', type=str, required=False)
-        parser.add_argument('application_status', type=str, default='To Apply')
-        parser.add_argument('priority', type=str, default='Medium')
-        args = parser.parse_args()
+        args = company_schema.parse()
 
         company = TargetCompany(
             user_id=current_user_id,
@@ -153,42 +919,13 @@ class TargetCompaniesAPI(Resource):
         )
 
         db.session.add(company)
-        db.session.commit()
+        db.session.flush()
 
         # Create audit log entry
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='CREATE',
-            table_name='target_companies',
-            record_id=str(company.id),
-            old_values=None,
-            new_values=json.dumps({
-                'name': company.name,
-                'role': company.role_title,
-                'website': company.website,
-                'size': company.company_size,
-                'industry': company.industry,
-                'remote_policy': company.remote_policy,
-                'application_status': company.application_status,
-                'priority': company.priority
-            }),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
+        record_audit(audit_entry(current_user_id, 'CREATE', 'target_companies', str(company.id), new_values=json.dumps(company_values_serializer.instance(company))))
         db.session.commit()
 
-        return {'message': 'Target company added successfully', 'company': {
-            'id': company.id,
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority
-        }}, 201
+        return {'message': 'Target company added successfully', 'company': company_summary_serializer.instance(company)}, 201
 
 
 class TargetCompanyDetailAPI(Resource):
@@ -201,89 +938,204 @@ class TargetCompanyDetailAPI(Resource):
         if not company:
             return {'message': 'Target company not found'}, 404
 
-        return {'company': {
-            'id': company.id,
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority,
-            'created_at': company.created_at.isoformat(),
-            'updated_at': company.updated_at.isoformat()
-        }}
+        return {'company': company_serializer.instance(company)}
+
+
+def utc_naive(value):
+    # A datetime as naive UTC, the way the database stores them; naive values are taken as UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def current_minute():
+    # "Now" for time-relative lists, truncated so their ETag stays valid for the rest of the minute
+    return datetime.utcnow().replace(second=0, microsecond=0)
 
 
 class InterviewsAPI(Resource):
     @jwt_required()
+    @conditional_get(varies_with=current_minute)
     def get(self):
-        # Get upcoming interviews for the current user
-        current_user_id = get_jwt_identity()
+        # The user's interviews in a date window, in scheduled order:
+        #   ?from=&to=    scheduled_at in [from, to); either bound may be left out
+        #   ?upcoming=N   the next N from now (or from `from`)
+        # With neither, the upcoming interviews from now. Pages follow with ?cursor=.
+        current_user_id = int(get_jwt_identity())
+        window, errors = interview_window_schema.load(request.args)
+        if errors:
+            return {'message': '; '.join(errors.values()), 'errors': errors}, 400
+        start, end, upcoming = utc_naive(window['from']), utc_naive(window['to']), window['upcoming']
+        if upcoming is not None:
+            if upcoming < 1:
+                return {'message': 'upcoming must be a positive integer'}, 400
+            limit = min(upcoming, MAX_PAGE_SIZE)
+            start = start or current_minute()
+        else:
+            limit = page_limit()
+            if start is None and end is None:
+                start = current_minute()
+
+        query = db.session.query(*interview_serializer.columns).filter(Interview.user_id == current_user_id)
+        if start is not None:
+            query = query.filter(Interview.scheduled_at >= start)
+        if end is not None:
+            query = query.filter(Interview.scheduled_at < end)
+        try:
+            interviews, next_cursor = keyset_page(query, Interview.scheduled_at, Interview.id, limit,
+                                                  request.args.get('cursor'), descending=False)
+        except InvalidCursor:
+            return {'message': 'Invalid cursor'}, 400
+
+        return {'interviews': interview_serializer.rows(interviews, native_dates=True), 'next_cursor': next_cursor}
 
-        # For now, return mock data - in a real app this would fetch from an interviews table
-        interviews = [
-            {
-                "id": 1,
-                "company": "Tech Innovations Inc.",
-                "role": "Senior Software Engineer",
-                "date": "2025-01-15",
-                "type": "Technical Interview",
-                "interviewer": "John Smith",
-                "questions": "What projects have you worked on?",
-                "notes": "Focus on system design skills"
-            },
+    @jwt_required()
+    def post(self):
+        # Schedule an interview, optionally for one of the user's applications
+        current_user_id = int(get_jwt_identity())
+        args = interview_schema.parse()
+
+        company, role = args['company'], args['role']
+        if args['application_id'] is not None:
+            application = db.session.execute(
+                db.select(JobApplication.company, JobApplication.role_title)
+                .filter_by(id=args['application_id'], user_id=current_user_id)
+            ).first()
+            if not application:
+                return {'message': 'Application not found'}, 404
+            company, role = company or application.company, role or application.role_title
+        errors = {}
+        if not company:
+            errors['company'] = 'Company name is required'
+        if not role:
+            errors['role'] = 'Role is required'
+        if errors:
+            return {'message': '; '.join(errors.values()), 'errors': errors}, 400
+
+        interview = Interview(
+            user_id=current_user_id,
+            application_id=args['application_id'],
+            company=company,
+            role_title=role,
+            interview_type=args['type'],
+            scheduled_at=utc_naive(args['date']),
+            interviewer=args['interviewer'],
+            questions=args['questions'],
+            notes=args['notes']
+        )
+        db.session.add(interview)
+        db.session.flush()
+
+        record_audit(audit_entry(current_user_id, 'CREATE', 'interviews', str(interview.id),
+                                 new_values=json.dumps(interview_values_serializer.instance(interview))))
+        db.session.commit()
+
+        return {'message': 'Interview scheduled successfully', 'interview': interview_serializer.instance(interview)}, 201
+
+
+_posting_sync_lock = threading.Lock()
+_postings_synced_at = 0.0
+
+
+def posting_document(posting):
+    # Text and match fields of a JobPosting row; the position counts twice
+    text = ' '.join(filter(None, (posting.position, posting.position, posting.company, posting.industry,
+                                  posting.location, posting.remote_policy, posting.description)))
+    return text, {
+        'source': 'posting',
+        'postingId': posting.id,
+        'company': posting.company,
+        'position': posting.position,
+        'industry': posting.industry,
+        'salaryRange': posting.salary_range,
+        'remotePolicy': posting.remote_policy,
+        'applyLink': posting.apply_link
+    }
+
+
+def sync_job_postings(batch_size=5000):
+    # Load postings stored since the matcher's watermark, at most every JOB_POSTING_SYNC_INTERVAL
+    # seconds. A thread that finds another one loading carries on with what is loaded already.
+    global _postings_synced_at
+    if time.monotonic() - _postings_synced_at < app.config['JOB_POSTING_SYNC_INTERVAL']:
+        return
+    if not _posting_sync_lock.acquire(blocking=False):
+        return
+    try:
+        table = JobPosting.__table__
+        while True:
+            rows = db.session.execute(db.select(table).where(
+                table.c.id > job_matcher.posting_watermark
+            ).order_by(table.c.id).limit(batch_size)).all()
+            for posting in rows:
+                text, meta = posting_document(posting)
+                job_matcher.add(('posting', posting.id), text, meta=meta)
+            if rows:
+                job_matcher.posting_watermark = rows[-1].id
+            if len(rows) < batch_size:
+                break
+        _postings_synced_at = time.monotonic()
+    finally:
+        _posting_sync_lock.release()
+
+
+def sync_target_companies(user_id):
+    # Re-read the user's target companies only when their data version moved; the matcher
+    # replaces just the companies whose updated_at changed
+    def load():
+        companies = db.session.execute(db.select(
+            TargetCompany.id, TargetCompany.updated_at, TargetCompany.name, TargetCompany.role_title,
+            TargetCompany.industry, TargetCompany.remote_policy, TargetCompany.company_size, TargetCompany.website
+        ).filter_by(user_id=user_id)).all()
+        return [(
+            ('company', company.id),
+            company.updated_at,
+            ' '.join(filter(None, (company.role_title, company.role_title, company.name, company.industry,
+                                   company.remote_policy, company.company_size))),
             {
-                "id": 2,
-                "company": "Global Solutions Ltd.",
-                "role": "Frontend Developer",
-                "date": "2025-01-18",
-                "type": "Behavioral Interview",
-                "interviewer": "Sarah Johnson",
-                "questions": "Tell me about a challenging situation you faced",
-                "notes": "Emphasize teamwork examples"
+                'source': 'target_company',
+                'targetCompanyId': company.id,
+                'company': company.name,
+                'position': company.role_title,
+                'industry': company.industry,
+                'remotePolicy': company.remote_policy,
+                'applyLink': company.website
             }
-        ]
+        ) for company in companies]
 
-        return {'interviews': interviews}
+    version = db.session.execute(data_version_query(user_id)).scalar() or 0
+    job_matcher.sync_owner(user_id, version, load)
 
-    @jwt_required()
-    def post(self):
-        # Create a new interview schedule
-        current_user_id = int(get_jwt_identity())
-        parser = reqparse.RequestParser()
-        parser.add_argument('company', type=str, required=True, help='Company name is required')
-        parser.add_argument('role', type=str, required=True, help='Role is required')
-        parser.add_argument('date', type=str, required=True, help='Interview date is required')
-        parser.add_argument('type', type=str, required=True, help='Interview type is required')
-        parser.add_argument('interviewer', type=str, required=False)
-        parser.add_argument('questions', type=str, required=False)
-        parser.add_argument('notes', type=str, required=False)
-        args = parser.parse_args()
-
-        # In a real app, this would create a new Interview record in the database
-        new_interview = {
-            'id': 999,  # Mock ID
-            'company': args['company'],
-            'role': args['role'],
-            'date': args['date'],
-            'type': args['type'],
-            'interviewer': args['interviewer'],
-            'questions': args['questions'],
-            'notes': args['notes']
-        }
 
-        return {'message': 'Interview scheduled successfully', 'interview': new_interview}, 201
+def resume_job_matches(resume, user_id):
+    # The stored postings and the user's own target companies that best match a parsed resume
+    sync_job_postings()
+    sync_target_companies(user_id)
+    return [dict(meta, score=round(score, 4))
+            for _, score, meta in job_matcher.match(resume['text'], owner=user_id, k=app.config['JOB_MATCH_LIMIT'])]
 
 
+def resume_job_response(job, user_id, status=200):
+    # A parse job as the upload endpoints return it; pending jobs say where and when to poll
+    body = dict(job)
+    headers = {}
+    if job['status'] == 'done':
+        body['jobMatches'] = resume_job_matches(job['resume'], user_id)
+    elif job['status'] in ('queued', 'running'):
+        headers = {'Location': f"/api/upload-resume/{job['id']}", 'Retry-After': '1'}
+    return body, status, headers
+
 
 class UploadResumeAPI(Resource):
     @jwt_required()
     def post(self):
-        # Handle resume upload and job matching
+        # Stream the upload into the resume store and queue it for parsing, answering at once with
+        # a job to poll. A file stored and parsed before is finished straight away.
         from werkzeug.utils import secure_filename
 
+        # Refuse oversized bodies before the form is parsed (a little slack for the multipart framing)
+        request.max_content_length = app.config['RESUME_MAX_BYTES'] + 64 * 1024
+
         # Check if the post request has the file part
         if 'resume' not in request.files:
             return {'message': 'No file part in the request'}, 400
@@ -294,376 +1146,87 @@ class UploadResumeAPI(Resource):
         if file.filename == '':
             return {'message': 'No selected file'}, 400
 
-        if file:
-            # Save file temporarily
-            filename = secure_filename(file.filename)
-            filepath = os.path.join('/tmp', f"resume_{get_jwt_identity()}_{filename}")
-            file.save(filepath)
-
-            # For demo purposes, we'll return mock job matches
-            # In a real implementation, we would parse the resume and match to job opportunities
-
-            job_matches = [
-                {
-                    'company': 'Tech Innovations Inc.',
-                    'position': 'Senior Software Engineer',
-                    'industry': 'Technology',
-                    'salaryRange': '$90,000 - $130,000',
-                    'remotePolicy': 'Hybrid',
-                    'applyLink': 'https://techinnovations.com/jobs/123'
-                },
-                {
-                    'company': 'Global Solutions Ltd.',
-                    'position': 'Frontend Developer',
-                    'industry': 'Web Development',
-                    'salaryRange': '$70,000 - $100,000',
-                    'remotePolicy': 'Remote',
-                    'applyLink': 'https://globalsolutions.com/jobs/456'
-                },
-                {
-                    'company': 'Data Systems Co.',
-                    'position': 'Full Stack Developer',
-                    'industry': 'Software',
-                    'salaryRange': '$80,000 - $110,000',
-                    'remotePolicy': 'On-site',
-                    'applyLink': 'https://datasystems.com/jobs/789'
-                },
-                {
-                    'company': 'Cloud Technologies',
-                    'position': 'DevOps Engineer',
-                    'industry': 'Infrastructure',
-                    'salaryRange': '$95,000 - $125,000',
-                    'remotePolicy': 'Hybrid',
-                    'applyLink': 'https://cloudtech.com/jobs/101'
-                },
-                {
-                    'company': 'AI Startups Hub',
-                    'position': 'Machine Learning Engineer',
-                    'industry': 'AI/ML',
-                    'salaryRange': '$100,000 - $140,000',
-                    'remotePolicy': 'Remote',
-                    'applyLink': 'https://aistartupshub.com/jobs/202'
-                }
-            ]
-
-            # Clean up the temporary file
-            os.remove(filepath)
-
-            return {
-                'message': 'Resume uploaded successfully',
-                'jobMatches': job_matches
-            }, 200
-
-        return {'message': 'Invalid file type'}, 400
-
-
-class UserApplicationDetailAPI(Resource):
-    @jwt_required()
-    def get(self, application_id):
-        # Get a specific job application
         current_user_id = int(get_jwt_identity())
-        application = JobApplication.query.filter_by(id=application_id, user_id=current_user_id).first()
+        try:
+            digest, size = resume_store.put(file.stream)
+            job = resume_store.submit(current_user_id, digest, secure_filename(file.filename), size)
+        except ResumeTooLarge:
+            return {'message': f"Resumes are limited to {app.config['RESUME_MAX_BYTES'] // (1024 * 1024)} MB"}, 413
+        except ParserBusy:
+            # Every parse slot is taken; shed the upload rather than queueing without bound
+            return {'message': 'Too many resumes are being processed, please retry shortly'}, 503, {'Retry-After': '5'}
 
-        if not application:
-            return {'message': 'Application not found'}, 404
+        return resume_job_response(job, current_user_id, 200 if job['status'] in ('done', 'failed') else 202)
 
-        return {'application': {
-            'id': application.id,
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level,
-            'created_at': application.created_at.isoformat(),
-            'updated_at': application.updated_at.isoformat()
-        }}
 
+class ResumeJobAPI(Resource):
     @jwt_required()
-    def put(self, application_id):
-        # Update a job application
+    def get(self, job_id):
+        # Poll a resume parse job: queued, running, done (with the parsed resume and its job matches)
+        # or failed (with why)
         current_user_id = int(get_jwt_identity())
-        application = JobApplication.query.filter_by(id=application_id, user_id=current_user_id).first()
-
-        if not application:
-            return {'message': 'Application not found'}, 404
-
-        # Store old values for audit
-        old_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
+        job = resume_store.job(job_id, current_user_id)
+        if job is None:
+            return {'message': 'Resume job not found'}, 404
+        return resume_job_response(job, current_user_id)
 
-        parser = reqparse.RequestParser()
-        parser.add_argument('company', type=str, required=True, help='Company name is required')
-        parser.add_argument('role_title', type=str, required=True, help='Role title is required')
-        parser.add_argument('location', type=str, required=False)
-        parser.add_argument('hourly_rate', type=float, required=False)
-        parser.add_argument('applied_date', type=str, required=False)
-        parser.add_argument('status', type=str, required=False)
-        parser.add_argument('application_source', type=str, required=False)
-        parser.add_argument('contact_email', type=str, required=False)
-        parser.add_argument('priority_level', type=str, required=False)
-        args = parser.parse_args()
-
-        # Update application
-        application.company = args['company']
-        application.role_title = args['role_title']
-        application.location = args['location']
-        application.hourly_rate = args['hourly_rate']
-        application.status = args['status']
-        application.application_source = args['application_source']
-        application.contact_email = args['contact_email']
-        application.priority_level = args['priority_level']
-
-        if args['applied_date']:
-            application.applied_date = datetime.strptime(args['applied_date'], '%Y-%m-%d').date()
-
-        application.updated_at = datetime.utcnow()
-        db.session.commit()
-
-        # Create audit log entry
-        new_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
-
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='UPDATE',
-            table_name='job_applications',
-            record_id=str(application_id),
-            old_values=json.dumps(old_values),
-            new_values=json.dumps(new_values),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
-        db.session.commit()
-
-        return {'message': 'Application updated successfully', 'application': {
-            'id': application.id,
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }}
-
-    @jwt_required()
-    def delete(self, application_id):
-        # Delete a job application
-        current_user_id = int(get_jwt_identity())
-        application = JobApplication.query.filter_by(id=application_id, user_id=current_user_id).first()
-
-        if not application:
-            return {'message': 'Application not found'}, 404
-
-        # Store old values for audit
-        old_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
-
-        db.session.delete(application)
-        db.session.commit()
-
-        # Create audit log entry
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='DELETE',
-            table_name='job_applications',
-            record_id=str(application_id),
-            old_values=json.dumps(old_values),
-            new_values=None,
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
-        db.session.commit()
 
-        return {'message': 'Application deleted successfully'}
-        company = TargetCompany.query.filter_by(id=company_id, user_id=current_user_id).first()
-
-        if not company:
-            return {'message': 'Target company not found'}, 404
-
-        # Store old values for audit
-        old_values = {
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority
-        }
-
-        parser = reqparse.RequestParser()
-        parser.add_argument('name', type=str, required=True, help='Company name is required')
-        parser.add_argument('role', type=str, required=False)
-        parser.add_argument('website', type=str, required=False)
-        parser.add_argument('size', type=str, required=False)
-        parser.add_argument('industry', type=str, required=False)
-        parser.add_argument('remote_policy', type=str, required=False)
-        parser.add_argument('application_status', type=str)
-        parser.add_argument('priority', type=str)
-        args = parser.parse_args()
-
-        # Update the company
-        company.name = args['name']
-        company.role_title = args['role']
-        company.website = args['website']
-        company.company_size = args['size']
-        company.industry = args['industry']
-        company.remote_policy = args['remote_policy']
-        if args['application_status']:
-            company.application_status = args['application_status']
-        if args['priority']:
-            company.priority = args['priority']
-        company.updated_at = datetime.utcnow()
-
-        db.session.commit()
-
-        # Create audit log entry
-        new_values = {
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority
-        }
-
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='UPDATE',
-            table_name='target_companies',
-            record_id=str(company_id),
-            old_values=json.dumps(old_values),
-            new_values=json.dumps(new_values),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
-        db.session.commit()
-
-        return {'message': 'Target company updated successfully', 'company': {
-            'id': company.id,
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority
-        }}
+# Path to Excel file
+EXCEL_FILE = 'Hamman_Job_Search_Tracker.xlsx'
 
-    @jwt_required()
-    def delete(self, company_id):
-        # Delete a target company
-        current_user_id = int(get_jwt_identity())
-        company = TargetCompany.query.filter_by(id=company_id, user_id=current_user_id).first()
+# Parsed workbook per file path, replaced whenever the file's mtime changes
+_workbook_cache = {}
+_workbook_cache_lock = threading.Lock()
 
-        if not company:
-            return {'message': 'Target company not found'}, 404
 
-        # Store old values for audit
-        old_values = {
-            'name': company.name,
-            'role': company.role_title,
-            'website': company.website,
-            'size': company.company_size,
-            'industry': company.industry,
-            'remote_policy': company.remote_policy,
-            'application_status': company.application_status,
-            'priority': company.priority
+def _sheet_payload(df):
+    # Convert a sheet to its JSON-ready column mapping, formatting date columns
+    result = {}
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            result[col] = df[col].dt.strftime('%Y-%m-%d').tolist()
+        else:
+            result[col] = df[col].fillna('').tolist()
+    return result
+
+
+def load_tracker_workbook(path=EXCEL_FILE):
+    # Return {'sheets': {name: {'rows', 'columns'}}, 'payloads': {name: payload}} for the workbook.
+    # The file is parsed once per mtime and shared by every request and thread.
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {'sheets': {}, 'payloads': {}}
+
+    cached = _workbook_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _workbook_cache_lock:
+        # Another thread may have reloaded the file while we waited for the lock
+        cached = _workbook_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        dataframes = pd.read_excel(path, sheet_name=None)
+        workbook = {
+            'sheets': {name: {'rows': len(df), 'columns': len(df.columns)} for name, df in dataframes.items()},
+            'payloads': {name: _sheet_payload(df) for name, df in dataframes.items()}
         }
+        _workbook_cache[path] = (mtime, workbook)
+        return workbook
 
-        db.session.delete(company)
-        db.session.commit()
-
-        # Create audit log entry
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='DELETE',
-            table_name='target_companies',
-            record_id=str(company_id),
-            old_values=json.dumps(old_values),
-            new_values=None,
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
-        db.session.commit()
-
-        return {'message': 'Target company deleted successfully'}
-
-# Path to Excel file
-EXCEL_FILE = 'Hamman_Job_Search_Tracker.xlsx'
 
 class JobTrackerAPI(Resource):
-    def __init__(self):
-        # Load the Excel file and store the dataframes
-        self.dataframes = {}
-        
-        if os.path.exists(EXCEL_FILE):
-            excel_file = pd.ExcelFile(EXCEL_FILE)
-            for sheet_name in excel_file.sheet_names:
-                self.dataframes[sheet_name] = pd.read_excel(EXCEL_FILE, sheet_name=sheet_name)
-    
     def get(self, sheet_name=None):
         # Get data from Excel file
+        workbook = load_tracker_workbook()
         if not sheet_name:
             # Return list of sheets
-            sheets_info = {}
-            for name, df in self.dataframes.items():
-                sheets_info[name] = {'rows': len(df), 'columns': len(df.columns)}
-            return {'sheets': sheets_info}
-        
-        if sheet_name in self.dataframes:
-            # Convert DataFrame to JSON
-            df = self.dataframes[sheet_name]
-            # Convert date columns properly
-            result = {}
-            for col in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[col]):
-                    result[col] = df[col].dt.strftime('%Y-%m-%d').tolist()
-                else:
-                    result[col] = df[col].fillna('').tolist()
-            return result
+            return {'sheets': workbook['sheets']}
+
+        if sheet_name in workbook['payloads']:
+            return workbook['payloads'][sheet_name]
         else:
             return {'error': f'Sheet {sheet_name} not found'}, 404
 
@@ -671,31 +1234,15 @@ class JobTrackerAPI(Resource):
 class ApplicationTrackerAPI(Resource):
     def get(self):
         # Get application tracker data
-        tracker_api = JobTrackerAPI()
-        tracker_api.__init__()  # Initialize to load data
-        if 'Application Tracker' in tracker_api.dataframes:
-            df = tracker_api.dataframes['Application Tracker']
-            result = {}
-            for col in df.columns:
-                if pd.api.types.is_datetime64_any_dtype(df[col]):
-                    result[col] = df[col].dt.strftime('%Y-%m-%d').tolist()
-                else:
-                    result[col] = df[col].fillna('').tolist()
-            return result
+        workbook = load_tracker_workbook()
+        if 'Application Tracker' in workbook['payloads']:
+            return workbook['payloads']['Application Tracker']
         else:
             return {'error': 'Application Tracker sheet not found'}, 404
     
     def post(self):
         # Add/update application data
-        parser = reqparse.RequestParser()
-        parser.add_argument('company', type=str, help='Company name', required=True)
-        parser.add_argument('role_title', type=str, help='Role title', required=True)
-        parser.add_argument('location', type=str, help='Location')
-        parser.add_argument('hourly_rate', type=float, help='Hourly rate')
-        parser.add_argument('applied_date', type=str, help='Applied date')
-        parser.add_argument('application_source', type=str, help='Application source')
-        parser.add_argument('status', type=str, help='Application status')
-        args = parser.parse_args()
+        args = tracker_application_schema.parse()
         
         # This is a simplified version - in a real app you would write to the Excel file
         return {'message': 'Application added successfully', 'data': args}
@@ -703,158 +1250,238 @@ class ApplicationTrackerAPI(Resource):
 
 class DashboardAPI(Resource):
     @jwt_required()
+    @conditional_get(varies_with=lambda: datetime.now().date())
     def get(self):
         # Get dashboard metrics for the current user from the database
         current_user_id = int(get_jwt_identity())
 
-        # Get all applications for the current user
-        applications = JobApplication.query.filter_by(user_id=current_user_id).all()
-
-        if not applications:
-            return {
-                'total_applications': 0,
-                'applications_this_week': 0,
-                'interviews_scheduled': 0,
-                'offers_received': 0,
-                'high_priority_applications': 0,
-                'average_hourly_rate': 0.0,
-                'applications_today': 0,
-                'success_rate': 0.0
-            }
+        # Counters are maintained by the write paths, so this is a primary-key read
+        stats = db.session.get(UserDashboardStats, current_user_id)
+        if not stats or not stats.total_applications:
+            return dashboard_payload(stats)
 
-        # Calculate metrics from the applications
-        total_applications = len(applications)
-        applications_this_week = 0  # This would require more specific date calculation
-        interviews_scheduled = 0
-        offers_received = 0
-        high_priority_applications = 0
+        # Time-relative metrics come from the per-day buckets: at most a handful of rows
+        window = db.session.execute(dashboard_window_query(current_user_id, datetime.now().date())).one()
+        return dashboard_payload(stats, *window)
 
-        today = datetime.now().date()
-        valid_rates = [app.hourly_rate for app in applications if app.hourly_rate is not None]
-        avg_hourly_rate = sum(valid_rates) / len(valid_rates) if valid_rates else 0.0
-        applications_today = 0
 
-        for app in applications:
-            # Count applications from the past week
-            if app.applied_date and (today - app.applied_date).days <= 7:
-                applications_this_week += 1
+def dashboard_window_query(user_id, today):
+    # Applications in the last 7 days and today, summed from the user's per-day buckets
+    return db.select(
+        db.func.coalesce(db.func.sum(UserDailyApplicationCount.count), 0),
+        db.func.coalesce(db.func.sum(db.case((UserDailyApplicationCount.day == today, UserDailyApplicationCount.count), else_=0)), 0)
+    ).where(
+        UserDailyApplicationCount.user_id == user_id,
+        UserDailyApplicationCount.day >= today - timedelta(days=7)
+    )
 
-            # Count interviews and offers
-            if app.status and 'interview' in app.status.lower():
-                interviews_scheduled += 1
-            elif app.status and 'offer' in app.status.lower():
-                offers_received += 1
 
-            # Count high priority applications
-            if app.priority_level and app.priority_level.lower() == 'high':
-                high_priority_applications += 1
+def dashboard_payload(stats, applications_this_week=0, applications_today=0):
+    # Dashboard response from a user's counters (a UserDashboardStats or a row of its columns)
+    if stats is None or not stats.total_applications:
+        return {
+            'total_applications': 0,
+            'applications_this_week': 0,
+            'interviews_scheduled': 0,
+            'offers_received': 0,
+            'high_priority_applications': 0,
+            'average_hourly_rate': 0.0,
+            'applications_today': 0,
+            'success_rate': 0.0
+        }
 
-            # Count today's applications
-            if app.applied_date and app.applied_date == today:
-                applications_today += 1
+    total_applications = stats.total_applications
+    interviews_scheduled = stats.interviews_scheduled
+    offers_received = stats.offers_received
+    high_priority_applications = stats.high_priority_applications
+    avg_hourly_rate = stats.rate_sum / stats.rate_count if stats.rate_count else 0.0
+
+    success_rate = (offers_received / max(total_applications, 1)) * 100
+
+    return {
+        'total_applications': total_applications,
+        'applications_this_week': applications_this_week,
+        'interviews_scheduled': interviews_scheduled,
+        'offers_received': offers_received,
+        'high_priority_applications': high_priority_applications,
+        'average_hourly_rate': round(avg_hourly_rate, 2),
+        'applications_today': applications_today,
+        'success_rate': round(success_rate, 2)
+    }
+
+
+@app.cli.command('reconcile-dashboard-stats')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the counters')
+def reconcile_dashboard_stats(dry_run):
+    # Rebuild the dashboard counters and daily buckets from job_applications and report drift
+    today = datetime.now().date()
+    expected = {}
+    for row in dashboard_aggregate_query(today).all():
+        user_id, total, _, interviews, offers, high_priority, rate_sum, rate_count, _ = row
+        expected[user_id] = {
+            'total_applications': total,
+            'interviews_scheduled': interviews or 0,
+            'offers_received': offers or 0,
+            'high_priority_applications': high_priority or 0,
+            'rate_sum': float(rate_sum),
+            'rate_count': rate_count
+        }
 
-        success_rate = (offers_received / max(total_applications, 1)) * 100
+    drifted = 0
+    touched = set()
+    current = {stats.user_id: stats for stats in UserDashboardStats.query.all()}
+    for user_id in sorted(set(expected) | set(current)):
+        stats = current.get(user_id)
+        wanted = expected.get(user_id, dict.fromkeys(DASHBOARD_COUNTERS, 0))
+        actual = {key: getattr(stats, key) for key in DASHBOARD_COUNTERS} if stats else dict.fromkeys(DASHBOARD_COUNTERS, 0)
+        diff = {key: (actual[key], wanted[key]) for key in DASHBOARD_COUNTERS
+                if abs((actual[key] or 0) - wanted[key]) > 1e-6}
+        if diff:
+            drifted += 1
+            touched.add(user_id)
+            click.echo(f'user {user_id}: ' + ', '.join(f'{key} {old} -> {new}' for key, (old, new) in diff.items()))
+        if not dry_run:
+            if stats is None:
+                stats = UserDashboardStats(user_id=user_id)
+                db.session.add(stats)
+            for key in DASHBOARD_COUNTERS:
+                setattr(stats, key, wanted[key])
+
+    expected_days = {
+        (user_id, day): count
+        for user_id, day, count in db.session.query(
+            JobApplication.user_id, JobApplication.applied_date, db.func.count(JobApplication.id)
+        ).filter(JobApplication.applied_date.isnot(None)).group_by(JobApplication.user_id, JobApplication.applied_date)
+    }
+    current_days = {(bucket.user_id, bucket.day): bucket for bucket in UserDailyApplicationCount.query.all()}
+    drifted_days = 0
+    for key in set(expected_days) | set(current_days):
+        bucket = current_days.get(key)
+        if (bucket.count if bucket else 0) != expected_days.get(key, 0):
+            drifted_days += 1
+            touched.add(key[0])
+            if not dry_run:
+                if bucket is None:
+                    db.session.add(UserDailyApplicationCount(user_id=key[0], day=key[1], count=expected_days[key]))
+                elif key in expected_days:
+                    bucket.count = expected_days[key]
+                else:
+                    db.session.delete(bucket)
 
-        return {
-            'total_applications': total_applications,
-            'applications_this_week': applications_this_week,
-            'interviews_scheduled': interviews_scheduled,
-            'offers_received': offers_received,
-            'high_priority_applications': high_priority_applications,
-            'average_hourly_rate': round(avg_hourly_rate, 2),
-            'applications_today': applications_today,
-            'success_rate': round(success_rate, 2)
-        }
+    if dry_run:
+        db.session.rollback()
+    else:
+        # Corrected counters change what the dashboard returns
+        touch_user_data(touched)
+        db.session.commit()
+    click.echo(f'{drifted} user(s) and {drifted_days} daily bucket(s) drifted'
+               + (' (dry run, nothing changed)' if dry_run else ', counters rebuilt'))
 
 
 class AuthAPI(Resource):
     def post(self, action):
-        # Handle authentication: signup/login
-        parser = reqparse.RequestParser()
-        
-        if action == 'signup':
-            parser.add_argument('username', type=str, required=True, help='Username is required')
-            parser.add_argument('email', type=str, required=True, help='Email is required')
-            parser.add_argument('password', type=str, required=True, help='Password is required')
-            args = parser.parse_args()
-            
-            # Check if user already exists
-            if User.query.filter_by(username=args['username']).first():
-                return {'message': 'Username already exists'}, 400
-            
-            if User.query.filter_by(email=args['email']).first():
-                return {'message': 'Email already exists'}, 400
-            
-            # Create new user
-            user = User(username=args['username'], email=args['email'])
-            user.set_password(args['password'])
-            db.session.add(user)
-            db.session.commit()
-            
-            # Create access token - convert user.id to string to avoid JWT identity issues
-            access_token = create_access_token(identity=str(user.id))
-            return {'message': 'User created successfully', 'access_token': access_token}, 201
-        
-        elif action == 'login':
-            parser.add_argument('username', type=str, required=True, help='Username is required')
-            parser.add_argument('password', type=str, required=True, help='Password is required')
-            args = parser.parse_args()
-            
-            user = User.query.filter_by(username=args['username']).first()
-            
-            if user and user.check_password(args['password']):
-                access_token = create_access_token(identity=str(user.id))
-                return {'message': 'Login successful', 'access_token': access_token}, 200
-            else:
-                return {'message': 'Invalid credentials'}, 401
+        # Handle authentication: signup/login, token refresh and logout
+        try:
+            if action == 'signup':
+                return self._signup()
+            elif action == 'login':
+                return self._login()
+            elif action == 'refresh':
+                return self._refresh()
+            elif action == 'logout':
+                return self._logout()
+        except HasherBusy:
+            # Every hashing slot is taken; shed the request instead of queueing it without bound
+            return {'message': 'Too many sign-ins in progress, please retry shortly'}, 503, {'Retry-After': '1'}
+
+    def _signup(self):
+        args = signup_schema.parse()
+
+        # Check if user already exists
+        if User.query.filter_by(username=args['username']).first():
+            return {'message': 'Username already exists'}, 400
+
+        if User.query.filter_by(email=args['email']).first():
+            return {'message': 'Email already exists'}, 400
+
+        # Create new user
+        user = User(username=args['username'], email=args['email'])
+        user.set_password(args['password'])
+        db.session.add(user)
+        db.session.commit()
+
+        return {'message': 'User created successfully', **issue_tokens(user.id)}, 201
+
+    def _login(self):
+        args = login_schema.parse()
+
+        user = User.query.filter_by(username=args['username']).first()
+
+        if user and user.check_password(args['password']):
+            # Upgrade hashes made with an older method or cost while the password is at hand
+            if password_hasher.needs_rehash(user.password_hash):
+                user.set_password(args['password'])
+                db.session.commit()
+            return {'message': 'Login successful', **issue_tokens(user.id)}, 200
+        else:
+            return {'message': 'Invalid credentials'}, 401
+
+    def _refresh(self):
+        # Trade a refresh token for a new access/refresh pair. The presented token is revoked in
+        # the same step; presenting it again means it leaked, so the request is refused.
+        verify_jwt_in_request(refresh=True)
+        payload = get_jwt()
+        if not revoke_token(payload):
+            return {'message': 'Refresh token has already been used'}, 401
+        return {'message': 'Token refreshed', **issue_tokens(payload['sub'])}, 200
+
+    def _logout(self):
+        # Revoke the presented token and, when given in the body, the session's refresh token
+        verify_jwt_in_request(verify_type=False)
+        payload = get_jwt()
+        revoke_token(payload)
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token)
+            except (JWTExtendedException, PyJWTError):
+                # Already expired or revoked, or not a token at all; nothing left to revoke
+                refresh_payload = None
+            if refresh_payload and refresh_payload['sub'] == payload['sub']:
+                revoke_token(refresh_payload)
+        return {'message': 'Logged out'}, 200
 
 
 class UserApplicationsAPI(Resource):
     @jwt_required()
+    @conditional_get(cache=True)
     def get(self):
         # Get user's job applications
         current_user_id = int(get_jwt_identity())
-        applications = JobApplication.query.filter_by(user_id=current_user_id).all()
+        # Column rows rather than ORM instances: nothing here needs identity-mapped objects
+        query = db.session.query(*application_serializer.columns).filter(JobApplication.user_id == current_user_id)
+
+        # Without ?limit= or ?cursor= (or with the older ?all=true) the response stays the unpaginated
+        # list existing clients expect
+        next_cursor = None
+        if request.args.get('all', 'false').lower() == 'true' or not paginated():
+            applications = query.all()
+        else:
+            try:
+                applications, next_cursor = keyset_page(query, JobApplication.updated_at, JobApplication.id,
+                                                        page_limit(), request.args.get('cursor'))
+            except InvalidCursor:
+                return {'message': 'Invalid cursor'}, 400
         
-        result = []
-        for app in applications:
-            result.append({
-                'id': app.id,
-                'company': app.company,
-                'role_title': app.role_title,
-                'location': app.location,
-                'hourly_rate': app.hourly_rate,
-                'applied_date': app.applied_date.isoformat() if app.applied_date else None,
-                'status': app.status,
-                'application_source': app.application_source,
-                'contact_email': app.contact_email,
-                'priority_level': app.priority_level,
-                'created_at': app.created_at.isoformat() if app.created_at else None,
-                'updated_at': app.updated_at.isoformat() if app.updated_at else None
-            })
+        result = application_serializer.rows(applications, native_dates=True)
         
-        return {'applications': result}
+        return {'applications': result, 'next_cursor': next_cursor}
     
     @jwt_required()
     def post(self):
         # Create a new job application
         current_user_id = int(get_jwt_identity())
-        parser = reqparse.RequestParser()
-        parser.add_argument('company', type=str, required=True, help='Company name is required')
-        parser.add_argument('role_title', type=str, required=True, help='Role title is required')
-        parser.add_argument('location', type=str)
-        parser.add_argument('hourly_rate', type=float)
-        parser.add_argument('applied_date', type=str)
-        parser.add_argument('status', type=str, default='Applied')
-        parser.add_argument('application_source', type=str)
-        parser.add_argument('contact_email', type=str)
-        parser.add_argument('priority_level', type=str)
-        args = parser.parse_args()
-        
-        # Convert date string to date object if provided
-        applied_date = None
-        if args['applied_date']:
-            applied_date = datetime.strptime(args['applied_date'], '%Y-%m-%d').date()
+        args = application_schema.parse()
         
         application = JobApplication(
             user_id=current_user_id,
@@ -862,7 +1489,7 @@ class UserApplicationsAPI(Resource):
             role_title=args['role_title'],
             location=args['location'],
             hourly_rate=args['hourly_rate'],
-            applied_date=applied_date,
+            applied_date=args['applied_date'],
             status=args['status'],
             application_source=args['application_source'],
             contact_email=args['contact_email'],
@@ -870,33 +1497,340 @@ class UserApplicationsAPI(Resource):
         )
         
         db.session.add(application)
-        db.session.commit()
+        update_dashboard_stats(current_user_id, added=[dashboard_snapshot(application)])
+        db.session.flush()
         
         # Create audit log entry
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='CREATE',
-            table_name='job_applications',
-            record_id=str(application.id),
-            new_values=None,  # We'll store the new values in JSON format
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
+        record_audit(audit_entry(current_user_id, 'CREATE', 'job_applications', str(application.id)))
         db.session.commit()
         
-        return {'message': 'Application created successfully', 'application': {
-            'id': application.id,
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }}, 201
+        return {'message': 'Application created successfully', 'application': application_summary_serializer.instance(application)}, 201
+
+
+class ApplicationExportAPI(Resource):
+    EXPORT_BATCH_SIZE = 1000
+
+    @jwt_required()
+    def get(self):
+        # Stream all of the user's applications as NDJSON or CSV
+        current_user_id = int(get_jwt_identity())
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            return {'message': 'format must be ndjson or csv'}, 400
+
+        # Column rows instead of ORM instances, fetched in batches (a server-side cursor on PostgreSQL)
+        rows = db.session.query(*application_serializer.columns) \
+            .filter(JobApplication.user_id == current_user_id) \
+            .order_by(JobApplication.id) \
+            .execution_options(yield_per=self.EXPORT_BATCH_SIZE)
+
+        if export_format == 'csv':
+            body, mimetype = self._csv(rows), 'text/csv'
+        else:
+            body, mimetype = self._ndjson(rows), 'application/x-ndjson'
+
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename=applications.{export_format}'
+        })
+
+    def _ndjson(self, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(dumps(application_serializer.row(row)))
+            if len(chunk) == self.EXPORT_BATCH_SIZE:
+                yield b'\n'.join(chunk) + b'\n'
+                chunk = []
+        if chunk:
+            yield b'\n'.join(chunk) + b'\n'
+
+    def _csv(self, rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=application_serializer.keys)
+        writer.writeheader()
+        for count, row in enumerate(rows, 1):
+            writer.writerow(application_serializer.row(row))
+            if count % self.EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+
+class ApplicationImportAPI(Resource):
+    IMPORT_CHUNK_SIZE = 1000
+    MAX_IMPORT_ROWS = 50000
+    @jwt_required()
+    def post(self):
+        # Import many applications at once from a JSON array or a CSV upload
+        current_user_id = int(get_jwt_identity())
+        try:
+            raw_rows = self._read_rows()
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        if len(raw_rows) > self.MAX_IMPORT_ROWS:
+            return {'message': f'At most {self.MAX_IMPORT_ROWS} rows can be imported at once'}, 400
+
+        # Validate everything before touching the database
+        valid, errors = [], []
+        for index, raw in enumerate(raw_rows):
+            values, row_errors = self._validate(raw)
+            if row_errors:
+                errors.append({'row': index, 'errors': row_errors})
+            else:
+                valid.append((index, values))
+
+        if not valid:
+            return {'message': 'No valid rows to import', 'imported': 0, 'failed': len(errors), 'errors': errors}, 400
+
+        now = datetime.utcnow()
+        table = JobApplication.__table__
+        ids = []
+        for start in range(0, len(valid), self.IMPORT_CHUNK_SIZE):
+            chunk = [dict(values, user_id=current_user_id, created_at=now, updated_at=now)
+                     for _, values in valid[start:start + self.IMPORT_CHUNK_SIZE]]
+            # A single executemany; SQLAlchemy batches it into multi-row INSERT ... RETURNING
+            result = db.session.execute(table.insert().returning(table.c.id, sort_by_parameter_order=True), chunk)
+            ids.extend(result.scalars().all())
+
+        update_dashboard_stats(current_user_id, added=[
+            (values['status'], values['priority_level'], values['hourly_rate'], values['applied_date'])
+            for _, values in valid
+        ])
+
+        record_audit(*[
+            audit_entry(current_user_id, 'CREATE', 'job_applications', str(application_id), new_values=json.dumps(
+                dict(values, applied_date=values['applied_date'].isoformat() if values['applied_date'] else None)))
+            for application_id, (_, values) in zip(ids, valid)
+        ])
+        db.session.commit()
+
+        return {
+            'message': f'Imported {len(ids)} applications',
+            'imported': len(ids),
+            'failed': len(errors),
+            'ids': [{'row': index, 'id': application_id} for application_id, (index, _) in zip(ids, valid)],
+            'errors': errors
+        }, 201
+
+    def _read_rows(self):
+        # Accept a CSV file upload, a text/csv body or a JSON array (optionally under "applications")
+        if 'file' in request.files:
+            return list(csv.DictReader(io.StringIO(request.files['file'].read().decode('utf-8-sig'))))
+        if request.mimetype == 'text/csv':
+            return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('applications')
+        if not isinstance(data, list):
+            raise ValueError('Expected a JSON array of applications or a CSV file')
+        return data
+
+    def _validate(self, raw):
+        if not isinstance(raw, dict):
+            return None, {'row': 'Each row must be an object'}
+        # CSV gives empty strings for missing cells
+        return application_schema.load(raw, blank_as_missing=True)
+
+
+class BatchMutationAPI(Resource):
+    # Apply an ordered list of operations on one model in a single transaction:
+    #   {"op": "create", "data": {...}}
+    #   {"op": "update", "id": 5, "data": {...}}   (only the fields given change)
+    #   {"op": "delete", "id": 7}
+    # Consecutive operations of the same kind run as one statement: one INSERT executemany,
+    # one UPDATE ... WHERE id IN (...) per run of identical changes, one DELETE ... WHERE
+    # id IN (...). Audit rows are written in one batch. Every operation gets a result; one that
+    # fails (invalid, or not a record of the user) is skipped without undoing the others.
+    MAX_OPERATIONS = 1000
+    model = None
+    schema = None
+    values_serializer = None  # the editable fields: keys are schema fields, attributes columns
+    record_key = None
+    audit_table = None
+    not_found_message = None
+
+    @jwt_required()
+    def post(self):
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True)
+        operations = data.get('operations') if isinstance(data, dict) else data
+        if not isinstance(operations, list) or not operations:
+            return {'message': 'Expected a non-empty JSON array of operations, optionally under "operations"'}, 400
+        if len(operations) > self.MAX_OPERATIONS:
+            return {'message': f'At most {self.MAX_OPERATIONS} operations can be applied at once'}, 400
+
+        # Validate everything before touching the database
+        results = [None] * len(operations)
+        valid = []
+        for index, operation in enumerate(operations):
+            op, record_id, values, error = self._validate(operation)
+            if error:
+                results[index] = dict({'index': index, 'op': op, 'status': 400}, **error)
+            else:
+                valid.append((index, op, record_id, values))
+
+        # Current values of every existing record the batch refers to, in one query; kept up to
+        # date below so each operation sees the ones before it
+        model = self.model
+        ids = {record_id for _, op, record_id, _ in valid if op != 'create'}
+        current = {}
+        if ids:
+            rows = db.session.execute(db.select(model.id, *self.values_serializer.columns).where(
+                model.user_id == current_user_id, model.id.in_(ids)))
+            current = {row[0]: list(row[1:]) for row in rows}
+
+        self._audit, self._removed, self._added = [], [], []
+        now = datetime.utcnow()
+        for key, group in itertools.groupby(valid, key=self._group_key):
+            group = list(group)
+            if key[0] == 'create':
+                self._create(current_user_id, group, current, results, now)
+            elif key[0] == 'update':
+                self._update(current_user_id, group, current, results, now)
+            else:
+                self._delete(current_user_id, group, current, results)
+
+        succeeded = sum(1 for result in results if result['status'] < 300)
+        if succeeded:
+            self._after_changes(current_user_id, self._removed, self._added)
+            record_audit(*self._audit)
+            db.session.commit()
+        return {
+            'message': f'Applied {succeeded} of {len(results)} operations',
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results
+        }, 200 if succeeded else 400
+
+    def _validate(self, operation):
+        # (op, record id, values, error) for one operation
+        if not isinstance(operation, dict):
+            return None, None, None, {'message': 'Each operation must be an object'}
+        op = operation.get('op')
+        if op not in ('create', 'update', 'delete'):
+            return op, None, None, {'message': 'op must be one of create, update, delete'}
+        record_id = None
+        if op != 'create':
+            record_id = operation.get('id')
+            if not isinstance(record_id, int) or isinstance(record_id, bool):
+                return op, None, None, {'message': 'id must be an integer'}
+        if op == 'delete':
+            return op, record_id, None, None
+        data = operation.get('data')
+        if not isinstance(data, dict):
+            return op, record_id, None, {'message': 'data must be an object'}
+        values, errors = self.schema.load(data, partial=op == 'update')
+        if errors:
+            return op, record_id, None, {'message': '; '.join(errors.values()), 'errors': errors}
+        if not values:
+            return op, record_id, None, {'message': 'No fields to update'}
+        return op, record_id, values, None
+
+    @staticmethod
+    def _group_key(item):
+        # Consecutive operations with the same key share a statement
+        _, op, _, values = item
+        return (op, tuple(sorted(values.items()))) if op == 'update' else (op,)
+
+    def _create(self, user_id, group, current, results, now):
+        serializer = self.values_serializer
+        table = self.model.__table__
+        rows = [dict({attribute: values[key] for key, attribute in zip(serializer.keys, serializer.attributes)},
+                     user_id=user_id, created_at=now, updated_at=now)
+                for _, _, _, values in group]
+        result = db.session.execute(table.insert().returning(table.c.id, sort_by_parameter_order=True), rows)
+        for (index, op, _, values), record_id in zip(group, result.scalars().all()):
+            state = [values[key] for key in serializer.keys]
+            current[record_id] = state
+            self._added.append(state)
+            new_values = serializer.row(state)
+            self._audit.append(audit_entry(user_id, 'CREATE', self.audit_table, str(record_id),
+                                           new_values=json.dumps(new_values)))
+            results[index] = {'index': index, 'op': op, 'id': record_id, 'status': 201,
+                              self.record_key: dict(id=record_id, **new_values)}
+
+    def _update(self, user_id, group, current, results, now):
+        serializer = self.values_serializer
+        values = group[0][3]
+        positions = [serializer.keys.index(key) for key in values]
+        found = []
+        for index, op, record_id, _ in group:
+            if record_id not in current:
+                results[index] = {'index': index, 'op': op, 'id': record_id, 'status': 404,
+                                  'message': self.not_found_message}
+                continue
+            found.append(record_id)
+            old = current[record_id]
+            new = list(old)
+            for position, value in zip(positions, values.values()):
+                new[position] = value
+            current[record_id] = new
+            self._removed.append(old)
+            self._added.append(new)
+            new_values = serializer.row(new)
+            self._audit.append(audit_entry(user_id, 'UPDATE', self.audit_table, str(record_id),
+                                           old_values=json.dumps(serializer.row(old)), new_values=json.dumps(new_values)))
+            results[index] = {'index': index, 'op': op, 'id': record_id, 'status': 200,
+                              self.record_key: dict(id=record_id, **new_values)}
+        if found:
+            changes = {serializer.attributes[position]: value for position, value in zip(positions, values.values())}
+            table = self.model.__table__
+            db.session.execute(table.update().where(table.c.user_id == user_id, table.c.id.in_(found))
+                               .values(updated_at=now, **changes))
+
+    def _delete(self, user_id, group, current, results):
+        found = []
+        for index, op, record_id, _ in group:
+            old = current.pop(record_id, None)
+            if old is None:
+                results[index] = {'index': index, 'op': op, 'id': record_id, 'status': 404,
+                                  'message': self.not_found_message}
+                continue
+            found.append(record_id)
+            self._removed.append(old)
+            self._audit.append(audit_entry(user_id, 'DELETE', self.audit_table, str(record_id),
+                                           old_values=json.dumps(self.values_serializer.row(old))))
+            results[index] = {'index': index, 'op': op, 'id': record_id, 'status': 200}
+        if found:
+            table = self.model.__table__
+            db.session.execute(table.delete().where(table.c.user_id == user_id, table.c.id.in_(found)))
+
+    def _after_changes(self, user_id, removed, added):
+        # Hook for derived data; removed/added are the old and new field values of changed records
+        pass
+
+
+class ApplicationBatchAPI(BatchMutationAPI):
+    model = JobApplication
+    schema = application_schema
+    values_serializer = application_values_serializer
+    record_key = 'application'
+    audit_table = 'job_applications'
+    not_found_message = 'Application not found'
+
+    # Where dashboard_snapshot()'s fields sit in a record's values
+    SNAPSHOT_POSITIONS = tuple(application_values_serializer.keys.index(key)
+                               for key in ('status', 'priority_level', 'hourly_rate', 'applied_date'))
+
+    def _delete(self, user_id, group, current, results):
+        super()._delete(user_id, group, current, results)
+        unlink_interviews(user_id, [record_id for index, _, record_id, _ in group if results[index]['status'] == 200])
+
+    def _after_changes(self, user_id, removed, added):
+        def snapshot(state):
+            return tuple(state[position] for position in self.SNAPSHOT_POSITIONS)
+        update_dashboard_stats(user_id, removed=[snapshot(state) for state in removed],
+                               added=[snapshot(state) for state in added])
+
+
+class TargetCompanyBatchAPI(BatchMutationAPI):
+    model = TargetCompany
+    schema = company_schema
+    values_serializer = company_values_serializer
+    record_key = 'company'
+    audit_table = 'target_companies'
+    not_found_message = 'Target company not found'
 
 
 class UserApplicationDetailAPI(Resource):
@@ -909,20 +1843,7 @@ class UserApplicationDetailAPI(Resource):
         if not application:
             return {'message': 'Application not found'}, 404
 
-        return {'application': {
-            'id': application.id,
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level,
-            'created_at': application.created_at.isoformat(),
-            'updated_at': application.updated_at.isoformat()
-        }}
+        return {'application': application_serializer.instance(application)}
     
     @jwt_required()
     def put(self, application_id):
@@ -934,87 +1855,32 @@ class UserApplicationDetailAPI(Resource):
             return {'message': 'Application not found'}, 404
         
         # Store old values for audit
-        old_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
-        
-        parser = reqparse.RequestParser()
-        parser.add_argument('company', type=str, required=True, help='Company name is required')
-        parser.add_argument('role_title', type=str, required=True, help='Role title is required')
-        parser.add_argument('location', type=str)
-        parser.add_argument('hourly_rate', type=float)
-        parser.add_argument('applied_date', type=str)
-        parser.add_argument('status', type=str, default='Applied')
-        parser.add_argument('application_source', type=str)
-        parser.add_argument('contact_email', type=str)
-        parser.add_argument('priority_level', type=str)
-        args = parser.parse_args()
+        old_values = application_values_serializer.instance(application)
         
-        # Convert date string to date object if provided
-        applied_date = None
-        if args['applied_date']:
-            applied_date = datetime.strptime(args['applied_date'], '%Y-%m-%d').date()
+        args = application_schema.parse()
         
         # Update the application
+        old_snapshot = dashboard_snapshot(application)
         application.company = args['company']
         application.role_title = args['role_title']
         application.location = args['location']
         application.hourly_rate = args['hourly_rate']
-        application.applied_date = applied_date
+        application.applied_date = args['applied_date']
         application.status = args['status']
         application.application_source = args['application_source']
         application.contact_email = args['contact_email']
         application.priority_level = args['priority_level']
         application.updated_at = datetime.utcnow()
-        
-        db.session.commit()
+        update_dashboard_stats(current_user_id, removed=[old_snapshot], added=[dashboard_snapshot(application)])
         
         # Create audit log entry
-        new_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
+        new_values = application_values_serializer.instance(application)
         
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='UPDATE',
-            table_name='job_applications',
-            record_id=str(application_id),
-            old_values=str(old_values),
-            new_values=str(new_values),
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
+        record_audit(audit_entry(current_user_id, 'UPDATE', 'job_applications', str(application_id),
+                                 old_values=str(old_values), new_values=str(new_values)))
         db.session.commit()
         
-        return {'message': 'Application updated successfully', 'application': {
-            'id': application.id,
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }}
+        return {'message': 'Application updated successfully', 'application': application_summary_serializer.instance(application)}
     
     @jwt_required()
     def delete(self, application_id):
@@ -1026,33 +1892,15 @@ class UserApplicationDetailAPI(Resource):
             return {'message': 'Application not found'}, 404
         
         # Store old values for audit
-        old_values = {
-            'company': application.company,
-            'role_title': application.role_title,
-            'location': application.location,
-            'hourly_rate': application.hourly_rate,
-            'applied_date': application.applied_date.isoformat() if application.applied_date else None,
-            'status': application.status,
-            'application_source': application.application_source,
-            'contact_email': application.contact_email,
-            'priority_level': application.priority_level
-        }
+        old_values = application_values_serializer.instance(application)
         
+        update_dashboard_stats(current_user_id, removed=[dashboard_snapshot(application)])
+        unlink_interviews(current_user_id, [application_id])
         db.session.delete(application)
-        db.session.commit()
         
         # Create audit log entry
-        audit_log = AuditLog(
-            user_id=current_user_id,
-            action='DELETE',
-            table_name='job_applications',
-            record_id=str(application_id),
-            old_values=str(old_values),
-            new_values=None,
-            ip_address=request.remote_addr,
-            user_agent=request.user_agent.string if request.user_agent else None
-        )
-        db.session.add(audit_log)
+        record_audit(audit_entry(current_user_id, 'DELETE', 'job_applications', str(application_id),
+                                 old_values=str(old_values)))
         db.session.commit()
         
         return {'message': 'Application deleted successfully'}
@@ -1060,36 +1908,218 @@ class UserApplicationDetailAPI(Resource):
 
 class AuditLogAPI(Resource):
     @jwt_required()
+    @conditional_get(cache=True)
     def get(self):
         # Get audit logs for current user
         current_user_id = int(get_jwt_identity())
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-
-        logs = AuditLog.query.filter_by(user_id=current_user_id)                     .order_by(AuditLog.timestamp.desc())                     .paginate(page=page, per_page=per_page, error_out=False)
-
-        result = []
-        for log in logs.items:
-            result.append({
-                'id': log.id,
-                'action': log.action,
-                'table_name': log.table_name,
-                'record_id': log.record_id,
-                'old_values': log.old_values,
-                'new_values': log.new_values,
-                'timestamp': log.timestamp.isoformat(),
-                'ip_address': log.ip_address,
-                'user_agent': log.user_agent
-            })
+        query = db.session.query(*audit_log_serializer.columns).filter(AuditLog.user_id == current_user_id)
+
+        # Offset mode (page, per_page, total and pages) stays the default response; cursor mode is
+        # opted into with ?limit=, ?cursor= or ?include_archived=
+        if not any(name in request.args for name in ('limit', 'cursor', 'include_archived')):
+            page = request.args.get('page', 1, type=int)
+            per_page = request.args.get('per_page', 10, type=int)
+            logs = query.order_by(AuditLog.timestamp.desc()).paginate(page=page, per_page=per_page, error_out=False)
+            return {
+                'logs': audit_log_serializer.rows(logs.items, native_dates=True),
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': logs.total,
+                    'pages': logs.pages
+                }
+            }
+
+        # Cursor mode: seek on (timestamp, id) descending, no OFFSET and no COUNT(*)
+        limit = page_limit()
+        try:
+            logs, next_cursor = keyset_page(query, AuditLog.timestamp, AuditLog.id, limit, request.args.get('cursor'))
+        except InvalidCursor:
+            return {'message': 'Invalid cursor'}, 400
+
+        result = audit_log_serializer.rows(logs, native_dates=True)
+
+        # Once the live table runs out, continue into the archived rows if asked to
+        if next_cursor is None and request.args.get('include_archived', 'false').lower() == 'true':
+            if logs:
+                before = (logs[-1].timestamp, logs[-1].id)
+            else:
+                before = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+            if before is not None and before[0] is None:
+                # A cursor without a timestamp is past every live row, so every archived row follows it
+                before = None
+            archived = audit_archive.read_before(current_user_id, before, limit - len(result) + 1)
+            if len(archived) > limit - len(result):
+                archived = archived[:limit - len(result)]
+                next_cursor = encode_cursor(datetime.fromisoformat(archived[-1]['timestamp']), archived[-1]['id'])
+            result.extend({key: value for key, value in record.items() if key != 'user_id'} for record in archived)
+
+        pagination = {'limit': limit, 'next_cursor': next_cursor}
+        if request.args.get('include_total', 'false').lower() == 'true':
+            # Approximate: read from the maintained counter rather than counting rows
+            counter = db.session.get(AuditLogCounter, current_user_id)
+            pagination['total'] = counter.total if counter else 0
+
+        return {'logs': result, 'pagination': pagination}
+
+
+@app.cli.command('archive-audit-log')
+@click.option('--older-than-days', type=int, default=None, help='Archive rows older than this (default AUDIT_RETENTION_DAYS)')
+@click.option('--batch-size', type=int, default=5000, help='Rows moved and deleted per transaction')
+@click.option('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+def archive_audit_log(older_than_days, batch_size, pause):
+    # Move old audit rows into compressed per-user monthly archive files, deleting them in bounded batches
+    if older_than_days is None:
+        older_than_days = app.config['AUDIT_RETENTION_DAYS']
+
+    # Archives written before the per-user layout are split up first
+    split = audit_archive.split_legacy_files()
+    if split:
+        click.echo(f'Moved {split} rows from shared monthly archive files into per-user files')
+
+    # Finish a batch that was archived but not deleted when a previous run stopped
+    pending = audit_archive.pending_ids()
+    if pending:
+        user_ids = {user_id for user_id, in db.session.query(AuditLog.user_id).filter(AuditLog.id.in_(pending)).distinct()}
+        AuditLog.query.filter(AuditLog.id.in_(pending)).delete(synchronize_session=False)
+        touch_user_data(user_ids)
+        db.session.commit()
+        audit_archive.finish_batch()
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    moved = 0
+    while True:
+        logs = AuditLog.query.filter(AuditLog.timestamp < cutoff) \
+            .order_by(AuditLog.timestamp, AuditLog.id).limit(batch_size).all()
+        if not logs:
+            break
+        audit_archive.write_batch([dict(audit_log_serializer.instance(log), user_id=log.user_id) for log in logs])
+        AuditLog.query.filter(AuditLog.id.in_([log.id for log in logs])).delete(synchronize_session=False)
+        touch_user_data({log.user_id for log in logs})
+        db.session.commit()
+        audit_archive.finish_batch()
+        moved += len(logs)
+        if pause:
+            time.sleep(pause)
+
+    click.echo(f'Archived {moved} audit log rows older than {cutoff.isoformat()} to {audit_archive.directory}')
+
+
+@app.cli.command('sweep-resume-store')
+def sweep_resume_store():
+    # Delete expired resume jobs and the blobs and parse results no other job refers to, as the web
+    # workers do every RESUME_SWEEP_INTERVAL seconds (for deployments that turn that off and use cron)
+    removed = resume_store.sweep()
+    click.echo(f"Deleted {removed['jobs']} expired jobs, {removed['blobs']} resumes and "
+               f"{removed['results']} parse results from {resume_store.directory}")
+
+
+@app.cli.command('create-audit-partitions')
+@click.option('--months-ahead', type=int, default=MONTHS_AHEAD, help='Months after the current one to create')
+def create_audit_partitions(months_ahead):
+    # Add the coming months' partitions to a month-partitioned audit_log (PostgreSQL, migration 010).
+    # Run it monthly: rows of a month without a partition go to DEFAULT until the month is added.
+    if db.engine.dialect.name != 'postgresql' or not is_partitioned(db.session.connection(), AuditLog.__tablename__):
+        click.echo('audit_log is not partitioned; nothing to do')
+        return
+    today = date.today()
+    months = list(month_range(today, today + timedelta(days=31 * months_ahead)))
+    with db.engine.begin() as connection:
+        created = ensure_month_partitions(connection, AuditLog.__tablename__, 'timestamp', months)
+    click.echo(f'Created {created} audit_log partitions for {months[0]:%Y-%m} to {months[-1]:%Y-%m}')
+
+
+class SearchAPI(Resource):
+    MAX_OFFSET = 1000
+
+    @jwt_required()
+    def get(self):
+        # Ranked full-text search over the user's applications and target companies
+        current_user_id = int(get_jwt_identity())
+        terms = search_terms(request.args.get('q', ''))
+        if not terms:
+            return {'message': 'Search query is required'}, 400
+        kind = request.args.get('type', 'all')
+        if kind not in ('all', 'applications', 'companies'):
+            return {'message': 'type must be all, applications or companies'}, 400
+        limit = page_limit()
+        offset = max(0, min(request.args.get('offset', 0, type=int), self.MAX_OFFSET))
+
+        result = {'query': ' '.join(terms), 'pagination': {'limit': limit, 'offset': offset, 'has_more': {}}}
+        sections = (
+            ('applications', JobApplication, application_serializer),
+            ('companies', TargetCompany, company_serializer),
+        )
+        connection = db.session.connection()
+        for section, model, serializer in sections:
+            if kind not in ('all', section):
+                continue
+            matches = search_ids(connection, model.__tablename__, section, current_user_id, terms, limit + 1, offset)
+            result['pagination']['has_more'][section] = len(matches) > limit
+            matches = matches[:limit]
+
+            # Load the matched rows by primary key and keep the ranking order
+            rows = {row.id: row for row in db.session.query(*serializer.columns)
+                    .filter(model.id.in_([row_id for row_id, _ in matches]))}
+            result[section] = [dict(serializer.row(rows[row_id]), score=round(score, 6))
+                               for row_id, score in matches if row_id in rows]
+        return result
+
+
+class AuditHealthAPI(Resource):
+    def get(self):
+        # Report the audit sink mode and, in async mode, queue depth and backpressure counters
+        return {
+            'mode': app.config['AUDIT_MODE'],
+            'metrics': audit_writer.metrics() if audit_writer else None
+        }
+
 
+class CacheHealthAPI(Resource):
+    def get(self):
+        # Report the response cache backend with its hit, miss and eviction counters
         return {
-            'logs': result,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': logs.total,
-                'pages': logs.pages
-            }
+            'backend': app.config['RESPONSE_CACHE'],
+            'metrics': response_cache.metrics() if response_cache else None
+        }
+
+
+class ResumeHealthAPI(Resource):
+    def get(self):
+        # Report resume uploads, deduplicated blobs, parse cache hits and parses in flight, and the
+        # size of the matching corpus
+        return {
+            'workers': resume_store.workers,
+            'metrics': resume_store.metrics(),
+            'matcher': job_matcher.metrics()
+        }
+
+
+class DatabaseHealthAPI(Resource):
+    def get(self):
+        # Report the engine's pool counts and settings, with a round-trip time and, on SQLite,
+        # the PRAGMAs in effect
+        engine = db.engine
+        pool = pool_status(engine)
+        started = time.perf_counter()
+        with engine.connect() as connection:
+            connection.execute(db.text('SELECT 1'))
+            ping_ms = (time.perf_counter() - started) * 1000
+            pragmas = None
+            if engine.dialect.name == 'sqlite':
+                pragmas = {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+                           for name in app.config['SQLITE_PRAGMAS']}
+        return {
+            'dialect': engine.dialect.name,
+            'driver': engine.driver,
+            'pool': pool,
+            'settings': engine_settings(engine.url, app.config),
+            'sqlite_pragmas': pragmas,
+            'ping_ms': round(ping_ms, 2),
+            'replicas': {
+                'routing': replica_router.metrics(),
+                'pools': [pool_status(engine) for engine in replica_router.engines]
+            } if replica_router else None
         }
 
 
@@ -1097,9 +2127,7 @@ class CompanySearchAPI(Resource):
     @jwt_required()
     def post(self):
         # Search for top companies using Google AI or web search
-        parser = reqparse.RequestParser()
-        parser.add_argument('query', type=str, required=True, help='Search query is required')
-        args = parser.parse_args()
+        args = company_search_schema.parse()
 
         search_query = args['query']
 
@@ -1155,18 +2183,93 @@ class CompanySearchAPI(Resource):
         return {'results': mock_companies[:5]}
 
 
+def api_query_plan_checks(user_id=1):
+    # The per-user queries the API resources issue, with representative parameter values;
+    # tests/test_query_plans.py checks that each one is served from an index, and
+    # benchmarks/queries.py times them
+    today = datetime.now().date()
+    cursor = encode_cursor(datetime(2100, 1, 1), 2 ** 31 - 1)
+    return [
+        ('applications page', keyset_query(JobApplication.query.filter_by(user_id=user_id),
+                                           JobApplication.updated_at, JobApplication.id, DEFAULT_PAGE_SIZE, cursor)),
+        ('application detail', JobApplication.query.filter_by(id=1, user_id=user_id)),
+        ('applications by status', JobApplication.query.filter_by(user_id=user_id, status='Applied')),
+        ('applications by applied date', JobApplication.query.filter(
+            JobApplication.user_id == user_id, JobApplication.applied_date >= today - timedelta(days=30))),
+        ('applications export', db.session.query(*JobApplication.__table__.columns)
+            .filter(JobApplication.user_id == user_id).order_by(JobApplication.id)),
+        ('target companies page', keyset_query(TargetCompany.query.filter_by(user_id=user_id),
+                                               TargetCompany.updated_at, TargetCompany.id, DEFAULT_PAGE_SIZE, cursor)),
+        ('target company detail', TargetCompany.query.filter_by(id=1, user_id=user_id)),
+        ('dashboard counters', UserDashboardStats.query.filter_by(user_id=user_id)),
+        ('dashboard daily buckets', UserDailyApplicationCount.query.filter(
+            UserDailyApplicationCount.user_id == user_id, UserDailyApplicationCount.day >= today - timedelta(days=7))),
+        ('interviews window', keyset_query(Interview.query.filter(
+            Interview.user_id == user_id, Interview.scheduled_at >= datetime.combine(today, datetime.min.time()),
+            Interview.scheduled_at < datetime.combine(today + timedelta(days=30), datetime.min.time())),
+            Interview.scheduled_at, Interview.id, DEFAULT_PAGE_SIZE, descending=False)),
+        ('audit log page', keyset_query(AuditLog.query.filter_by(user_id=user_id),
+                                        AuditLog.timestamp, AuditLog.id, DEFAULT_PAGE_SIZE, cursor)),
+        ('audit log counter', AuditLogCounter.query.filter_by(user_id=user_id)),
+        ('audit log archive batch', AuditLog.query.filter(AuditLog.timestamp < datetime(2000, 1, 1))
+            .order_by(AuditLog.timestamp, AuditLog.id).limit(5000)),
+    ]
+
+
+@app.cli.command('import-job-postings')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, default=1000, help='Rows inserted per statement')
+def import_job_postings(path, batch_size):
+    # Store job postings from a CSV file with a header row. Columns are named like JobPosting's
+    # (company, position, industry, location, salary_range, remote_policy, apply_link, description);
+    # rows without a company or position are skipped. Workers pick them up within
+    # JOB_POSTING_SYNC_INTERVAL seconds.
+    columns = [column.name for column in JobPosting.__table__.columns if column.name not in ('id', 'created_at')]
+    now = datetime.utcnow()
+    imported = skipped = 0
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.DictReader(file)
+        while True:
+            batch = list(itertools.islice(reader, batch_size))
+            if not batch:
+                break
+            values = []
+            for row in batch:
+                row = {column: (row.get(column) or '').strip() or None for column in columns}
+                if not row['company'] or not row['position']:
+                    skipped += 1
+                    continue
+                values.append(dict(row, created_at=now))
+            if values:
+                db.session.execute(JobPosting.__table__.insert(), values)
+                db.session.commit()
+                imported += len(values)
+    click.echo(f'Imported {imported} job postings ({skipped} rows skipped)')
+
+
 # Add resource routes
 api.add_resource(JobTrackerAPI, '/api/tracker', '/api/tracker/<string:sheet_name>')
 api.add_resource(ApplicationTrackerAPI, '/api/tracker/application')
 api.add_resource(DashboardAPI, '/api/tracker/dashboard')
 api.add_resource(AuthAPI, '/api/auth/<string:action>')
 api.add_resource(UserApplicationsAPI, '/api/applications')
+api.add_resource(ApplicationExportAPI, '/api/applications/export')
+api.add_resource(ApplicationImportAPI, '/api/applications/import')
+api.add_resource(ApplicationBatchAPI, '/api/applications/batch')
 api.add_resource(UserApplicationDetailAPI, '/api/applications/<int:application_id>')
 api.add_resource(TargetCompaniesAPI, '/api/target-companies')
 api.add_resource(TargetCompanyDetailAPI, '/api/target-companies/<int:company_id>')
+api.add_resource(TargetCompanyBatchAPI, '/api/target-companies/batch')
 api.add_resource(InterviewsAPI, '/api/interviews')
 api.add_resource(AuditLogAPI, '/api/audit-log')
 api.add_resource(CompanySearchAPI, '/api/search-companies')
+api.add_resource(UploadResumeAPI, '/api/upload-resume')
+api.add_resource(ResumeJobAPI, '/api/upload-resume/<string:job_id>')
+api.add_resource(AuditHealthAPI, '/api/health/audit')
+api.add_resource(CacheHealthAPI, '/api/health/cache')
+api.add_resource(DatabaseHealthAPI, '/api/health/db')
+api.add_resource(ResumeHealthAPI, '/api/health/resumes')
+api.add_resource(SearchAPI, '/api/search')
 
 # Run database migrations or create tables
 # When using in production with Render, prefer Alembic migrations
@@ -1194,6 +2297,10 @@ else:
         with app.app_context():
             # Create tables
             db.create_all()
+            with db.engine.begin() as connection:
+                install_search_index(connection, JobApplication.__tablename__, TargetCompany.__tablename__)
+            # create_all() makes the dashboard counter tables empty; fill them in for existing users
+            backfill_dashboard_stats()
             # Check if admin user exists, create if not
             if not User.query.filter_by(username='admin').first():
                 admin = User(username='admin', email='admin@example.com')
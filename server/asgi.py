@@ -0,0 +1,233 @@
+"""ASGI entry point: the same API, served from an event loop.
+
+    uvicorn asgi:app
+
+The read endpoints that carry most of the traffic are handled natively: the
+application, target company and audit log lists and the dashboard. Their
+access token is checked in process and their queries run on SQLAlchemy's
+asyncio engine (aiosqlite, or asyncpg on PostgreSQL), so a request waiting on
+the database holds no thread and one process can keep hundreds in flight.
+They answer with the same bodies, ETags, 304s and response cache entries as
+the Flask views, built from the same queries and serializers in app.py.
+
+Every other route, and any request the native handlers leave alone (a missing
+or invalid token, ?all=true, offset paging, archived audit rows, preflights),
+is passed to the Flask app on a pool of ASGI_WSGI_THREADS threads, so both
+entry points expose exactly the routes registered with api.add_resource().
+"""
+import asyncio
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from sqlalchemy.ext.asyncio import create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_etags
+
+from app import (
+    app as wsgi_app, db, CORS_ORIGINS, InvalidCursor, keyset_query, keyset_result, page_limit,
+    data_version_query, data_etag, dashboard_window_query, dashboard_payload, response_cache, revocation_store,
+    JobApplication, TargetCompany, AuditLog, AuditLogCounter, UserDashboardStats,
+    application_serializer, company_serializer, audit_log_serializer
+)
+from db_tuning import engine_options, install_sqlite_pragmas
+from response_cache import MemoryResponseCache
+from serializers import dumps
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+
+def async_database_url(url):
+    # The URL Flask-SQLAlchemy resolved (instance-relative SQLite paths included), with the
+    # async driver for its backend
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+class NativeRequest:
+    # The parts of an ASGI HTTP request the native handlers read
+    def __init__(self, scope):
+        self.path = scope['path']
+        self.query_string = scope['query_string'].decode()
+        self.full_path = f'{self.path}?{self.query_string}'  # as werkzeug's request.full_path
+        self.args = MultiDict(parse_qsl(self.query_string, keep_blank_values=True))
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+
+
+def authenticate(request):
+    # The user id of a valid, unrevoked access token, or None to let Flask answer with its error
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme != 'Bearer' or not token:
+        return None
+    with wsgi_app.app_context():
+        try:
+            payload = decode_token(token)
+        except (JWTExtendedException, PyJWTError):
+            return None
+        if payload.get('type') != 'access' or revocation_store.is_revoked(payload['jti']):
+            return None
+    return int(payload['sub'])
+
+
+async def fetch_page(connection, query, sort_column, id_column, limit, cursor):
+    # keyset_page() on the async connection; None for an invalid cursor
+    try:
+        query = keyset_query(query, sort_column, id_column, limit, cursor)
+    except InvalidCursor:
+        return None
+    rows = (await connection.execute(query)).all()
+    return keyset_result(rows, sort_column, id_column, limit)
+
+
+async def list_applications(request, user_id, connection):
+    if request.args.get('all', 'false').lower() == 'true':
+        return None
+    query = db.select(*application_serializer.columns).where(JobApplication.user_id == user_id)
+    page = await fetch_page(connection, query, JobApplication.updated_at, JobApplication.id,
+                            page_limit(request.args), request.args.get('cursor'))
+    if page is None:
+        return None
+    applications, next_cursor = page
+    return {'applications': application_serializer.rows(applications, native_dates=True), 'next_cursor': next_cursor}
+
+
+async def list_target_companies(request, user_id, connection):
+    if request.args.get('all', 'false').lower() == 'true':
+        return None
+    query = db.select(*company_serializer.columns).where(TargetCompany.user_id == user_id)
+    page = await fetch_page(connection, query, TargetCompany.updated_at, TargetCompany.id,
+                            page_limit(request.args), request.args.get('cursor'))
+    if page is None:
+        return None
+    companies, next_cursor = page
+    return {'companies': company_serializer.rows(companies, native_dates=True), 'next_cursor': next_cursor}
+
+
+async def list_audit_log(request, user_id, connection):
+    if 'page' in request.args or request.args.get('include_archived', 'false').lower() == 'true':
+        return None
+    limit = page_limit(request.args)
+    query = db.select(*audit_log_serializer.columns).where(AuditLog.user_id == user_id)
+    page = await fetch_page(connection, query, AuditLog.timestamp, AuditLog.id, limit, request.args.get('cursor'))
+    if page is None:
+        return None
+    logs, next_cursor = page
+    pagination = {'limit': limit, 'next_cursor': next_cursor}
+    if request.args.get('include_total', 'false').lower() == 'true':
+        total = await connection.scalar(db.select(AuditLogCounter.total).where(AuditLogCounter.user_id == user_id))
+        pagination['total'] = total or 0
+    return {'logs': audit_log_serializer.rows(logs, native_dates=True), 'pagination': pagination}
+
+
+async def dashboard(request, user_id, connection):
+    stats = (await connection.execute(
+        db.select(UserDashboardStats.__table__).where(UserDashboardStats.user_id == user_id)
+    )).first()
+    if not stats or not stats.total_applications:
+        return dashboard_payload(stats)
+    window = (await connection.execute(dashboard_window_query(user_id, datetime.now().date()))).one()
+    return dashboard_payload(stats, *window)
+
+
+# path -> (handler, cache, varies_with), mirroring each Flask view's @conditional_get arguments
+NATIVE_ROUTES = {
+    '/api/applications': (list_applications, True, None),
+    '/api/target-companies': (list_target_companies, True, None),
+    '/api/audit-log': (list_audit_log, True, None),
+    '/api/tracker/dashboard': (dashboard, False, lambda: datetime.now().date()),
+}
+
+
+async def _cached(method, *args):
+    # The memory cache only takes a lock; other backends do I/O, so they run off the loop
+    if isinstance(response_cache, MemoryResponseCache):
+        return method(*args)
+    return await asyncio.to_thread(method, *args)
+
+
+class AsyncAPI:
+    def __init__(self, flask_app):
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+        with flask_app.app_context():
+            url = async_database_url(db.engine.url)
+        options = engine_options(url, flask_app.config)
+        if options:
+            options['pool_size'] = flask_app.config['ASYNC_DB_POOL_SIZE']
+        self.engine = create_async_engine(url, **options)
+        install_sqlite_pragmas(self.engine.sync_engine, flask_app.config['SQLITE_PRAGMAS'])
+        self._sync_task = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] in NATIVE_ROUTES:
+            if await self.native(scope, send):
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def native(self, scope, send):
+        # conditional_get() around a native handler; False when the request is left to Flask
+        handler, cache, varies_with = NATIVE_ROUTES[scope['path']]
+        request = NativeRequest(scope)
+        user_id = authenticate(request)
+        if user_id is None:
+            return False
+
+        store = response_cache if cache else None
+        async with self.engine.connect() as connection:
+            version = await connection.scalar(data_version_query(user_id)) or 0
+            extra = (varies_with(),) if varies_with else ()
+            etag = data_etag(user_id, version, request.full_path, *extra)
+            headers = [('ETag', f'"{etag}"'), ('Cache-Control', 'private, no-cache')]
+            origin = request.headers.get('origin')
+            if origin in CORS_ORIGINS:
+                headers += [('Access-Control-Allow-Origin', origin), ('Vary', 'Origin')]
+            if parse_etags(request.headers.get('if-none-match')).contains(etag):
+                await self.respond(send, 304, headers)
+                return True
+
+            body = await _cached(store.get, user_id, etag) if store is not None else None
+            if body is None:
+                data = await handler(request, user_id, connection)
+                if data is None:
+                    return False
+                body = dumps(data) + b'\n'
+                if store is not None:
+                    await _cached(store.set, user_id, etag, body)
+        await self.respond(send, 200, headers + [('Content-Type', 'application/json')], body)
+        return True
+
+    async def respond(self, send, status, headers, body=b''):
+        headers = headers + [('Content-Length', str(len(body)))]
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._sync_task = asyncio.create_task(self._sync_revocations())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._sync_task is not None:
+                    self._sync_task.cancel()
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _sync_revocations(self):
+        # Read other workers' revocations on a thread ahead of their due time, so the check in
+        # authenticate() doesn't have to query the database on the event loop
+        def sync():
+            with wsgi_app.app_context():
+                revocation_store.sync(force=True)
+
+        while True:
+            await asyncio.to_thread(sync)
+            await asyncio.sleep(max(revocation_store.sync_interval / 2, 0.1))
+
+
+app = AsyncAPI(wsgi_app)
@@ -0,0 +1,180 @@
+"""Compressed cold storage for archived audit log rows.
+
+Archived rows are stored per user, in gzip-compressed JSONL files, one per
+calendar month of the row timestamp:
+users/<shard>/<user_id>/audit-YYYY-MM.jsonl.gz. Reading a user's rows only
+decompresses that user's files, and since each file covers one month, newest
+first, a page is complete once the files newer than it have been read.
+
+Each archival batch adds a gzip member to the files it touches. The new file
+(the old compressed bytes plus the member) is written to a temporary file and
+renamed over the old one, so a file is never left half-written. A file that
+is torn anyway (copied mid-write, or written by an older release that
+appended in place) is read up to its last intact line, and is rebuilt from
+those lines the next time a batch is added to it.
+
+A small manifest.json holds the ids of the batch currently being moved. The
+caller deletes those rows from the live table and then calls finish_batch().
+If the process dies in between, pending_ids() tells the next run which rows
+are already archived and only need deleting. A crash in the middle of
+write_batch() can leave a batch written to some files and later written
+again, so readers skip ids they have already returned.
+
+Older releases kept one audit-YYYY-MM.jsonl.gz file for all users, listed
+under 'files' in the manifest. Readers still search those, and
+split_legacy_files() moves their rows into the per-user layout.
+"""
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime
+
+
+class AuditArchive:
+    MANIFEST = 'manifest.json'
+    # Per-user directories are spread over this many shard directories
+    SHARDS = 256
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, self.MANIFEST)
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'files': {}, 'pending_ids': []}
+        with open(self.manifest_path) as manifest:
+            return json.load(manifest)
+
+    def _save_manifest(self, manifest):
+        # Write to a temporary file and rename so the manifest is never half-written
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as tmp:
+            json.dump(manifest, tmp, sort_keys=True)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def pending_ids(self):
+        return self.load_manifest().get('pending_ids', [])
+
+    def user_directory(self, user_id):
+        return os.path.join(self.directory, 'users', f'{user_id % self.SHARDS:02x}', str(user_id))
+
+    def write_batch(self, records):
+        # Add serialized audit rows to their users' monthly files and mark their ids as pending deletion.
+        # Each record needs 'id', 'user_id' and an ISO 'timestamp'.
+        os.makedirs(self.directory, exist_ok=True)
+        self._append_records(records)
+        manifest = self.load_manifest()
+        manifest['pending_ids'] = [record['id'] for record in records]
+        self._save_manifest(manifest)
+
+    def finish_batch(self):
+        manifest = self.load_manifest()
+        manifest['pending_ids'] = []
+        self._save_manifest(manifest)
+
+    def split_legacy_files(self):
+        # Move the rows of the shared monthly files of older releases into the per-user layout;
+        # returns the number of rows moved
+        manifest = self.load_manifest()
+        moved = 0
+        for name in sorted(manifest['files']):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                records = list(_read_records(path))
+                self._append_records(records)
+                moved += len(records)
+            # Saved file by file: a crash repeats at most one file, whose rows readers deduplicate
+            del manifest['files'][name]
+            self._save_manifest(manifest)
+            if os.path.exists(path):
+                os.remove(path)
+        return moved
+
+    def read_before(self, user_id, before, limit):
+        # Return up to `limit` archived rows for user_id strictly older than `before`, a
+        # (timestamp, id) pair or None, newest first.
+        before_month = before[0].strftime('%Y-%m') if before is not None else None
+        directory = self.user_directory(user_id)
+        months = sorted(name for name in os.listdir(directory) if name.endswith('.jsonl.gz')) \
+            if os.path.isdir(directory) else []
+        paths = [os.path.join(directory, name) for name in months
+                 if before_month is None or name[6:13] <= before_month]
+
+        # Shared monthly files not yet split, with the time range the manifest records for the user
+        legacy = []
+        for name, info in self.load_manifest()['files'].items():
+            entry = info['users'].get(str(user_id))
+            if entry is None or (before is not None and entry[0] > before[0].isoformat()):
+                continue
+            legacy.append(os.path.join(self.directory, name))
+
+        rows = []
+        seen = set()
+
+        def collect(path):
+            for record in _read_records(path):
+                if record['user_id'] != user_id or record['id'] in seen:
+                    continue
+                if before is not None and (datetime.fromisoformat(record['timestamp']), record['id']) >= before:
+                    continue
+                seen.add(record['id'])
+                rows.append(record)
+
+        for path in legacy:
+            collect(path)
+        rows.sort(key=lambda record: (record['timestamp'], record['id']), reverse=True)
+        # Newest month first: stop once a full page is newer than everything left to read
+        for path in reversed(paths):
+            if len(rows) >= limit and rows[limit - 1]['timestamp'][:7] > os.path.basename(path)[6:13]:
+                break
+            collect(path)
+            rows.sort(key=lambda record: (record['timestamp'], record['id']), reverse=True)
+        return rows[:limit]
+
+    def _append_records(self, records):
+        by_file = {}
+        for record in records:
+            path = os.path.join(self.user_directory(record['user_id']), f"audit-{record['timestamp'][:7]}.jsonl.gz")
+            by_file.setdefault(path, []).append(record)
+        for path, file_records in by_file.items():
+            _append_member(path, file_records)
+
+
+def _read_records(path):
+    # The records of an archive file, in order; a torn or corrupt member ends the file early
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                if not line.endswith('\n'):
+                    return
+                yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile, zlib.error, ValueError):
+        # ValueError: a line that isn't valid UTF-8 or JSON
+        return
+
+
+def _append_member(path, records):
+    # Replace the file with its current contents plus a gzip member holding `records`
+    member = gzip.compress(''.join(json.dumps(record) + '\n' for record in records).encode('utf-8'))
+    existing = b''
+    if os.path.exists(path):
+        with open(path, 'rb') as archive:
+            existing = archive.read()
+        try:
+            gzip.decompress(existing)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            # Torn: keep the intact lines, since nothing after the damage could be read back
+            intact = ''.join(json.dumps(record) + '\n' for record in _read_records(path))
+            existing = gzip.compress(intact.encode('utf-8')) if intact else b''
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as tmp:
+        tmp.write(existing)
+        tmp.write(member)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,189 @@
+"""Background, batched writer for audit log records.
+
+Records are queued in memory and flushed by a daemon thread in batches, either
+when a batch fills up or when the flush interval elapses. Anything that cannot
+be written (a failed flush, a full queue, or records still queued at shutdown)
+is appended to a JSONL spool file and replayed the next time the writer starts.
+
+Replay runs on the flush thread before its first batch, never in the request
+that started the writer. The spool is first renamed aside (spool_path +
+'.replay'), so records spooled meanwhile go to a fresh file; whatever the
+replay can't write stays in the aside file for the next start.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+
+class AsyncAuditWriter:
+    def __init__(self, write_batch, queue_size=10000, batch_size=500, flush_interval=1.0,
+                 spool_path='audit_spool.jsonl', put_timeout=0.05):
+        # write_batch(records) must persist a list of audit dicts or raise
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.put_timeout = put_timeout
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'blocked_puts': 0,
+            'spooled': 0,
+            'replayed': 0,
+            'failed_batches': 0,
+            'max_queue_depth': 0,
+            'last_flush_ms': None
+        }
+
+    def start(self):
+        # Start the flush thread once per process; safe to call on every submit
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def submit(self, record):
+        # Queue a record; when the queue stays full past put_timeout, spool it instead of dropping it
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._bump('blocked_puts')
+            try:
+                self._queue.put(record, timeout=self.put_timeout)
+            except queue.Full:
+                self._spool([record])
+                return
+        with self._stats_lock:
+            self._stats['enqueued'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+
+    def stop(self, timeout=10.0):
+        # Drain and flush what is queued; whatever is left after the timeout goes to the spool
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        leftover = self._drain(self._queue.qsize())
+        if leftover:
+            self._spool(leftover)
+        self._thread = None
+        self._stop.clear()
+
+    def metrics(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['queue_capacity'] = self._queue.maxsize
+        stats['running'] = self._thread is not None
+        return stats
+
+    def _run(self):
+        self._replay_spool()
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                if self._stop.is_set():
+                    # Shutting down: take whatever is already queued without waiting
+                    batch.extend(self._drain(self.batch_size - len(batch)))
+                    break
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        try:
+            self.write_batch(batch)
+        except Exception:
+            self._bump('failed_batches')
+            self._spool(batch)
+            return
+        with self._stats_lock:
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['last_flush_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _drain(self, limit):
+        records = []
+        while len(records) < limit:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    def _spool(self, records):
+        with self._spool_lock, open(self.spool_path, 'a') as spool:
+            for record in records:
+                spool.write(json.dumps(record, default=_encode_datetime) + '\n')
+            spool.flush()
+            os.fsync(spool.fileno())
+        self._bump('spooled', len(records))
+
+    def _replay_spool(self):
+        # Write back records spooled by a previous run; on failure keep the unwritten rest
+        replay_path = self.spool_path + '.replay'
+        while True:
+            with self._spool_lock:
+                # A replay file left by an earlier failed replay goes before newer records
+                if not os.path.exists(replay_path):
+                    if not os.path.exists(self.spool_path):
+                        return
+                    os.replace(self.spool_path, replay_path)
+            with open(replay_path) as spool:
+                lines = [line for line in spool if line.strip()]
+
+            written = 0
+            try:
+                for start in range(0, len(lines), self.batch_size):
+                    chunk = lines[start:start + self.batch_size]
+                    self.write_batch([_decode_record(json.loads(line)) for line in chunk])
+                    written += len(chunk)
+            except Exception:
+                self._bump('failed_batches')
+                with open(replay_path, 'w') as spool:
+                    spool.writelines(lines[written:])
+                return
+            finally:
+                self._bump('replayed', written)
+            os.remove(replay_path)
+
+    def _bump(self, key, count=1):
+        with self._stats_lock:
+            self._stats[key] += count
+
+
+def _encode_datetime(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _decode_record(record):
+    if record.get('timestamp'):
+        record['timestamp'] = datetime.fromisoformat(record['timestamp'])
+    return record
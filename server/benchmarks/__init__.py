@@ -0,0 +1,12 @@
+"""Benchmark commands, kept out of the app the servers import.
+
+Importing this package registers the bench-* commands on the app's CLI; run
+them from the server directory with
+
+    FLASK_APP=benchmarks flask bench-asgi
+
+Like the app's own commands they run against the configured database.
+"""
+from app import app
+
+from benchmarks import auth, dashboard, fulltext, matching, queries, serialization, serving, workbook  # noqa: F401  (registers the commands)
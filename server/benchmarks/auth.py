@@ -0,0 +1,123 @@
+"""Login throughput and the CPU spent on authentication."""
+import os
+import time
+
+import click
+
+import app as app_module
+from app import RevokedToken, User, app, db, revocation_store
+from password_hasher import PasswordHasher
+
+
+@app.cli.command('bench-login')
+@click.option('--max-workers', type=int, default=os.cpu_count() or 1, help='Largest hashing pool to try')
+@click.option('--logins', type=int, default=64, help='Logins per pool size')
+@click.option('--concurrency', type=int, default=16, help='Simultaneous login requests')
+def bench_login(max_workers, logins, concurrency):
+    # Measure login throughput through /api/auth/login with hashing inline (0) and in pools of
+    # 1..max_workers processes, using the configured PASSWORD_HASH_METHOD
+    from concurrent.futures import ThreadPoolExecutor
+
+    configured = app_module.password_hasher
+    users = [User(username=f'bench-login-{i}', email=f'bench-login-{i}@example.invalid') for i in range(concurrency)]
+    for user in users:
+        user.set_password('bench-password')
+    db.session.add_all(users)
+    db.session.commit()
+
+    def login(index):
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post('/api/auth/login', json={'username': f'bench-login-{index % concurrency}',
+                                                        'password': 'bench-password'})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return time.perf_counter() - started
+
+    click.echo(f'{logins} logins, {concurrency} concurrent, method {configured.method}, {os.cpu_count()} CPU(s)')
+    try:
+        for workers in range(0, max_workers + 1):
+            app_module.password_hasher = PasswordHasher(method=configured.method, workers=workers,
+                                                        max_pending=concurrency, timeout=300)
+            login(0)  # start the pool outside the timing
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                latencies = sorted(pool.map(login, range(logins)))
+            elapsed = time.perf_counter() - started
+            app_module.password_hasher.shutdown()
+            click.echo(f'workers={workers if workers else "inline":<7} {logins / elapsed:7.1f} logins/s  '
+                       f'p50 {latencies[len(latencies) // 2] * 1000:7.0f} ms  '
+                       f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:7.0f} ms')
+    finally:
+        app_module.password_hasher = configured
+        for user in users:
+            db.session.delete(user)
+        db.session.commit()
+
+
+@app.cli.command('bench-auth-cpu')
+@click.option('--active-hours', type=float, default=8, help='Hours a day an active user keeps the app open')
+@click.option('--requests-per-hour', type=int, default=120, help='Authenticated API calls per active hour')
+@click.option('--rounds', type=int, default=50, help='Logins and refreshes to time')
+def bench_auth_cpu(active_hours, requests_per_hour, rounds):
+    # Estimate server CPU spent on authentication per active user per day. Before refresh tokens
+    # a session lasted one access token, so an active user logged in (a password hash) every
+    # JWT_ACCESS_TOKEN_EXPIRES; now they refresh instead and log in once per refresh token
+    # lifetime, while every request pays a revocation lookup.
+    configured = app_module.password_hasher
+    # Hash inline so the hashing CPU shows up in this process's time
+    app_module.password_hasher = PasswordHasher(method=configured.method, workers=0)
+    user = User(username='bench-auth-cpu', email='bench-auth-cpu@example.invalid')
+    user.set_password('bench-password')
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+
+    def login():
+        response = client.post('/api/auth/login', json={'username': 'bench-auth-cpu', 'password': 'bench-password'})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_json()
+
+    def cpu_per_call(function):
+        function()  # warm up
+        started = time.process_time()
+        for _ in range(rounds):
+            function()
+        return (time.process_time() - started) / rounds
+
+    try:
+        tokens = login()
+
+        def refresh():
+            response = client.post('/api/auth/refresh',
+                                   headers={'Authorization': f'Bearer {tokens["refresh_token"]}'})
+            assert response.status_code == 200, response.get_data(as_text=True)
+            tokens.update(response.get_json())
+
+        login_cpu = cpu_per_call(login)
+        refresh_cpu = cpu_per_call(refresh)
+        lookups = 100000
+        revocation_store.is_revoked('warm-up')
+        started = time.process_time()
+        for _ in range(lookups):
+            revocation_store.is_revoked(tokens['refresh_token'])
+        lookup_cpu = (time.process_time() - started) / lookups
+    finally:
+        app_module.password_hasher = configured
+        RevokedToken.query.filter_by(user_id=user.id).delete()
+        db.session.delete(user)
+        db.session.commit()
+
+    access_hours = app.config['JWT_ACCESS_TOKEN_EXPIRES'] / 3600
+    refresh_days = app.config['JWT_REFRESH_TOKEN_EXPIRES'] / 86400
+    sessions = active_hours / access_hours
+    requests_per_day = active_hours * requests_per_hour
+    before = sessions * login_cpu
+    after = sessions * refresh_cpu + login_cpu / refresh_days + requests_per_day * lookup_cpu
+    click.echo(f'method {configured.method}, {rounds} rounds, {revocation_store.metrics()["revoked_in_memory"]} revoked jti(s) in memory')
+    click.echo(f'login   {login_cpu * 1000:8.2f} ms CPU')
+    click.echo(f'refresh {refresh_cpu * 1000:8.2f} ms CPU')
+    click.echo(f'revocation check {lookup_cpu * 1e9:6.0f} ns CPU per request')
+    click.echo(f'per active user per day ({active_hours:g} h, {requests_per_day:.0f} requests):')
+    click.echo(f'  before (login every {access_hours:g} h)           {before * 1000:8.1f} ms CPU')
+    click.echo(f'  after  (refresh every {access_hours:g} h, login every {refresh_days:g} d) {after * 1000:8.1f} ms CPU'
+               f'  ({before / after:.1f}x less)')
@@ -0,0 +1,76 @@
+"""Dashboard latency as a user's applications grow: maintained counters against the original loop."""
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import click
+from flask_jwt_extended import create_access_token
+
+from app import (JobApplication, User, UserDailyApplicationCount, UserDashboardStats, UserDataVersion, app,
+                 backfill_dashboard_stats, db)
+
+
+@app.cli.command('bench-dashboard')
+@click.option('--rows', default='100,1000,10000,100000', help='Comma-separated application counts to time')
+@click.option('--repeat', type=int, default=20, help='Requests per row count')
+def bench_dashboard(rows, repeat):
+    # For each row count, seed a user with that many applications and time GET
+    # /api/tracker/dashboard, which reads the user's counters, against the loop it replaced:
+    # every application loaded as an ORM instance and counted in Python
+    import statistics
+
+    def legacy(user_id):
+        today = datetime.now().date()
+        applications = JobApplication.query.filter_by(user_id=user_id).all()
+        rates = [application.hourly_rate for application in applications if application.hourly_rate is not None]
+        counts = [0, 0, 0, 0, 0]
+        for application in applications:
+            status = (application.status or '').lower()
+            counts[0] += bool(application.applied_date and (today - application.applied_date).days <= 7)
+            counts[1] += 'interview' in status
+            counts[2] += 'offer' in status and 'interview' not in status
+            counts[3] += (application.priority_level or '').lower() == 'high'
+            counts[4] += application.applied_date == today
+        return counts, sum(rates) / len(rates) if rates else 0.0
+
+    client = app.test_client()
+    today = date.today()
+    click.echo(f'{repeat} requests per row count, {db.engine.dialect.name}')
+    for count in [int(value) for value in rows.split(',')]:
+        now = datetime.utcnow()
+        user_id = db.session.execute(User.__table__.insert().values(
+            username=f'bench-dashboard-{uuid.uuid4().hex[:12]}', email=f'{uuid.uuid4().hex}@example.invalid',
+            password_hash='!', created_at=now, is_active=True
+        ).returning(User.__table__.c.id)).scalar_one()
+        try:
+            for start in range(0, count, 10000):
+                db.session.execute(JobApplication.__table__.insert(), [dict(
+                    user_id=user_id, company=f'Company {i}', role_title='Engineer',
+                    status=('Applied', 'Interview', 'Offer', 'Rejected')[i % 4], priority_level=('High', 'Low')[i % 2],
+                    hourly_rate=40.0 + i % 50, applied_date=today - timedelta(days=i % 60), created_at=now, updated_at=now
+                ) for i in range(start, min(start + 10000, count))])
+            db.session.commit()
+            backfill_dashboard_stats()
+            headers = {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+            timings = {'counters (GET /api/tracker/dashboard)': [], 'per-row loop (before)': []}
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get('/api/tracker/dashboard', headers=headers)
+                timings['counters (GET /api/tracker/dashboard)'].append(time.perf_counter() - started)
+                assert response.status_code == 200, response.get_data(as_text=True)
+                assert response.get_json()['total_applications'] == count, response.get_json()
+                started = time.perf_counter()
+                legacy(user_id)
+                timings['per-row loop (before)'].append(time.perf_counter() - started)
+                db.session.remove()
+            for label, values in timings.items():
+                values.sort()
+                click.echo(f'{count:>8} rows  {label:<38} p50 {statistics.median(values) * 1000:8.2f} ms  '
+                           f'p95 {values[int(len(values) * 0.95)] * 1000:8.2f} ms')
+        finally:
+            db.session.rollback()
+            for model in (JobApplication, UserDashboardStats, UserDailyApplicationCount, UserDataVersion):
+                model.query.filter(model.user_id == user_id).delete(synchronize_session=False)
+            User.query.filter(User.id == user_id).delete(synchronize_session=False)
+            db.session.commit()
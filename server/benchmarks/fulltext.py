@@ -0,0 +1,85 @@
+"""Timing of /api/search's queries over a large, many-tenant applications table."""
+import time
+import uuid
+from datetime import datetime
+
+import click
+
+from app import JobApplication, User, UserDailyApplicationCount, UserDashboardStats, UserDataVersion, app, db
+from search import search_ids
+
+
+@app.cli.command('bench-search')
+@click.option('--rows', type=int, default=1000000, help='Applications to seed')
+@click.option('--users', type=int, default=1000, help='Seeded users the rows are spread over')
+@click.option('--heavy-rows', type=int, default=100000, help='Applications of one more, much larger user')
+@click.option('--sample', type=int, default=50, help='Users whose searches are timed')
+@click.option('--repeat', type=int, default=10, help='Runs of each search per user')
+@click.option('--cleanup', is_flag=True, help='Delete the seeded users and their rows at the end (their rows '
+              'bypass the dashboard counters, so reconcile-dashboard-stats reports them until then)')
+def bench_search(rows, users, heavy_rows, sample, repeat, cleanup):
+    # Seed `rows` applications over `users` users plus `heavy_rows` for one more user, then time
+    # searching one user's rows for a word in half of them, a rare word, two words and a prefix.
+    # Every user shares the index, so a search that isn't narrowed to the user first slows down
+    # with the table; the heavy user shows how it grows with the user's own rows.
+    import random
+    import statistics
+
+    rng = random.Random(0)
+    roles = ['Software Engineer', 'Senior Software Engineer', 'Data Engineer', 'Product Manager',
+             'Data Scientist', 'Designer', 'Accountant', 'Nurse']
+    locations = ['Remote', 'Berlin', 'London', 'New York', 'San Francisco', 'Toronto', 'Austin', 'Paris']
+    sources = ['LinkedIn', 'Referral', 'Company Site', 'Indeed', 'Recruiter']
+    now = datetime.utcnow()
+    user_ids = []
+    for _ in range(users + 1):
+        user_ids.append(db.session.execute(User.__table__.insert().values(
+            username=f'bench-search-{uuid.uuid4().hex[:12]}', email=f'{uuid.uuid4().hex}@example.invalid',
+            password_hash='!', created_at=now, is_active=True
+        ).returning(User.__table__.c.id)).scalar_one())
+    db.session.commit()
+    heavy_user = user_ids.pop()
+    started = time.perf_counter()
+    for start in range(0, rows + heavy_rows, 10000):
+        db.session.execute(JobApplication.__table__.insert(), [dict(
+            user_id=user_ids[i % users] if i < rows else heavy_user, company=f'Company {rng.randrange(50000)}', role_title=rng.choice(roles),
+            location=rng.choice(locations), application_source=rng.choice(sources), status='Applied',
+            created_at=now, updated_at=now
+        ) for i in range(start, min(start + 10000, rows + heavy_rows))])
+        db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    total = db.session.query(db.func.count()).select_from(JobApplication.__table__).scalar()
+    click.echo(f'Seeded {rows} applications over {users} users and {heavy_rows} for one more in {time.perf_counter() - started:.1f} s; '
+               f'{total} in the table, {db.engine.dialect.name}')
+
+    searches = [
+        ('common word (engineer)', ['engineer']),
+        ('rare word (nurse)', ['nurse']),
+        ('two words (software remote)', ['software', 'remote']),
+        ('prefix (eng)', ['eng']),
+    ]
+    sampled = rng.sample(user_ids, min(sample, len(user_ids)))
+    connection = db.session.connection()
+    try:
+        for label, users_timed in ((f'{rows // users} rows per user', sampled), (f'{heavy_rows} rows', [heavy_user])):
+            click.echo(label)
+            for name, terms in searches:
+                timings = []
+                for user_id in users_timed:
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        search_ids(connection, JobApplication.__tablename__, 'applications', user_id, terms, 51)
+                        timings.append(time.perf_counter() - started)
+                timings.sort()
+                click.echo(f'  {name:<30} p50 {statistics.median(timings) * 1000:7.3f} ms  '
+                           f'p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms')
+    finally:
+        db.session.rollback()
+        if cleanup:
+            seeded = db.session.query(User.id).filter(User.username.like('bench-search-%'))
+            for model in (JobApplication, UserDataVersion, UserDashboardStats, UserDailyApplicationCount):
+                model.query.filter(model.user_id.in_(seeded.scalar_subquery())).delete(synchronize_session=False)
+            User.query.filter(User.username.like('bench-search-%')).delete(synchronize_session=False)
+            db.session.commit()
+            click.echo('Deleted the seeded users')
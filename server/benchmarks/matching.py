@@ -0,0 +1,64 @@
+"""Timing of resume matching against a large in-memory posting corpus."""
+import time
+
+import click
+
+from app import app
+from job_matcher import JobMatcher
+
+
+@app.cli.command('bench-job-matching')
+@click.option('--postings', type=int, default=100000, help='Synthetic postings in the corpus')
+@click.option('--companies', type=int, default=50, help='Synthetic target companies added one by one afterwards')
+@click.option('--repeat', type=int, default=50, help='Resumes matched')
+@click.option('--limit', type=int, default=10, help='Matches returned per resume')
+def bench_job_matching(postings, companies, repeat, limit):
+    # Time matching resumes against a JobMatcher holding synthetic postings, and adding companies to
+    # it incrementally against building the corpus from scratch. Runs in memory only.
+    import random
+    import statistics
+
+    rng = random.Random(0)
+    roles = ['Software Engineer', 'Data Scientist', 'Product Manager', 'DevOps Engineer', 'Designer',
+             'Data Engineer', 'Frontend Developer', 'Backend Developer', 'Nurse', 'Accountant',
+             'Sales Manager', 'Machine Learning Engineer', 'Security Analyst', 'Technical Writer']
+    levels = ['Junior', 'Senior', 'Staff', 'Lead', 'Principal', '']
+    industries = ['Technology', 'Healthcare', 'Finance', 'Retail', 'Education', 'Logistics', 'Media']
+    vocabulary = [f'skill{i}' for i in range(5000)] + [
+        'python', 'java', 'sql', 'kubernetes', 'react', 'aws', 'spark', 'flask', 'postgresql', 'excel',
+        'leadership', 'communication', 'agile', 'statistics', 'figma', 'terraform', 'go', 'rust']
+
+    def posting_text():
+        return ' '.join([rng.choice(levels), rng.choice(roles), rng.choice(industries), f'Company {rng.randrange(20000)}']
+                        + rng.choices(vocabulary, k=40))
+
+    texts = [posting_text() for _ in range(postings)]
+    resumes = [' '.join([rng.choice(roles)] + rng.choices(vocabulary, k=400)) for _ in range(repeat)]
+
+    matcher = JobMatcher(n_features=app.config['JOB_MATCH_FEATURES'])
+    started = time.perf_counter()
+    for index, text in enumerate(texts):
+        matcher.add(('posting', index), text, meta=index)
+    build = time.perf_counter() - started
+    matcher.match(resumes[0], k=limit)  # first match computes the row norms
+    metrics = matcher.metrics()
+    click.echo(f"{postings} postings, {metrics['nnz']} non-zeros, {metrics['bytes'] / 1024 / 1024:.1f} MB; "
+               f'built in {build:.2f} s ({build / max(postings, 1) * 1e6:.1f} us per posting)')
+
+    timings = []
+    for resume in resumes:
+        started = time.perf_counter()
+        matcher.match(resume, owner=1, k=limit)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    click.echo(f'match (top {limit})             p50 {statistics.median(timings) * 1000:7.3f} ms  '
+               f'p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms')
+
+    timings = []
+    for index in range(companies):
+        started = time.perf_counter()
+        matcher.add(('company', index), posting_text(), owner=1, meta=index)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    click.echo(f'add one company                p50 {statistics.median(timings) * 1000:7.3f} ms  '
+               f'p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms  (a rebuild takes {build * 1000:.0f} ms)')
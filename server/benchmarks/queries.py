@@ -0,0 +1,132 @@
+"""Timing of the per-user API queries, before and after schema changes such as partitioning."""
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import click
+
+from app import (AuditLog, AuditLogCounter, JobApplication, User, UserDailyApplicationCount, UserDashboardStats,
+                 UserDataVersion, api_query_plan_checks, app, audit_log_serializer, db, encode_cursor, keyset_page)
+
+
+def _plan_relations(plan):
+    # The tables (partitions included) a PostgreSQL JSON plan reads
+    relations = {plan['Relation Name']} if 'Relation Name' in plan else set()
+    for child in plan.get('Plans', ()):
+        relations |= _plan_relations(child)
+    return relations
+
+
+@app.cli.command('bench-user-queries')
+@click.option('--seed-users', type=int, default=0, help='First add this many users with synthetic rows')
+@click.option('--applications', type=int, default=100, help='Applications per seeded user')
+@click.option('--audit-rows', type=int, default=500, help='Audit rows per seeded user, spread over 120 days')
+@click.option('--deep-audit-rows', type=int, default=0, help='Audit rows for one more user, whose audit log '
+              'pages are timed with COUNT(*) + OFFSET and with a seek at increasing depths, e.g. 2000000')
+@click.option('--users', 'sample', type=int, default=50, help='Users whose queries are timed')
+@click.option('--repeat', type=int, default=10, help='Runs of each query per user')
+@click.option('--cleanup', is_flag=True, help='Delete all seeded users and their rows at the end (their rows '
+              'bypass the dashboard counters, so reconcile-dashboard-stats reports them until then)')
+def bench_user_queries(seed_users, applications, audit_rows, deep_audit_rows, sample, repeat, cleanup):
+    # Time the per-user API queries of api_query_plan_checks against the current schema. Run it on the
+    # same data before and after a schema change such as migration 010's partitioning.
+    import random
+    import statistics
+
+    now = datetime.utcnow()
+    for _ in range(seed_users):
+        user_id = db.session.execute(User.__table__.insert().values(
+            username=f'bench-queries-{uuid.uuid4().hex[:12]}', email=f'{uuid.uuid4().hex}@example.invalid',
+            password_hash='!', created_at=now, is_active=True
+        ).returning(User.__table__.c.id)).scalar_one()
+        db.session.execute(JobApplication.__table__.insert(), [dict(
+            user_id=user_id, company=f'Company {i}', role_title='Engineer', status=('Applied', 'Interview', 'Rejected')[i % 3],
+            applied_date=(now - timedelta(days=i % 120)).date(), created_at=now, updated_at=now - timedelta(minutes=i)
+        ) for i in range(applications)])
+        db.session.execute(AuditLog.__table__.insert(), [dict(
+            user_id=user_id, action='UPDATE', table_name='job_applications', record_id=str(i),
+            new_values='{}', timestamp=now - timedelta(days=120) * i / audit_rows
+        ) for i in range(audit_rows)])
+        db.session.commit()
+    if deep_audit_rows:
+        deep_user = db.session.execute(User.__table__.insert().values(
+            username=f'bench-queries-{uuid.uuid4().hex[:12]}', email=f'{uuid.uuid4().hex}@example.invalid',
+            password_hash='!', created_at=now, is_active=True
+        ).returning(User.__table__.c.id)).scalar_one()
+        for start in range(0, deep_audit_rows, 10000):
+            db.session.execute(AuditLog.__table__.insert(), [dict(
+                user_id=deep_user, action='UPDATE', table_name='job_applications', record_id=str(i),
+                new_values='{}', timestamp=now - timedelta(seconds=i)
+            ) for i in range(start, min(start + 10000, deep_audit_rows))])
+            db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+    if deep_audit_rows:
+        _time_audit_pages(deep_user, deep_audit_rows, repeat)
+
+    user_ids = sorted(user_id for user_id, in db.session.query(JobApplication.user_id).distinct())
+    user_ids = random.Random(0).sample(user_ids, min(sample, len(user_ids)))
+    if not user_ids:
+        click.echo('No users with applications; seed some with --seed-users')
+        return
+    counts = {table: db.session.query(db.func.count()).select_from(table).scalar()
+              for table in (JobApplication.__table__, AuditLog.__table__)}
+    click.echo(f'{counts[JobApplication.__table__]} applications, {counts[AuditLog.__table__]} audit rows, '
+               f'{len(user_ids)} users x {repeat} runs per query')
+
+    connection = db.session.connection()
+    for index, (name, _) in enumerate(api_query_plan_checks(user_ids[0])):
+        timings = []
+        for user_id in user_ids:
+            statement = api_query_plan_checks(user_id)[index][1].statement
+            for _ in range(repeat):
+                started = time.perf_counter()
+                connection.execute(statement).all()
+                timings.append(time.perf_counter() - started)
+        timings.sort()
+        tables = ''
+        if db.engine.dialect.name == 'postgresql':
+            sql = str(api_query_plan_checks(user_ids[0])[index][1].statement.compile(
+                dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+            plan = connection.execute(db.text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()
+            tables = f'  tables read {len(_plan_relations(plan[0]["Plan"])):>3}'
+        click.echo(f'{name:<30} p50 {statistics.median(timings) * 1000:7.3f} ms  '
+                   f'p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms{tables}')
+    db.session.rollback()
+
+    if cleanup:
+        seeded = db.session.query(User.id).filter(User.username.like('bench-queries-%'))
+        for model in (JobApplication, AuditLog, AuditLogCounter, UserDataVersion, UserDashboardStats,
+                      UserDailyApplicationCount):
+            model.query.filter(model.user_id.in_(seeded.scalar_subquery())).delete(synchronize_session=False)
+        User.query.filter(User.username.like('bench-queries-%')).delete(synchronize_session=False)
+        db.session.commit()
+        click.echo('Deleted the seeded users')
+
+
+def _time_audit_pages(user_id, rows, repeat, per_page=10):
+    # The audit log pages of a user with `rows` rows, read the way AuditLogAPI's offset mode does
+    # (COUNT(*) for the total, then OFFSET) and the way its cursor mode does (a seek past the
+    # previous page's last row), at increasing depths
+    import statistics
+    query = db.session.query(*audit_log_serializer.columns).filter(AuditLog.user_id == user_id)
+    click.echo(f'audit log of a user with {rows} rows, {per_page} per page')
+    page = 1
+    while (page - 1) * per_page < rows:
+        # The cursor a client that paged down to here would hold (not timed)
+        before = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()) \
+            .offset((page - 1) * per_page - 1).first() if page > 1 else None
+        cursor = encode_cursor(before.timestamp, before.id) if before else None
+        timings = {'COUNT + OFFSET': [], 'seek': []}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query.order_by(AuditLog.timestamp.desc()).paginate(page=page, per_page=per_page, error_out=False)
+            timings['COUNT + OFFSET'].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            keyset_page(query, AuditLog.timestamp, AuditLog.id, per_page, cursor)
+            timings['seek'].append(time.perf_counter() - started)
+        click.echo(f'  page {page:>8}  ' + '  '.join(
+            f'{label} p50 {statistics.median(values) * 1000:9.3f} ms' for label, values in timings.items()))
+        page *= 10
+    db.session.rollback()
@@ -0,0 +1,119 @@
+"""Response serialisation and request parsing, old code paths against the shared ones."""
+import json
+import time
+from datetime import datetime
+
+import click
+
+from app import JobApplication, app, application_schema, application_serializer
+from serializers import dumps
+
+
+@app.cli.command('bench-serializers')
+@click.option('--rows', type=int, default=10000, help='Applications in the serialised list')
+@click.option('--repeat', type=int, default=5, help='Runs per variant; the best is reported')
+def bench_serializers(rows, repeat):
+    # Compare serialising an application list the old way (ORM instances, a hand-built dict per
+    # row, stdlib json) with column rows through application_serializer and dumps()
+    import serializers
+
+    now = datetime.utcnow()
+    values = [
+        (i, f'Company {i}', 'Engineer', 'Remote', 50.0 + i % 40, now.date(), 'Applied',
+         'LinkedIn', f'hr{i}@example.com', 'High', now, now)
+        for i in range(rows)
+    ]
+    instances = [JobApplication(**dict(zip(application_serializer.attributes, row))) for row in values]
+
+    def legacy():
+        return json.dumps({'applications': [{
+            'id': app.id,
+            'company': app.company,
+            'role_title': app.role_title,
+            'location': app.location,
+            'hourly_rate': app.hourly_rate,
+            'applied_date': app.applied_date.isoformat() if app.applied_date else None,
+            'status': app.status,
+            'application_source': app.application_source,
+            'contact_email': app.contact_email,
+            'priority_level': app.priority_level,
+            'created_at': app.created_at.isoformat() if app.created_at else None,
+            'updated_at': app.updated_at.isoformat() if app.updated_at else None
+        } for app in instances]}).encode()
+
+    def shared():
+        return dumps({'applications': application_serializer.rows(values, native_dates=True)})
+
+    def shared_stdlib():
+        fast, serializers.orjson = serializers.orjson, None
+        try:
+            return shared()
+        finally:
+            serializers.orjson = fast
+
+    variants = [('legacy (ORM instances + json)', legacy), ('shared serializer + stdlib json', shared_stdlib)]
+    if serializers.orjson is not None:
+        variants.append(('shared serializer + orjson', shared))
+
+    baseline = None
+    for label, variant in variants:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            variant()
+            best = min(best, time.perf_counter() - started)
+        baseline = baseline or best
+        click.echo(f'{label:<34} {best * 1000:8.1f} ms  {baseline / best:5.1f}x')
+
+
+@app.cli.command('bench-request-parsing')
+@click.option('--requests', 'total', type=int, default=20000, help='Payloads parsed per run')
+@click.option('--threads', type=int, default=8, help='Concurrent workers in the threaded run')
+def bench_request_parsing(total, threads):
+    # Compare parsing an application payload with a RequestParser built per request (the old
+    # handlers) against the precompiled application_schema, single-threaded and concurrently
+    from concurrent.futures import ThreadPoolExecutor
+    from flask_restful import reqparse
+
+    payload = {'company': 'Acme', 'role_title': 'Engineer', 'location': 'Remote', 'hourly_rate': '85.5',
+               'applied_date': '2026-03-14', 'status': 'Applied', 'application_source': 'LinkedIn',
+               'contact_email': 'hr@example.com', 'priority_level': 'High'}
+
+    def legacy():
+        parser = reqparse.RequestParser()
+        parser.add_argument('company', type=str, required=True, help='Company name is required')
+        parser.add_argument('role_title', type=str, required=True, help='Role title is required')
+        parser.add_argument('location', type=str)
+        parser.add_argument('hourly_rate', type=float)
+        parser.add_argument('applied_date', type=str)
+        parser.add_argument('status', type=str, default='Applied')
+        parser.add_argument('application_source', type=str)
+        parser.add_argument('contact_email', type=str)
+        parser.add_argument('priority_level', type=str)
+        args = parser.parse_args()
+        if args['applied_date']:
+            args['applied_date'] = datetime.strptime(args['applied_date'], '%Y-%m-%d').date()
+        return args
+
+    def worker(parse, count):
+        # One request context per worker; the JSON body is decoded once and cached by Flask
+        with app.test_request_context('/api/applications', method='POST', json=payload):
+            for _ in range(count):
+                parse()
+
+    with app.test_request_context('/api/applications', method='POST', json=payload):
+        assert dict(legacy()) == application_schema.parse()
+
+    for workers in (1, threads):
+        results = {}
+        for label, parse in (('reqparse per request', legacy), ('precompiled schema', application_schema.parse)):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(worker, parse, total // workers) for _ in range(workers)]:
+                    future.result()
+            results[label] = time.perf_counter() - started
+        legacy_time, schema_time = results.values()
+        for label, elapsed in results.items():
+            click.echo(f'{workers:>2} thread(s)  {label:<22} {elapsed * 1000:8.1f} ms  '
+                       f'{total / elapsed:9.0f} parses/s  {elapsed * 1e6 / total:6.1f} us/parse')
+        click.echo(f'{workers:>2} thread(s)  speedup {legacy_time / schema_time:.1f}x')
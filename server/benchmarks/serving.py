@@ -0,0 +1,135 @@
+"""Load on the WSGI (gunicorn) and ASGI (uvicorn) entry points."""
+import os
+import time
+from datetime import date
+
+import click
+from flask_jwt_extended import create_access_token
+
+from app import JobApplication, User, UserDailyApplicationCount, UserDashboardStats, UserDataVersion, app, db
+
+
+async def _http_load(port, path, headers, total, concurrency):
+    # Send `total` keep-alive GETs from `concurrency` connections; return (seconds, latencies, errors)
+    import asyncio
+    request_bytes = (f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                     + ''.join(f'{name}: {value}\r\n' for name, value in headers.items()) + '\r\n').encode()
+    remaining = [total]
+    latencies = []
+    errors = [0]
+
+    async def client():
+        reader = writer = None
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            started = time.perf_counter()
+            writer.write(request_bytes)
+            status_line = await reader.readline()
+            length, chunked, close = 0, False, not status_line
+            while status_line:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name, value = name.strip().lower(), value.strip().lower()
+                if name == 'content-length':
+                    length = int(value)
+                elif name == 'transfer-encoding':
+                    chunked = 'chunked' in value
+                elif name == 'connection':
+                    close = value == 'close'
+            if chunked:
+                while True:
+                    size = int((await reader.readline()).split(b';')[0], 16)
+                    await reader.readexactly(size + 2)
+                    if not size:
+                        break
+            elif length:
+                await reader.readexactly(length)
+            if status_line.split(b' ')[1:2] == [b'200']:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors[0] += 1
+            if close:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, sorted(latencies), errors[0]
+
+
+@app.cli.command('bench-asgi')
+@click.option('--path', default='/api/applications?limit=50', help='GET path to load')
+@click.option('--rows', type=int, default=500, help='Applications owned by the benchmark user')
+@click.option('--requests', 'total', type=int, default=3000, help='Requests per concurrency level')
+@click.option('--concurrency', default='1,50,250', help='Comma-separated numbers of concurrent connections')
+@click.option('--threads', type=int, default=32, help='Threads of the gunicorn gthread worker')
+@click.option('--cache/--no-cache', default=False, help='Leave the response cache on in both servers')
+def bench_asgi(path, rows, total, concurrency, threads, cache):
+    # Load the same endpoint through the sync WSGI path (one gunicorn gthread worker) and the
+    # ASGI entry point (one uvicorn worker) against the same database, one server at a time
+    import asyncio
+    import socket
+    import subprocess
+    import sys
+
+    user = User(username='bench-asgi', email='bench-asgi@example.invalid')
+    user.set_password('bench-password')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add_all(JobApplication(user_id=user.id, company=f'Company {i}', role_title='Engineer',
+                                      status='Applied', applied_date=date.today()) for i in range(rows))
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    levels = [int(level) for level in concurrency.split(',')]
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    servers = {
+        f'wsgi (gunicorn gthread, {threads} threads)': [
+            sys.executable, '-m', 'gunicorn', '-w', '1', '-k', 'gthread', '--threads', str(threads),
+            '--backlog', '2048', '-b', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:app'],
+        'asgi (uvicorn, async handlers)': [
+            sys.executable, '-m', 'uvicorn', 'asgi:app', '--port', str(port), '--backlog', '2048',
+            '--log-level', 'warning', '--no-access-log'],
+    }
+    # Off by default: a cache hit skips the database, which is what the async path is about
+    env = dict(os.environ, RESPONSE_CACHE='memory' if cache else 'off')
+    click.echo(f'GET {path}, {rows} rows, {total} requests per level, {os.cpu_count()} CPU(s) '
+               f'shared by server and client, response cache {"on" if cache else "off"}')
+    try:
+        for name, command in servers.items():
+            server = subprocess.Popen(command, cwd=app.root_path, env=env)
+            try:
+                for _ in range(100):
+                    try:
+                        socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                        break
+                    except OSError:
+                        time.sleep(0.2)
+                asyncio.run(_http_load(port, path, headers, 50, 1))  # warm up
+                click.echo(name)
+                for level in levels:
+                    elapsed, latencies, errors = asyncio.run(_http_load(port, path, headers, total, level))
+                    if not latencies:
+                        click.echo(f'  {level:>4} concurrent  every request failed')
+                        continue
+                    click.echo(f'  {level:>4} concurrent  {len(latencies) / elapsed:7.0f} req/s  '
+                               f'p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms  '
+                               f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms  errors {errors}')
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        JobApplication.query.filter_by(user_id=user.id).delete()
+        # The servers' startup backfill gives the user dashboard counters while the rows exist
+        for model in (UserDataVersion, UserDashboardStats, UserDailyApplicationCount):
+            model.query.filter_by(user_id=user.id).delete()
+        db.session.delete(user)
+        db.session.commit()
@@ -0,0 +1,63 @@
+"""The tracker workbook endpoints: a cold parse of the file against the cached parse."""
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+import click
+
+from app import _workbook_cache, app, load_tracker_workbook
+
+
+@app.cli.command('bench-tracker-workbook')
+@click.option('--rows', type=int, default=5000, help='Rows in the generated Application Tracker sheet')
+@click.option('--sheets', type=int, default=3, help='Sheets in the generated workbook')
+@click.option('--repeat', type=int, default=5, help='Runs per variant; the median is reported')
+def bench_tracker_workbook(rows, sheets, repeat):
+    # Generate a workbook shaped like the tracker and time load_tracker_workbook() with the cache
+    # emptied before each call (the per-request parse every tracker request used to pay) against a
+    # cache hit, then a touch of the file, which must be parsed again
+    import statistics
+
+    import pandas as pd
+
+    today = date.today()
+    frame = pd.DataFrame({
+        'Company': [f'Company {i}' for i in range(rows)],
+        'Role Title': ['Engineer'] * rows,
+        'Hourly Rate': [40.0 + i % 50 for i in range(rows)],
+        'Applied Date': pd.to_datetime([today - timedelta(days=i % 90) for i in range(rows)]),
+        'Status': [('Applied', 'Interview', 'Offer', 'Rejected')[i % 4] for i in range(rows)],
+        'Notes': [None if i % 3 else f'Follow up {i}' for i in range(rows)],
+    })
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tracker.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            frame.to_excel(writer, sheet_name='Application Tracker', index=False)
+            for index in range(1, sheets):
+                frame.to_excel(writer, sheet_name=f'Sheet {index}', index=False)
+        click.echo(f'{sheets} sheets x {rows} rows, {os.path.getsize(path) / 1024:.0f} KiB')
+
+        cold, hits = [], []
+        for _ in range(repeat):
+            _workbook_cache.pop(path, None)
+            started = time.perf_counter()
+            workbook = load_tracker_workbook(path)
+            cold.append(time.perf_counter() - started)
+            assert workbook['sheets']['Application Tracker']['rows'] == rows, workbook['sheets']
+        for _ in range(repeat * 100):
+            started = time.perf_counter()
+            assert load_tracker_workbook(path) is workbook
+            hits.append(time.perf_counter() - started)
+
+        # A changed mtime is a miss again
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        started = time.perf_counter()
+        assert load_tracker_workbook(path) is not workbook
+        touched = time.perf_counter() - started
+        _workbook_cache.pop(path, None)
+
+    click.echo(f'cold parse     p50 {statistics.median(cold) * 1000:10.3f} ms')
+    click.echo(f'cache hit      p50 {statistics.median(hits) * 1000:10.3f} ms')
+    click.echo(f'after a touch      {touched * 1000:10.3f} ms')
@@ -0,0 +1,108 @@
+"""Engine settings tuned per database dialect.
+
+engine_options() turns the DB_* settings into create_engine() arguments. A
+setting left unset takes the default for the database in use:
+
+- PostgreSQL: a pool of 10 plus 20 overflow connections, a 10 s wait for a
+  free one, recycling after 30 minutes, pre-ping so connections dropped by the
+  server or a proxy are replaced instead of failing a request, and a 30 s
+  statement timeout and 5 s connect timeout passed to the driver (psycopg2 or
+  asyncpg).
+- SQLite: SQLAlchemy's own pool defaults. There is no server to drop
+  connections and no statement timeout; lock waits are bounded by the
+  busy_timeout PRAGMA instead.
+
+install_sqlite_pragmas() runs PRAGMAs on each new SQLite connection. WAL lets
+readers proceed while a write is in progress (the default rollback journal
+blocks them), and synchronous=NORMAL is durable in WAL mode except for the last
+transactions before a power loss.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DIALECT_DEFAULTS = {
+    'postgresql': {
+        'DB_POOL_SIZE': 10,
+        'DB_MAX_OVERFLOW': 20,
+        'DB_POOL_TIMEOUT': 10,
+        'DB_POOL_RECYCLE': 1800,
+        'DB_POOL_PRE_PING': True,
+        'DB_STATEMENT_TIMEOUT_MS': 30000,
+        'DB_CONNECT_TIMEOUT': 5,
+    },
+    'sqlite': {
+        'DB_POOL_SIZE': 5,
+        'DB_MAX_OVERFLOW': 10,
+        'DB_POOL_TIMEOUT': 30,
+        'DB_POOL_RECYCLE': -1,
+        'DB_POOL_PRE_PING': False,
+        'DB_STATEMENT_TIMEOUT_MS': None,
+        'DB_CONNECT_TIMEOUT': None,
+    },
+}
+
+
+def engine_settings(url, config):
+    # The DB_* settings for `url`: the configured value where set, the dialect's default otherwise
+    defaults = DIALECT_DEFAULTS.get(make_url(url).get_backend_name(), {})
+    return {key: config.get(key) if config.get(key) is not None else default for key, default in defaults.items()}
+
+
+def engine_options(url, config):
+    # create_engine() keyword arguments for `url` (a string or URL) from the DB_* settings in `config`
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # In-memory databases use a single-connection pool that takes no sizing arguments
+        return {}
+    settings = engine_settings(url, config)
+    options = {
+        'pool_size': settings['DB_POOL_SIZE'],
+        'max_overflow': settings['DB_MAX_OVERFLOW'],
+        'pool_timeout': settings['DB_POOL_TIMEOUT'],
+        'pool_recycle': settings['DB_POOL_RECYCLE'],
+        'pool_pre_ping': settings['DB_POOL_PRE_PING'],
+    }
+
+    statement_timeout = settings['DB_STATEMENT_TIMEOUT_MS']
+    connect_timeout = settings['DB_CONNECT_TIMEOUT']
+    connect_args = {}
+    if url.get_driver_name() == 'asyncpg':
+        if statement_timeout:
+            connect_args['server_settings'] = {'statement_timeout': str(statement_timeout)}
+        if connect_timeout:
+            connect_args['timeout'] = connect_timeout
+    elif url.get_backend_name() == 'postgresql':
+        # libpq drivers (psycopg2)
+        if statement_timeout:
+            connect_args['options'] = f'-c statement_timeout={statement_timeout}'
+        if connect_timeout:
+            connect_args['connect_timeout'] = connect_timeout
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    # Run `PRAGMA name=value` for each of `pragmas` on every new connection of a SQLite engine
+    # (for an async engine, pass engine.sync_engine)
+    statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items() if value is not None]
+    if engine.dialect.name != 'sqlite' or not statements:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+def pool_status(engine):
+    # Connection counts of the engine's pool, for the pool classes that keep them
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    for key, method in (('size', 'size'), ('checked_in', 'checkedin'), ('checked_out', 'checkedout'),
+                        ('overflow', 'overflow')):
+        if hasattr(pool, method):
+            status[key] = getattr(pool, method)()
+    return status
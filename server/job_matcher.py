@@ -0,0 +1,283 @@
+"""In-memory TF-IDF matching of resumes against job postings and target companies.
+
+Every document (a stored posting, or one user's target company) is turned
+into hashed word unigram and bigram features, so the feature space is fixed
+and a new document never changes the columns of the others. Rows hold
+sublinear term frequencies in append-only CSR arrays (numpy, no scipy):
+adding a document writes its row at the end, removing one marks it dead and
+returns its document frequencies, and dead rows are compacted away once they
+make up a quarter of the matrix.
+
+IDF weights come from the live document frequencies at query time. A resume
+is scored against every row with one sparse matrix-vector product, and the
+top k are picked with argpartition. A product over the CSR arrays reads every
+non-zero of the corpus, so rows that have settled are also kept column-major
+(CSC): the product then only reads the columns of the resume's own features
+and sums them per row with bincount. Rows appended since the CSC copy was made
+form a small CSR tail, multiplied directly; once the tail outgrows
+`merge_ratio` of the rest, the next match folds it in with one vectorised
+argsort.
+
+Documents with an owner are only visible to that owner; owner 0 is shared.
+Row norms depend on the IDF weights, so they are recomputed (in one
+vectorised pass) once the live row count has drifted by more than
+`norm_drift` since the last time.
+
+sync_owner() and the posting watermark let the app keep the matrix in step
+with the database incrementally: a user's companies are only re-read when
+their data version changes, and only the rows that changed are replaced.
+"""
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+TOKEN = re.compile(r'\w+')
+
+
+def features(text, n_features):
+    # Hashed unigram and bigram counts of a text, as (feature ids, counts)
+    tokens = TOKEN.findall(text.lower())
+    grams = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+    if not grams:
+        return np.empty(0, np.int32), np.empty(0, np.float32)
+    mask = n_features - 1
+    hashed = np.fromiter((zlib.crc32(gram.encode()) & mask for gram in grams), np.int32, len(grams))
+    ids, counts = np.unique(hashed, return_counts=True)
+    return ids, counts.astype(np.float32)
+
+
+class JobMatcher:
+    def __init__(self, n_features=2 ** 20, norm_drift=0.1, compact_ratio=0.25, merge_ratio=0.1, merge_rows=2000):
+        if n_features & (n_features - 1):
+            raise ValueError('n_features must be a power of two')
+        self.n_features = n_features
+        self.norm_drift = norm_drift
+        self.compact_ratio = compact_ratio
+        self.merge_ratio = merge_ratio
+        self.merge_rows = merge_rows
+        # Highest posting id loaded; the app loads postings above it
+        self.posting_watermark = 0
+
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._nnz = 0
+        self._dead_nnz = 0
+        self._indptr = np.zeros(1024 + 1, np.int64)
+        self._indices = np.empty(65536, np.int32)
+        self._data = np.empty(65536, np.float32)
+        self._owner = np.empty(1024, np.int32)
+        self._alive = np.zeros(1024, bool)
+        self._norms = np.empty(1024, np.float32)
+        self._df = np.zeros(n_features, np.int32)
+        self._live = 0
+        self._norms_live = 0
+        # Column-major copy of rows [0, _csc_rows): column f's rows and values are
+        # _csc_row_ids/_csc_data[_colptr[f]:_colptr[f + 1]]
+        self._csc_rows = 0
+        self._colptr = None
+        self._csc_row_ids = None
+        self._csc_data = None
+        self._keys = []
+        self._meta = []
+        # key -> (row, stamp), and owner -> keys
+        self._by_key = {}
+        self._owner_keys = {}
+        # owner -> data version its rows were loaded at
+        self._owner_versions = {}
+        self._stats = {'added': 0, 'removed': 0, 'compactions': 0, 'merges': 0, 'norm_refreshes': 0,
+                       'matches': 0, 'last_match_ms': None}
+
+    def add(self, key, text, owner=0, meta=None, stamp=None):
+        # Add or replace the document stored under key
+        ids, counts = features(text, self.n_features)
+        with self._lock:
+            self._remove(key)
+            self._append(key, ids, counts, owner, meta, stamp)
+            self._maybe_compact()
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+            self._maybe_compact()
+
+    def sync_owner(self, owner, version, load_rows):
+        # Bring an owner's documents up to date when their data version moved. load_rows() returns
+        # (key, stamp, text, meta) for every document the owner has now; only keys that are new,
+        # gone or carry a different stamp are touched.
+        if self._owner_versions.get(owner) == version:
+            return
+        rows = load_rows()
+        with self._lock:
+            for key in self._owner_keys.get(owner, set()) - {row[0] for row in rows}:
+                self._remove(key)
+        for key, stamp, text, meta in rows:
+            known = self._by_key.get(key)
+            if known is None or known[1] != stamp:
+                self.add(key, text, owner, meta, stamp)
+        self._owner_versions[owner] = version
+
+    def match(self, text, owner=0, k=10):
+        # The k best (key, score, meta) for a text among shared documents and the owner's own
+        started = time.perf_counter()
+        ids, counts = features(text, self.n_features)
+        with self._lock:
+            if abs(self._live - self._norms_live) > self.norm_drift * max(self._norms_live, 1):
+                self._refresh_norms()
+            if self._rows - self._csc_rows > max(self.merge_rows, self.merge_ratio * self._csc_rows):
+                self._merge()
+            rows, nnz, base = self._rows, self._nnz, self._csc_rows
+            colptr, csc_row_ids, csc_data = self._colptr, self._csc_row_ids, self._csc_data
+            tail = self._indptr[base:rows + 1]
+            tail_indices, tail_data = self._indices[tail[0]:nnz], self._data[tail[0]:nnz]
+            visible = self._alive[:rows] & ((self._owner[:rows] == 0) | (self._owner[:rows] == owner))
+            norms = self._norms[:rows]
+            idf = self._idf(ids)
+            keys, meta = self._keys, self._meta
+        if not rows or not len(ids):
+            return []
+
+        # Query weights carry idf twice (once for each side of the dot product); row norms are
+        # the idf-weighted ones, so scores are cosine similarities
+        weights = (1 + np.log(counts)) * idf
+        query = weights * idf / np.linalg.norm(weights)
+        scores = np.zeros(rows, np.float32)
+        if base:
+            # Concatenate the query's columns and sum their entries into their rows
+            starts = colptr[ids]
+            lengths = colptr[ids + 1] - starts
+            total = int(lengths.sum())
+            if total:
+                positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+                scores[:base] = np.bincount(csc_row_ids[positions], csc_data[positions] * np.repeat(query, lengths),
+                                            minlength=base)
+        if rows > base:
+            # Tail rows by CSR: look each entry's feature up among the query's sorted ids
+            slot = np.minimum(np.searchsorted(ids, tail_indices), len(ids) - 1)
+            products = np.where(ids[slot] == tail_indices, query[slot], 0) * tail_data
+            # Every row has at least one entry, so reduceat sums exactly each row's slice
+            scores[base:] = np.add.reduceat(products, tail[:-1] - tail[0])
+        scores /= norms
+        scores[~visible] = 0
+
+        k = min(k, rows)
+        top = np.argpartition(scores, rows - k)[rows - k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        top = top[scores[top] > 0]
+        with self._lock:
+            self._stats['matches'] += 1
+            self._stats['last_match_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return [(keys[row], float(scores[row]), meta[row]) for row in top]
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, rows=self._rows, live=self._live, nnz=self._nnz - self._dead_nnz,
+                        posting_watermark=self.posting_watermark,
+                        csc_rows=self._csc_rows, bytes=int(sum(array.nbytes for array in (
+                            self._indices, self._data, self._df, self._colptr, self._csc_row_ids, self._csc_data
+                        ) if array is not None)))
+
+    def __len__(self):
+        return self._live
+
+    def _idf(self, ids):
+        return (np.log((1 + self._live) / (1 + self._df[ids])) + 1).astype(np.float32)
+
+    def _append(self, key, ids, counts, owner, meta, stamp):
+        if not len(ids):
+            # Keep one zero entry so every row is non-empty for reduceat
+            ids, counts = np.zeros(1, np.int32), np.zeros(1, np.float32)
+        weights = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0).astype(np.float32)
+        row, start, end = self._rows, self._nnz, self._nnz + len(ids)
+        self._reserve(row + 1, end)
+        self._indices[start:end] = ids
+        self._data[start:end] = weights
+        self._indptr[row + 1] = end
+        self._owner[row] = owner
+        self._alive[row] = True
+        self._df[ids[weights > 0]] += 1
+        self._live += 1
+        weighted = weights * self._idf(ids)
+        self._norms[row] = max(float(np.sqrt(weighted @ weighted)), 1e-6)
+        self._keys.append(key)
+        self._meta.append(meta)
+        self._by_key[key] = (row, stamp)
+        self._owner_keys.setdefault(owner, set()).add(key)
+        self._rows, self._nnz = row + 1, end
+        self._stats['added'] += 1
+
+    def _remove(self, key):
+        known = self._by_key.pop(key, None)
+        if known is None:
+            return
+        row = known[0]
+        self._owner_keys[int(self._owner[row])].discard(key)
+        start, end = self._indptr[row], self._indptr[row + 1]
+        ids = self._indices[start:end]
+        self._df[ids[self._data[start:end] > 0]] -= 1
+        self._alive[row] = False
+        self._live -= 1
+        self._dead_nnz += int(end - start)
+        self._stats['removed'] += 1
+
+    def _reserve(self, rows, nnz):
+        # Grow the arrays geometrically so appends are amortised O(1)
+        if rows > len(self._owner):
+            size = max(rows, len(self._owner) * 2)
+            self._indptr = np.resize(self._indptr, size + 1)
+            for name in ('_owner', '_alive', '_norms'):
+                setattr(self, name, np.resize(getattr(self, name), size))
+        if nnz > len(self._indices):
+            size = max(nnz, len(self._indices) * 2)
+            self._indices = np.resize(self._indices, size)
+            self._data = np.resize(self._data, size)
+
+    def _refresh_norms(self):
+        rows, nnz = self._rows, self._nnz
+        if rows:
+            weighted = self._data[:nnz] * (np.log((1 + self._live) / (1 + self._df[self._indices[:nnz]])) + 1)
+            # A new array rather than an in-place update: running matches keep the one they read
+            norms = self._norms.copy()
+            norms[:rows] = np.maximum(np.sqrt(np.add.reduceat(weighted * weighted, self._indptr[:rows])), 1e-6)
+            self._norms = norms
+        self._norms_live = self._live
+        self._stats['norm_refreshes'] += 1
+
+    def _merge(self):
+        # Rebuild the column-major copy over every current row
+        rows, nnz = self._rows, self._nnz
+        lengths = np.diff(self._indptr[:rows + 1]).astype(np.int64)
+        row_ids = np.repeat(np.arange(rows, dtype=np.int32), lengths)
+        order = np.argsort(self._indices[:nnz], kind='stable')
+        self._csc_row_ids = row_ids[order]
+        self._csc_data = self._data[:nnz][order]
+        self._colptr = np.zeros(self.n_features + 1, np.int64)
+        np.cumsum(np.bincount(self._indices[:nnz], minlength=self.n_features), out=self._colptr[1:])
+        self._csc_rows = rows
+        self._stats['merges'] += 1
+
+    def _maybe_compact(self):
+        if self._dead_nnz <= self.compact_ratio * max(self._nnz, 1):
+            return
+        rows, nnz = self._rows, self._nnz
+        alive = self._alive[:rows]
+        lengths = np.diff(self._indptr[:rows + 1])
+        keep = np.repeat(alive, lengths)
+        kept = np.flatnonzero(alive)
+        # New arrays, so a match still reading the old ones is unaffected
+        self._indices = self._indices[:nnz][keep]
+        self._data = self._data[:nnz][keep]
+        self._indptr = np.concatenate(([0], np.cumsum(lengths[alive])))
+        self._owner = self._owner[:rows][alive]
+        self._norms = self._norms[:rows][alive]
+        self._alive = np.ones(len(kept), bool)
+        self._keys = [self._keys[row] for row in kept]
+        self._meta = [self._meta[row] for row in kept]
+        self._by_key = {key: (row, self._by_key[key][1]) for row, key in enumerate(self._keys)}
+        self._rows, self._nnz, self._dead_nnz = len(kept), len(self._indices), 0
+        # Row numbers changed; the next match rebuilds the column-major copy
+        self._csc_rows = 0
+        self._colptr = self._csc_row_ids = self._csc_data = None
+        self._stats['compactions'] += 1
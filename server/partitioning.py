@@ -0,0 +1,276 @@
+"""Online conversion of per-user tables to hash partitions (PostgreSQL).
+
+partition_table() rebuilds a table as one partitioned on user_id while the app
+keeps reading and writing the original:
+
+1. A shadow table `<table>_new` is created with the same columns, defaults
+   (the id sequence included), generated columns, indexes and foreign keys,
+   and a trigger on the original mirrors every insert, update and delete
+   into it from then on.
+2. Existing rows are copied in keyset batches of `batch_size`, each its own
+   short transaction. A batch takes FOR SHARE locks on the rows it copies, so
+   a concurrent update or delete waits for it and is then mirrored by the
+   trigger; a row the trigger already wrote is left alone.
+3. The original's foreign keys are dropped (the shadow's keep checking every
+   write), then the swap takes an ACCESS EXCLUSIVE lock on the original,
+   hands the id sequence to the shadow, drops the original and renames the
+   shadow and its indexes and constraints to the original names. Nothing
+   has to be copied while the lock is held. Each step that takes locks
+   gives up after a short lock_timeout and is retried, so it never holds up
+   requests for long.
+
+The column names and types are unchanged, so the SQLAlchemy models need no
+change. The primary key grows to include the partition key columns, as
+PostgreSQL requires; ids still come from the one sequence and stay unique.
+
+An interrupted conversion can be run again: the shadow and its trigger are
+kept and the copy restarts from the beginning, skipping rows already copied.
+unpartition_table() runs the same steps in reverse.
+
+audit_log is also partitioned by month inside each hash partition.
+ensure_month_partitions() adds the months ahead of time; a row outside every
+month lands in the partition's DEFAULT partition, and its month can still be
+added later (the rows are moved out of DEFAULT first).
+"""
+import time
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+HASH_PARTITIONS = 16
+# Months of audit_log partitions created ahead of the current one. Each month adds planning time
+# to every per-user audit query, so only a couple are kept ahead.
+MONTHS_AHEAD = 2
+LOCK_NOT_AVAILABLE = '55P03'
+
+
+def is_partitioned(connection, table):
+    return connection.scalar(text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                             {'table': table})
+
+
+def partition_table(engine, table, primary_key, month_column=None, months=(), modulus=HASH_PARTITIONS,
+                    batch_size=5000, pause=0.0, log=print):
+    # Convert `table` to `modulus` hash partitions on user_id, each one also partitioned by month on
+    # `month_column` when given
+    shadow = f'{table}_new'
+
+    def create(connection):
+        sub = f' PARTITION BY RANGE ("{month_column}")' if month_column else ''
+        connection.exec_driver_sql(f'CREATE TABLE {shadow} (LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED) '
+                                   f'PARTITION BY HASH (user_id)')
+        if month_column:
+            connection.exec_driver_sql(f'ALTER TABLE {shadow} ALTER COLUMN "{month_column}" SET NOT NULL')
+        for remainder in range(modulus):
+            connection.exec_driver_sql(
+                f'CREATE TABLE {table}_p{remainder} PARTITION OF {shadow} '
+                f'FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder}){sub}'
+            )
+            if month_column:
+                connection.exec_driver_sql(f'CREATE TABLE {table}_p{remainder}_default '
+                                           f'PARTITION OF {table}_p{remainder} DEFAULT')
+        if month_column:
+            ensure_month_partitions(connection, shadow, month_column, months)
+
+    if month_column:
+        # Partition key columns can't be NULL; the app always sets the timestamp, so only rows
+        # written by hand lack one. They are dated to the epoch and land in DEFAULT.
+        with engine.begin() as connection:
+            filled = connection.exec_driver_sql(
+                f"""UPDATE {table} SET "{month_column}" = '1970-01-01' WHERE "{month_column}" IS NULL"""
+            ).rowcount
+        if filled:
+            log(f'{table}: dated {filled} rows without a {month_column} to 1970-01-01')
+    _rebuild(engine, table, create, primary_key, batch_size, pause, log)
+
+
+def unpartition_table(engine, table, primary_key=('id',), nullable=(), batch_size=5000, pause=0.0, log=print):
+    # Convert a partitioned `table` back to a plain table, making the `nullable` columns nullable again
+    def create(connection):
+        connection.exec_driver_sql(
+            f'CREATE TABLE {table}_new (LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED)'
+        )
+        for column in nullable:
+            connection.exec_driver_sql(f'ALTER TABLE {table}_new ALTER COLUMN "{column}" DROP NOT NULL')
+
+    _rebuild(engine, table, create, primary_key, batch_size, pause, log)
+
+
+def ensure_month_partitions(connection, table, column, months):
+    # Create the monthly partitions `months` (first days of months) in every range-partitioned
+    # child of `table`, moving any of their rows out of the child's DEFAULT partition
+    months = list(months)
+    columns = ', '.join(f'"{name}"' for name in _copy_columns(connection, table))
+    created = 0
+    for parent in _children(connection, table, partitioned=True):
+        existing = set(_children(connection, parent))
+        for month in months:
+            name = f'{parent}_{month:%Y%m}'
+            if name in existing:
+                continue
+            bounds = f"FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+            in_month = f""""{column}" >= '{month.isoformat()}' AND "{column}" < '{_next_month(month).isoformat()}'"""
+            default = f'{parent}_default'
+            if default in existing and connection.exec_driver_sql(
+                f'SELECT 1 FROM {default} WHERE {in_month} LIMIT 1'
+            ).first():
+                connection.exec_driver_sql(f'CREATE TABLE {name} (LIKE {parent} INCLUDING DEFAULTS INCLUDING GENERATED)')
+                connection.exec_driver_sql(
+                    f'WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING {columns}) '
+                    f'INSERT INTO {name} ({columns}) SELECT {columns} FROM moved'
+                )
+                connection.exec_driver_sql(f'ALTER TABLE {parent} ATTACH PARTITION {name} FOR VALUES {bounds}')
+            else:
+                connection.exec_driver_sql(f'CREATE TABLE {name} PARTITION OF {parent} FOR VALUES {bounds}')
+            created += 1
+    return created
+
+
+def month_range(first, last):
+    # The first day of each month from `first`'s month through `last`'s
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = _next_month(month)
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _children(connection, table, partitioned=False):
+    return [name for name, in connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass) AND (NOT :partitioned OR c.relkind = 'p') ORDER BY c.relname"
+    ), {'table': table, 'partitioned': partitioned})]
+
+
+def _copy_columns(connection, table):
+    # Columns that take a value on insert (generated columns are computed by the shadow itself)
+    return [name for name, in connection.execute(text(
+        "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() "
+        "AND table_name = :table AND is_generated = 'NEVER' ORDER BY ordinal_position"
+    ), {'table': table})]
+
+
+def _rebuild(engine, table, create, primary_key, batch_size, pause, log):
+    shadow = f'{table}_new'
+    with engine.begin() as connection:
+        columns = _copy_columns(connection, table)
+        resume = connection.scalar(text('SELECT to_regclass(:shadow)'), {'shadow': shadow}) is not None
+    if resume:
+        log(f'{table}: resuming into the existing {shadow}')
+    else:
+        _with_lock_timeout(engine, lambda connection: _create_shadow(connection, table, shadow, create,
+                                                                     primary_key, columns))
+        log(f'{table}: created {shadow} and the trigger that keeps it in sync')
+
+    copied = _copy_rows(engine, table, shadow, columns, batch_size, pause)
+    log(f'{table}: copied {copied} rows')
+    # Dropping a foreign key locks the referenced table (user) exclusively, so it gets a step of its
+    # own rather than lengthening the swap. Every write still reaches the shadow, whose keys check it.
+    _with_lock_timeout(engine, lambda connection: _drop_foreign_keys(connection, table))
+    _with_lock_timeout(engine, lambda connection: _swap(connection, table, shadow, columns))
+    log(f'{table}: swapped in {shadow}')
+
+
+def _with_lock_timeout(engine, step, lock_timeout_ms=500, attempts=60):
+    # Run `step` in a transaction that gives up waiting for a lock after `lock_timeout_ms`, and retry
+    # it. The timeout is below PostgreSQL's default deadlock_timeout (1 s), so when the step and a
+    # request wait on each other the step backs off before a deadlock aborts the request.
+    for attempt in range(attempts):
+        try:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(f"SET LOCAL lock_timeout = '{lock_timeout_ms}ms'")
+                return step(connection)
+        except OperationalError as error:
+            if getattr(error.orig, 'pgcode', None) != LOCK_NOT_AVAILABLE or attempt == attempts - 1:
+                raise
+            time.sleep(min(0.1 * 2 ** attempt, 5))
+
+
+def _create_shadow(connection, table, shadow, create, primary_key, columns):
+    create(connection)
+    connection.exec_driver_sql(
+        f'ALTER TABLE {shadow} ADD CONSTRAINT {table}_pkey_new PRIMARY KEY ({", ".join(primary_key)})'
+    )
+    # Every index and foreign key of the original, under a temporary name until the swap
+    for name, definition in connection.execute(text(
+        'SELECT i.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid '
+        'WHERE x.indrelid = CAST(:table AS regclass) AND NOT EXISTS '
+        '(SELECT 1 FROM pg_constraint c WHERE c.conrelid = x.indrelid AND c.conindid = x.indexrelid)'
+    ), {'table': table}).all():
+        using = definition.split(' USING ', 1)[1]
+        unique = 'UNIQUE ' if definition.startswith('CREATE UNIQUE') else ''
+        connection.exec_driver_sql(f'CREATE {unique}INDEX {name}_new ON {shadow} USING {using}')
+    for name, definition in connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {'table': table}).all():
+        connection.exec_driver_sql(f'ALTER TABLE {shadow} ADD CONSTRAINT {name}_new {definition}')
+
+    quoted = ', '.join(f'"{name}"' for name in columns)
+    key = ' AND '.join(f'"{name}" = OLD."{name}"' for name in primary_key)
+    connection.exec_driver_sql(f"""
+        CREATE FUNCTION {shadow}_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {shadow} WHERE {key};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {shadow} ({quoted}) VALUES ({', '.join(f'NEW."{name}"' for name in columns)})
+                ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END $$
+    """)
+    connection.exec_driver_sql(f'CREATE TRIGGER {shadow}_sync AFTER INSERT OR UPDATE OR DELETE ON {table} '
+                               f'FOR EACH ROW EXECUTE FUNCTION {shadow}_sync()')
+
+
+def _copy_rows(engine, table, shadow, columns, batch_size, pause):
+    quoted = ', '.join(f'"{name}"' for name in columns)
+    after, copied = 0, 0
+    while True:
+        with engine.begin() as connection:
+            last, count = connection.execute(text(
+                f'WITH batch AS (SELECT {quoted} FROM {table} WHERE id > :after ORDER BY id LIMIT :limit FOR SHARE), '
+                f'copied AS (INSERT INTO {shadow} ({quoted}) SELECT {quoted} FROM batch ON CONFLICT DO NOTHING) '
+                f'SELECT max(id), count(*) FROM batch'
+            ), {'after': after, 'limit': batch_size}).one()
+        if not count:
+            return copied
+        after, copied = last, copied + count
+        if pause:
+            time.sleep(pause)
+
+
+def _drop_foreign_keys(connection, table):
+    for name, in connection.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), {'table': table}).all():
+        connection.exec_driver_sql(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+
+
+def _swap(connection, table, shadow, columns):
+    connection.exec_driver_sql(f'LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE')
+    connection.exec_driver_sql(f'DROP TRIGGER {shadow}_sync ON {table}')
+    connection.exec_driver_sql(f'DROP FUNCTION {shadow}_sync()')
+    # The shadow's defaults already draw from the original's sequences; keep them alive
+    for column in columns:
+        sequence = connection.scalar(text('SELECT pg_get_serial_sequence(:table, :column)'),
+                                     {'table': table, 'column': column})
+        if sequence:
+            connection.exec_driver_sql(f'ALTER SEQUENCE {sequence} OWNED BY {shadow}."{column}"')
+    connection.exec_driver_sql(f'DROP TABLE {table}')
+    connection.exec_driver_sql(f'ALTER TABLE {shadow} RENAME TO {table}')
+    for name, in connection.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:table AS regclass) AND conname LIKE '%\\_new'"
+    ), {'table': table}).all():
+        connection.exec_driver_sql(f'ALTER TABLE {table} RENAME CONSTRAINT {name} TO {name[:-4]}')
+    for name, in connection.execute(text(
+        "SELECT i.relname FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = CAST(:table AS regclass) AND i.relname LIKE '%\\_new'"
+    ), {'table': table}).all():
+        connection.exec_driver_sql(f'ALTER INDEX {name} RENAME TO {name[:-4]}')
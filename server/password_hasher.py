@@ -0,0 +1,100 @@
+"""Password hashing off the request thread.
+
+Hashes are computed with werkzeug's generate_password_hash/check_password_hash
+in a process pool, so a burst of logins queues on the pool instead of holding
+every web worker on a CPU-bound hash. The pool is bounded: at most
+`max_pending` hashes may be queued or running, and a caller that cannot get a
+slot within `timeout` gets HasherBusy rather than waiting indefinitely. A hash
+keeps its slot until it finishes, even when its caller gave up waiting.
+
+Pool workers are started by multiprocessing's forkserver (on POSIX), not by
+forking the web process: the pool is created on first use, when the server's
+threads are already running, and a fork copies whatever locks they hold.
+
+`method` is any werkzeug method string, with or without its cost parameters
+("scrypt", "scrypt:65536:8:1", "pbkdf2:sha256:600000"). needs_rehash() tells
+whether a stored hash was made with different parameters, so it can be
+upgraded after a successful login.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, method='scrypt', workers=2, max_pending=None, timeout=10.0):
+        # workers=0 hashes inline on the calling thread
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending or max(workers, 1) * 4)
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        self._prefix = None
+
+    def hash(self, password):
+        return self._call(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._call(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        # True when the stored hash's method and cost differ from the configured ones
+        if self._prefix is None:
+            # werkzeug fills in default costs, so compare against what it actually writes
+            self._prefix = self.hash('').split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _call(self, function, *args):
+        if not self.workers:
+            return function(*args)
+        try:
+            return self._run(function, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool and retry once
+            self.shutdown()
+            return self._run(function, *args)
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy()
+        try:
+            future = self._executor().submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is freed when the hash is done, not when the caller stops waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HasherBusy()
+
+    def _executor(self):
+        # Pools don't survive fork, so a process forked after the pool was created (e.g. a
+        # gunicorn worker with --preload) builds its own
+        if self._pool is not None and self._pool_pid == os.getpid():
+            return self._pool
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # The forkserver imports the main script once (gunicorn's or flask's, or app.py
+                # when run directly); workers forked from it only import what the tasks need
+                context = multiprocessing.get_context('forkserver') if os.name == 'posix' else None
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._pool_pid = os.getpid()
+            return self._pool
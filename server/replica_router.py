@@ -0,0 +1,78 @@
+"""Routing of read-only requests to database replicas.
+
+The app's session asks read_engine() which engine a GET request should read
+from. It gets a replica in round-robin order, or None (the primary) when:
+
+- the user wrote within the last `sticky_seconds`, so they read their own
+  writes even while the replicas lag behind;
+- every replica is marked down.
+
+A replica that fails is marked down for `retry_seconds` (mark_down()), and the
+failed read is re-run on the primary by the caller. Once the retry window ends
+the next read serves as the probe: if it fails too, the replica goes back
+down.
+
+The sticky window is kept per process. A user's next request may land in
+another worker and read from a replica, so `sticky_seconds` should be longer
+than the usual replication lag.
+"""
+import itertools
+import threading
+import time
+
+
+class ReplicaRouter:
+    def __init__(self, engines, sticky_seconds=5.0, retry_seconds=30.0):
+        self.engines = list(engines)
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._down_until = {}  # engine -> monotonic time it may be tried again
+        self._sticky_until = {}  # user id -> monotonic time its reads may leave the primary
+        self._prune_at = 1024
+        self._stats = {'replica_reads': 0, 'primary_reads': 0, 'sticky_reads': 0, 'failovers': 0}
+
+    def read_engine(self, user_id=None):
+        # The replica to read from, or None to read from the primary
+        now = time.monotonic()
+        if user_id is not None and self._sticky_until.get(user_id, 0) > now:
+            self._bump('sticky_reads')
+            return None
+        start = next(self._turn)
+        for offset in range(len(self.engines)):
+            engine = self.engines[(start + offset) % len(self.engines)]
+            if self._down_until.get(engine, 0) <= now:
+                self._bump('replica_reads')
+                return engine
+        self._bump('primary_reads')
+        return None
+
+    def note_writes(self, user_ids):
+        # Keep these users' reads on the primary for the sticky window
+        until = time.monotonic() + self.sticky_seconds
+        with self._lock:
+            for user_id in user_ids:
+                self._sticky_until[user_id] = until
+            if len(self._sticky_until) >= self._prune_at:
+                now = time.monotonic()
+                self._sticky_until = {user: at for user, at in self._sticky_until.items() if at > now}
+                self._prune_at = max(1024, len(self._sticky_until) * 2)
+
+    def mark_down(self, engine):
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_seconds
+            self._stats['failovers'] += 1
+
+    def metrics(self):
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sticky_users'] = sum(1 for at in self._sticky_until.values() if at > now)
+            stats['down'] = [engine.url.render_as_string(hide_password=True)
+                             for engine, until in self._down_until.items() if until > now]
+        return stats
+
+    def _bump(self, key):
+        with self._lock:
+            self._stats[key] += 1
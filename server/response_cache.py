@@ -0,0 +1,161 @@
+"""Caches of serialised GET responses, partitioned by user.
+
+Entries are stored under (user_id, key). Callers build the key from the user's
+data version (see the ETag helpers in app.py), so a write makes every older
+entry unreachable even in a worker that never saw the invalidation; the
+invalidate_user() calls made after each commit only free the space early.
+
+MemoryResponseCache is a per-process LRU bounded in bytes with a TTL.
+SQLiteResponseCache implements the same interface on a SQLite file that
+several worker processes can share; it stands in for a networked backend.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    # Interface shared by every backend; values are bytes
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, user_id, key):
+        raise NotImplementedError
+
+    def set(self, user_id, key, value):
+        raise NotImplementedError
+
+    def invalidate_user(self, user_id):
+        raise NotImplementedError
+
+    def metrics(self):
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _bump(self, key, count=1):
+        with self._stats_lock:
+            self._stats[key] += count
+
+
+class MemoryResponseCache(ResponseCache):
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=300):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (user_id, key) -> (expires_at, value), oldest first
+        self._user_keys = {}
+        self._bytes = 0
+
+    def get(self, user_id, key):
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove((user_id, key))
+                self._bump('evictions')
+                entry = None
+            if entry is None:
+                self._bump('misses')
+                return None
+            self._entries.move_to_end((user_id, key))
+        self._bump('hits')
+        return entry[1]
+
+    def set(self, user_id, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove((user_id, key))
+            self._entries[(user_id, key)] = (time.monotonic() + self.ttl, value)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._bump('evictions')
+        self._bump('stores')
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._user_keys.get(user_id, ())):
+                self._remove((user_id, key))
+        self._bump('invalidations')
+
+    def metrics(self):
+        stats = super().metrics()
+        with self._lock:
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def _remove(self, entry_key):
+        # Caller holds self._lock
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[1])
+        user_id, key = entry_key
+        keys = self._user_keys[user_id]
+        keys.discard(key)
+        if not keys:
+            del self._user_keys[user_id]
+
+
+class SQLiteResponseCache(ResponseCache):
+    def __init__(self, path='response_cache.db', ttl=300):
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS response_cache ('
+                'user_id INTEGER NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL, '
+                'PRIMARY KEY (user_id, key))'
+            )
+
+    def _connection(self):
+        # One connection per thread; WAL lets readers in other processes proceed during writes
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, user_id, key):
+        row = self._connection().execute(
+            'SELECT value FROM response_cache WHERE user_id = ? AND key = ? AND expires_at > ?',
+            (user_id, key, time.time())
+        ).fetchone()
+        self._bump('hits' if row else 'misses')
+        return row[0] if row else None
+
+    def set(self, user_id, key, value):
+        with self._connection() as connection:
+            # Expired rows of the same user go with the write, which keeps the file bounded by the TTL
+            expired = connection.execute(
+                'DELETE FROM response_cache WHERE user_id = ? AND expires_at <= ?', (user_id, time.time())
+            ).rowcount
+            connection.execute(
+                'INSERT OR REPLACE INTO response_cache (user_id, key, value, expires_at) VALUES (?, ?, ?, ?)',
+                (user_id, key, value, time.time() + self.ttl)
+            )
+        if expired:
+            self._bump('evictions', expired)
+        self._bump('stores')
+
+    def invalidate_user(self, user_id):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM response_cache WHERE user_id = ?', (user_id,))
+        self._bump('invalidations')
+
+    def metrics(self):
+        stats = super().metrics()
+        stats['entries'], stats['bytes'] = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM response_cache'
+        ).fetchone()
+        return stats
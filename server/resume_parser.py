@@ -0,0 +1,208 @@
+"""Plain-text extraction from uploaded resumes.
+
+parse_resume(path) sniffs the file's leading bytes rather than trusting the
+upload's name or content type, and returns the extracted text with a few
+derived fields. It runs in ResumeStore's worker processes, so it only takes
+and returns picklable values.
+
+PDFs are read with pypdf when it is installed. Without it, a small fallback
+pulls the text operators out of the (Flate-compressed) content streams, which
+covers the single-byte-font PDFs most resume tools write; other PDFs fail to
+parse instead of returning garbage. DOCX is read straight from the zip with
+the standard library, and anything else that decodes as text is taken as is.
+Legacy .doc files and images are rejected as unsupported.
+
+Compressed content is inflated to at most MAX_INFLATED_BYTES per file, so a small
+upload can't expand into gigabytes in a worker: a DOCX whose document.xml is
+larger, or a PDF whose content streams inflate past it, is rejected.
+"""
+import re
+import zipfile
+import zlib
+from collections import Counter
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:  # optional dependency
+    pypdf = None
+
+# Text kept in a parse result; what matching needs is well within this
+MAX_TEXT_CHARS = 200000
+MAX_KEYWORDS = 25
+# Decompressed bytes read from one file: markup and operators around the text take several times
+# its size, and genuine resumes stay well within this
+MAX_INFLATED_BYTES = 10 * MAX_TEXT_CHARS
+
+STOPWORDS = frozenset('''
+a about above after again all also am an and any are as at be been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out
+over own same she should so some such than that the their theirs them then there these they this those through
+to too under until up very was we were what when where which while who whom why will with would you your yours
+'''.split())
+
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UnsupportedResume(ValueError):
+    pass
+
+
+def sniff(head):
+    # Format from the first bytes of the file
+    if head.startswith(b'%PDF'):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'docx'
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'doc'
+    if head.startswith((b'\x89PNG', b'\xff\xd8\xff', b'GIF8')):
+        return 'image'
+    return 'text'
+
+
+def parse_resume(path):
+    with open(path, 'rb') as file:
+        kind = sniff(file.read(8))
+    if kind == 'pdf':
+        text, parser = _pdf_text(path)
+    elif kind == 'docx':
+        text, parser = _docx_text(path), 'docx'
+    elif kind == 'text':
+        text, parser = _plain_text(path), 'text'
+    else:
+        raise UnsupportedResume(f'{kind} files are not supported; upload a PDF, DOCX or text file')
+
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r'\s*\n\s*', '\n', text).strip()
+    if not text:
+        raise UnsupportedResume('No text could be extracted from the file')
+    emails = EMAIL.findall(text)
+    words = re.findall(r'\w+', EMAIL.sub(' ', text).lower())
+    counts = Counter(word for word in words if len(word) > 1 and word not in STOPWORDS and not word.isdigit())
+    return {
+        'format': kind,
+        'parser': parser,
+        'characters': len(text),
+        'words': len(words),
+        'keywords': [word for word, _ in counts.most_common(MAX_KEYWORDS)],
+        'emails': sorted(set(emails))[:5],
+        'text': text[:MAX_TEXT_CHARS]
+    }
+
+
+def _plain_text(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    if b'\x00' in data[:4096]:
+        raise UnsupportedResume('Unrecognised binary file; upload a PDF, DOCX or text file')
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('latin-1')
+
+
+def _docx_text(path):
+    # Paragraphs become lines; runs, tabs and breaks inside one are joined in order
+    try:
+        with zipfile.ZipFile(path) as archive:
+            # The size the archive declares; zipfile stops reading there and fails on a mismatch
+            if archive.getinfo('word/document.xml').file_size > MAX_INFLATED_BYTES:
+                raise UnsupportedResume('The DOCX document is too large to parse')
+            with archive.open('word/document.xml') as document:
+                lines = []
+                parts = []
+                for _, element in ElementTree.iterparse(document):
+                    if element.tag == WORD_NS + 't':
+                        parts.append(element.text or '')
+                    elif element.tag in (WORD_NS + 'tab', WORD_NS + 'br'):
+                        parts.append(' ')
+                    elif element.tag == WORD_NS + 'p':
+                        lines.append(''.join(parts))
+                        parts = []
+                        element.clear()
+                return '\n'.join(lines)
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        raise UnsupportedResume('The file is not a readable DOCX document')
+
+
+def _pdf_text(path):
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(path)
+            return '\n'.join(page.extract_text() or '' for page in reader.pages), 'pypdf'
+        except pypdf.errors.PdfReadError:
+            raise UnsupportedResume('The file is not a readable PDF')
+    with open(path, 'rb') as file:
+        data = file.read()
+    return _pdf_fallback_text(data), 'pdf-streams'
+
+
+_PDF_STREAM = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream', re.S)
+# A string literal or hex string followed by Tj/'/", an array followed by TJ, or a line move
+_PDF_TEXT_OP = re.compile(rb'(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)\s*(?:Tj|\'|")|\[((?:\\.|[^\]\\])*)\]\s*TJ|(T\*|Td|TD|ET)(?!\w)', re.S)
+_PDF_ARRAY_ITEM = re.compile(rb'\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|-?\d+(?:\.\d+)?')
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+                b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def _pdf_fallback_text(data):
+    lines = []
+    # Inflated bytes left for the document's streams
+    budget = MAX_INFLATED_BYTES
+    for dictionary, stream in _PDF_STREAM.findall(data):
+        if b'/FlateDecode' in dictionary:
+            decompressor = zlib.decompressobj()
+            try:
+                # max_length=0 would mean no limit
+                stream = decompressor.decompress(stream, max(budget, 1))
+            except zlib.error:
+                continue
+            budget -= len(stream)
+            if decompressor.unconsumed_tail or budget < 0:
+                raise UnsupportedResume('The PDF content is too large to parse')
+        elif b'/Filter' in dictionary:
+            continue
+        if b'BT' not in stream:
+            continue
+        line = []
+        for string, array, move in _PDF_TEXT_OP.findall(stream):
+            if string:
+                line.append(_pdf_string(string))
+            elif array:
+                for item in _PDF_ARRAY_ITEM.findall(array):
+                    if item[:1] in (b'(', b'<'):
+                        line.append(_pdf_string(item))
+                    elif float(item) < -200:
+                        # A large negative kerning adjustment is a word gap
+                        line.append(' ')
+            elif line:
+                lines.append(''.join(line))
+                line = []
+        if line:
+            lines.append(''.join(line))
+    text = '\n'.join(lines)
+    if not text.strip():
+        raise UnsupportedResume('No text could be extracted from the PDF; install pypdf for full PDF support')
+    return text
+
+
+def _pdf_string(token):
+    if token.startswith(b'<'):
+        raw = bytes.fromhex(re.sub(rb'\s', b'', token[1:-1]).decode('ascii'))
+    else:
+        raw = re.sub(rb'\\([0-7]{1,3}|.)', _pdf_escape, token[1:-1], flags=re.S)
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', 'replace')
+    return raw.decode('latin-1')
+
+
+def _pdf_escape(match):
+    escape = match.group(1)
+    if escape[:1].isdigit():
+        return bytes([int(escape, 8) & 0xff])
+    # A backslash before a newline continues the string
+    return _PDF_ESCAPES.get(escape, b'' if escape in (b'\n', b'\r') else escape)
@@ -0,0 +1,351 @@
+"""Content-addressed storage and background parsing of uploaded resumes.
+
+put() streams an upload to disk in chunks while hashing it, then renames it to
+blobs/<aa>/<sha256>, so identical files are stored once whatever they are
+called. submit() records a job for the blob and hands parsing to a process
+pool, returning at once; job() is what the status endpoint polls.
+
+Parse results (and parse failures, which are just as repeatable) are cached
+beside the blobs as results/<aa>/<sha256>.json, so uploading a resume that was
+seen before completes immediately without touching the pool. Jobs are small
+JSON files too, which lets any web worker answer a poll: a job still parsing
+in another process shows as queued until its result appears, and one whose
+process died is parsed again once it is older than `stale_after` seconds.
+
+The pool is bounded like PasswordHasher's: past `max_pending` parses queued or
+running in this process, submit() raises ParserBusy instead of queueing more.
+
+Blobs and results hold personal data, so nothing outlives the jobs that refer
+to it. sweep() deletes jobs older than `job_ttl`, then the blobs and results no
+remaining job refers to, and leftover temporary files. Each process runs it on
+a daemon thread from its first upload or poll on, every `sweep_interval`
+seconds; content is kept for `stale_after` seconds after it was last stored, so
+an upload's blob is never swept before its job is written.
+"""
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ResumeTooLarge(Exception):
+    pass
+
+
+class ParserBusy(Exception):
+    pass
+
+
+class ResumeStore:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, directory, parse, workers=2, max_pending=None, max_bytes=10 * 1024 * 1024,
+                 job_ttl=86400, stale_after=300, sweep_interval=3600):
+        # parse(path) returns a JSON-serialisable dict or raises; workers=0 parses inline
+        self.directory = directory
+        self.parse = parse
+        self.workers = workers
+        self.max_pending = max_pending or max(workers, 1) * 8
+        self.max_bytes = max_bytes
+        self.job_ttl = job_ttl
+        self.stale_after = stale_after
+        self.sweep_interval = sweep_interval
+
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        # digest -> future of the parse running in this process
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._sweeper_pid = None
+        self._stop = threading.Event()
+        self._stats = {'uploads': 0, 'deduplicated': 0, 'cache_hits': 0, 'parsed': 0, 'failed': 0,
+                       'rejected': 0, 'resubmitted': 0, 'last_parse_ms': None,
+                       'swept_jobs': 0, 'swept_blobs': 0, 'swept_results': 0, 'last_sweep_at': None}
+
+    def start(self):
+        # Start the sweep thread once per process; safe to call on every upload and poll
+        if not self.sweep_interval or self._sweeper_pid == os.getpid():
+            return
+        with self._pool_lock:
+            if self._sweeper_pid == os.getpid():
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(target=self._run_sweeps, name='resume-sweeper', daemon=True)
+            self._sweeper.start()
+            self._sweeper_pid = os.getpid()
+            atexit.register(self.stop)
+
+    def stop(self):
+        if self._sweeper is not None and self._sweeper_pid == os.getpid():
+            self._stop.set()
+            self._sweeper.join()
+        self._sweeper = None
+        self._sweeper_pid = None
+
+    def put(self, stream):
+        # Copy a file-like object into the store; returns (digest, size)
+        self.start()
+        tmp_dir = os.path.join(self.directory, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ResumeTooLarge()
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            digest = digest.hexdigest()
+            path = self.blob_path(digest)
+            self._bump('uploads')
+            if os.path.exists(path):
+                self._bump('deduplicated')
+                os.remove(tmp_path)
+                # Stored again just now, as far as the sweep's grace period is concerned
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def blob_path(self, digest):
+        return os.path.join(self.directory, 'blobs', digest[:2], digest)
+
+    def result(self, digest):
+        # The cached parse of a blob, or None while it hasn't been parsed
+        return self._read_json(self._result_path(digest))
+
+    def submit(self, user_id, digest, filename=None, size=None):
+        # Record a parse job for a stored blob and start the parse unless it is cached or already running
+        job = {
+            'id': uuid.uuid4().hex,
+            'user_id': user_id,
+            'digest': digest,
+            'filename': filename,
+            'size': size,
+            'pid': os.getpid(),
+            'created_at': time.time()
+        }
+        if self.result(digest) is not None:
+            self._bump('cache_hits')
+        else:
+            self._schedule(digest)
+        self._write_json(self._job_path(job['id']), job)
+        return self._with_status(job)
+
+    def job(self, job_id, user_id):
+        # A job with its status and, once parsed, its result; None if unknown, expired or not the user's
+        if len(job_id) != 32 or not all(c in '0123456789abcdef' for c in job_id):
+            return None
+        self.start()
+        path = self._job_path(job_id)
+        job = self._read_json(path)
+        if job is None or job['user_id'] != user_id:
+            return None
+        if time.time() - job['created_at'] > self.job_ttl:
+            self._remove(path)
+            return None
+        if self.result(job['digest']) is None and job['digest'] not in self._in_flight:
+            # Lost if it was started here (the pool broke), or long enough ago in another process
+            if job['pid'] == os.getpid() or time.time() - job['created_at'] > self.stale_after:
+                try:
+                    self._schedule(job['digest'])
+                    self._bump('resubmitted')
+                except ParserBusy:
+                    pass  # still queued; a later poll tries again
+        return self._with_status(job)
+
+    def sweep(self):
+        # Delete expired jobs, then the blobs and results no remaining job refers to; returns the counts
+        now = time.time()
+        removed = {'jobs': 0, 'blobs': 0, 'results': 0}
+        live = set()
+        for path in self._files('jobs'):
+            job = self._read_json(path) if path.endswith('.json') else None
+            if job is not None and now - job['created_at'] <= self.job_ttl:
+                live.add(job['digest'])
+            elif job is not None or self._older_than(path, self.stale_after):
+                # Expired, or a temporary file a crashed writer left behind
+                removed['jobs'] += self._remove(path)
+        with self._lock:
+            live.update(self._in_flight)
+        for kind, suffix in (('blobs', ''), ('results', '.json')):
+            for path in self._files(kind):
+                name = os.path.basename(path)
+                digest = name[:-len(suffix)] if suffix and name.endswith(suffix) else name
+                # The grace period covers an upload stored but whose job isn't written yet
+                if digest not in live and self._older_than(path, self.stale_after):
+                    removed[kind] += self._remove(path)
+        for path in self._files('tmp'):
+            if self._older_than(path, self.stale_after):
+                self._remove(path)
+        with self._lock:
+            for kind, count in removed.items():
+                self._stats[f'swept_{kind}'] += count
+            self._stats['last_sweep_at'] = now
+        return removed
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._in_flight))
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _with_status(self, job):
+        result = self.result(job['digest'])
+        future = self._in_flight.get(job['digest'])
+        if result is not None:
+            status = result['status']
+        elif future is not None and future.running():
+            status = 'running'
+        else:
+            status = 'queued'
+        view = {key: job[key] for key in ('id', 'digest', 'filename', 'size')}
+        view['status'] = status
+        if result is not None:
+            view.update((key, value) for key, value in result.items() if key != 'status')
+        return view
+
+    def _schedule(self, digest):
+        with self._lock:
+            if digest in self._in_flight:
+                return
+            if len(self._in_flight) >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise ParserBusy()
+            if not self.workers:
+                self._in_flight[digest] = None
+        if not self.workers:
+            self._finish(digest, time.perf_counter(), self._parse_inline(digest))
+            return
+        started = time.perf_counter()
+        with self._lock:
+            try:
+                future = self._executor().submit(self.parse, self.blob_path(digest))
+            except BrokenProcessPool:
+                self.shutdown()
+                future = self._executor().submit(self.parse, self.blob_path(digest))
+            self._in_flight[digest] = future
+        future.add_done_callback(lambda done: self._finish(digest, started, done))
+
+    def _parse_inline(self, digest):
+        try:
+            return {'status': 'done', 'resume': self.parse(self.blob_path(digest))}
+        except Exception as error:
+            return {'status': 'failed', 'error': self._describe(error)}
+
+    def _finish(self, digest, started, outcome):
+        # Cache the outcome of a parse; outcome is a result dict or the pool's future
+        if not isinstance(outcome, dict):
+            try:
+                outcome = {'status': 'done', 'resume': outcome.result()}
+            except BrokenProcessPool:
+                # Not the file's fault: leave it uncached so the next poll starts it again
+                self.shutdown()
+                outcome = None
+            except Exception as error:
+                outcome = {'status': 'failed', 'error': self._describe(error)}
+        if outcome is not None:
+            self._write_json(self._result_path(digest), outcome)
+        with self._lock:
+            self._in_flight.pop(digest, None)
+            if outcome is not None:
+                self._stats['parsed' if outcome['status'] == 'done' else 'failed'] += 1
+                self._stats['last_parse_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _describe(self, error):
+        # Parsers raise ValueError subclasses with messages meant for the user
+        return str(error) if isinstance(error, ValueError) and str(error) else 'The file could not be parsed'
+
+    def _executor(self):
+        # Pools don't survive fork, so a process forked after the pool was created builds its own
+        if self._pool is not None and self._pool_pid == os.getpid():
+            return self._pool
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # Forked from a forkserver rather than from this threaded web process, whose locks
+                # (the database pool's, the audit writer's) a plain fork could copy mid-use
+                context = multiprocessing.get_context('forkserver') if os.name == 'posix' else None
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._pool_pid = os.getpid()
+                # A fork inherits the parent's bookkeeping but none of its parses
+                self._in_flight = {}
+            return self._pool
+
+    def _run_sweeps(self):
+        # Sweep at start-up, then every sweep_interval seconds until stop()
+        while True:
+            try:
+                self.sweep()
+            except OSError:
+                pass  # the next sweep tries again
+            if self._stop.wait(self.sweep_interval):
+                return
+
+    def _files(self, kind):
+        # Every file under one of the store's directories
+        for root, _, names in os.walk(os.path.join(self.directory, kind)):
+            for name in names:
+                yield os.path.join(root, name)
+
+    def _older_than(self, path, seconds):
+        try:
+            return time.time() - os.path.getmtime(path) > seconds
+        except FileNotFoundError:
+            return False
+
+    def _remove(self, path):
+        # Another process's sweep or poll may have got there first
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def _result_path(self, digest):
+        return os.path.join(self.directory, 'results', digest[:2], digest + '.json')
+
+    def _job_path(self, job_id):
+        return os.path.join(self.directory, 'jobs', job_id + '.json')
+
+    def _read_json(self, path):
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _write_json(self, path, value):
+        # Write to a temporary file and rename so readers never see half a file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as tmp:
+            json.dump(value, tmp)
+        os.replace(tmp_path, path)
+
+    def _bump(self, key):
+        with self._lock:
+            self._stats[key] += 1
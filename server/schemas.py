@@ -0,0 +1,126 @@
+"""Declarative request schemas.
+
+A Schema is declared once, at import, from Field definitions and compiled into
+a tuple of per-field steps (name, coercer, default, messages). Parsing a request
+is then a single loop over those steps: every field is looked up, defaulted or
+coerced, including dates, and every error is collected rather than stopping at
+the first one.
+
+Invalid requests are rejected with 400 and a body of the form
+{'message': '<all errors, joined>', 'errors': {field: message}}.
+"""
+from datetime import date, datetime
+
+from flask import request
+from flask_restful import abort
+
+
+def _to_str(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_float(value):
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return float(value)
+
+
+def _to_int(value):
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+
+def _to_date(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    value = str(value)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        # Also accept what the old strptime('%Y-%m-%d') parsing did, e.g. 2026-1-5
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+COERCERS = {
+    str: (_to_str, None),
+    float: (_to_float, 'must be a number'),
+    int: (_to_int, 'must be an integer'),
+    date: (_to_date, 'must be a date (YYYY-MM-DD)'),
+    datetime: (_to_datetime, 'must be an ISO 8601 date and time'),
+}
+
+
+class Field:
+    def __init__(self, name, type=str, required=False, default=None, message=None):
+        # message replaces the default "<name> is required" / "<name> must be ..." text
+        if type not in COERCERS:
+            raise TypeError(f'Unsupported field type {type!r} for {name}')
+        self.name = name
+        self.type = type
+        self.required = required
+        self.default = default
+        self.message = message
+
+
+class Schema:
+    def __init__(self, *fields):
+        steps = []
+        for field in fields:
+            coerce, invalid = COERCERS[field.type]
+            steps.append((
+                field.name,
+                coerce,
+                field.required,
+                field.type is not str,
+                field.default,
+                field.message or f'{field.name} is required',
+                field.message or f'{field.name} {invalid}',
+                field.message or f'{field.name} is required' if field.required else f'{field.name} cannot be null'
+            ))
+        self._steps = tuple(steps)
+        self.names = tuple(step[0] for step in steps)
+
+    def load(self, data, blank_as_missing=False, partial=False):
+        # Return (values, errors) for a mapping. Missing or null fields take their default, as
+        # do empty strings for non-text fields (an empty date input) and, with
+        # blank_as_missing, for every field (CSV cells). With partial, fields absent from the
+        # mapping are left out of the values instead (an update of some fields), and a null
+        # clears a field: it is stored as None, or rejected for a required field or one with a
+        # default, which can't be cleared.
+        values = {}
+        errors = {}
+        for name, coerce, required, blank_is_missing, default, missing_message, invalid_message, null_message \
+                in self._steps:
+            if partial and name not in data:
+                continue
+            value = data.get(name)
+            if value is None or (value == '' and (blank_is_missing or blank_as_missing)):
+                if partial and (required or default is not None):
+                    errors[name] = null_message
+                elif required:
+                    errors[name] = missing_message
+                values[name] = None if partial else default
+                continue
+            try:
+                values[name] = coerce(value)
+            except (TypeError, ValueError):
+                errors[name] = invalid_message
+        return values, errors
+
+    def parse(self):
+        # Validate the current request's JSON object body (or form/query values) and return
+        # the coerced values; abort with 400 listing every invalid field otherwise
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = request.values
+        values, errors = self.load(data)
+        if errors:
+            abort(400, message='; '.join(errors.values()), errors=errors)
+        return values
@@ -0,0 +1,126 @@
+"""Full-text search over job applications and target companies.
+
+On SQLite each table gets an FTS5 shadow table kept in sync by triggers. The
+owning user is indexed as a token ("u<user_id>") so a per-user search is an
+intersection of posting lists instead of a filter over every match. On
+PostgreSQL each table gets a generated tsvector column with a GIN index, and
+the owner goes into the tsvector the same way, as an "@u<user_id>" lexeme the
+text parser never produces, so a common word is not looked up for every
+tenant and then filtered. Adding the generated column rewrites the table
+under an exclusive lock; on a large table, install it in a maintenance window.
+
+Either way the write paths in app.py don't need to do anything: triggers and
+generated columns also cover bulk inserts and batch updates.
+"""
+import re
+
+SEARCH_COLUMNS = {
+    'applications': ('company', 'role_title', 'location', 'application_source'),
+    'companies': ('name', 'role_title', 'industry'),
+}
+
+MAX_TERMS = 8
+
+
+def search_terms(query):
+    # Reduce free text to plain word tokens so user input can never inject query syntax
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def install_search_index(connection, applications_table, companies_table=None):
+    # Create the search structures for the given tables if missing and index existing rows
+    tables = [('applications', applications_table)]
+    if companies_table:
+        tables.append(('companies', companies_table))
+    for kind, table in tables:
+        if connection.dialect.name == 'postgresql':
+            _install_postgresql(connection, table, SEARCH_COLUMNS[kind])
+        else:
+            _install_sqlite(connection, table, SEARCH_COLUMNS[kind])
+
+
+def drop_search_index(connection, applications_table, companies_table=None):
+    for table in filter(None, (applications_table, companies_table)):
+        if connection.dialect.name == 'postgresql':
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS ix_{table}_search_vector')
+            connection.exec_driver_sql(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+        else:
+            for suffix in ('ai', 'ad', 'au'):
+                connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {table}_search_{suffix}')
+            connection.exec_driver_sql(f'DROP TABLE IF EXISTS {table}_search')
+
+
+def _install_sqlite(connection, table, columns):
+    fts = f'{table}_search'
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).first()
+    if exists:
+        return
+
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    connection.exec_driver_sql(f"CREATE VIRTUAL TABLE {fts} USING fts5(owner, {column_list}, tokenize='unicode61', prefix='2 3')")
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, owner, {column_list}) VALUES (new.id, 'u' || new.user_id, {new_values});
+        END
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = old.id;
+        END
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF user_id, {column_list} ON {table} BEGIN
+            DELETE FROM {fts} WHERE rowid = old.id;
+            INSERT INTO {fts} (rowid, owner, {column_list}) VALUES (new.id, 'u' || new.user_id, {new_values});
+        END
+    """)
+    connection.exec_driver_sql(
+        f"INSERT INTO {fts} (rowid, owner, {column_list}) SELECT id, 'u' || user_id, {column_list} FROM {table}"
+    )
+
+
+def _install_postgresql(connection, table, columns):
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+    connection.exec_driver_sql(
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document}) "
+        f"|| array_to_tsvector(ARRAY['@u' || user_id::text])) STORED"
+    )
+    connection.exec_driver_sql(
+        f'CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)'
+    )
+
+
+def search_ids(connection, table, kind, user_id, terms, limit, offset=0):
+    # Return [(id, score)] for the user's rows matching every term, best first. Only the last
+    # term matches as a prefix (search-as-you-type); full-word terms can seek through the
+    # index, while prefix expansion has to merge every matching token's postings.
+    if not terms:
+        return []
+
+    if connection.dialect.name == 'postgresql':
+        tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+        # The owner lexeme only narrows the GIN lookup; ranking uses the search terms alone.
+        # user_id = ... still prunes partitions.
+        rows = connection.exec_driver_sql(
+            f"SELECT id, ts_rank_cd(search_vector, query) AS score "
+            f"FROM {table}, to_tsquery('simple', %(query)s) AS query "
+            f"WHERE user_id = %(user_id)s AND search_vector @@ (query && CAST(%(owner)s AS tsquery)) "
+            f"ORDER BY score DESC, id LIMIT %(limit)s OFFSET %(offset)s",
+            {'query': tsquery, 'owner': f"'@u{int(user_id)}'", 'user_id': user_id, 'limit': limit, 'offset': offset}
+        )
+    else:
+        columns = ' '.join(SEARCH_COLUMNS[kind])
+        match = 'owner : u{} AND {{{}}} : ({})'.format(
+            int(user_id), columns, ' AND '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        )
+        # bm25() is lower for better matches
+        rows = connection.exec_driver_sql(
+            f"SELECT rowid, -bm25({table}_search) AS score FROM {table}_search "
+            f"WHERE {table}_search MATCH ? ORDER BY bm25({table}_search), rowid LIMIT ? OFFSET ?",
+            (match, limit, offset)
+        )
+    return [(row[0], float(row[1])) for row in rows]
@@ -0,0 +1,95 @@
+"""Row serializers and the JSON representation used by the API.
+
+A RowSerializer is built once per model with the fields it exposes. Building it
+resolves the columns to select and which of them are dates, so turning a row
+into a dict is a zip plus an isoformat() per date field. It works on column
+rows (db.session.query(*serializer.columns)), which skips building ORM
+instances, and on ORM instances through instance().
+
+Dicts that only go to dumps() can keep their date values as is
+(rows(..., native_dates=True)): orjson encodes them natively to the same
+strings isoformat() gives, which is most of the per-row cost saved.
+
+Responses are encoded with orjson when it is installed and with the standard
+library otherwise; both produce the same JSON for the types the API returns.
+"""
+import json
+from operator import attrgetter
+
+import sqlalchemy as sa
+from flask import make_response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class RowSerializer:
+    def __init__(self, model, fields):
+        # fields: attribute names, or (output key, attribute name) pairs
+        fields = [(field, field) if isinstance(field, str) else field for field in fields]
+        self.model = model
+        self.keys = tuple(key for key, _ in fields)
+        self.attributes = tuple(attribute for _, attribute in fields)
+        self.columns = tuple(getattr(model, attribute) for attribute in self.attributes)
+        self._temporal = tuple(
+            index for index, column in enumerate(self.columns)
+            if isinstance(column.type, (sa.Date, sa.DateTime, sa.Time))
+        )
+        getter = attrgetter(*self.attributes)
+        self._getter = getter if len(self.attributes) > 1 else lambda obj: (getter(obj),)
+
+    def only(self, *keys):
+        # A serializer for a subset of this one's fields, in the given order
+        by_key = dict(zip(self.keys, self.attributes))
+        return RowSerializer(self.model, [(key, by_key[key]) for key in keys])
+
+    def row(self, row):
+        # `row` holds the values of self.columns in order
+        if self._temporal:
+            row = list(row)
+            for index in self._temporal:
+                value = row[index]
+                if value is not None:
+                    row[index] = value.isoformat()
+        return dict(zip(self.keys, row))
+
+    def rows(self, rows, native_dates=False):
+        # Without orjson, converting here is cheaper than the stdlib encoder's default() hook
+        if (native_dates and orjson is not None) or not self._temporal:
+            keys = self.keys
+            return [dict(zip(keys, values)) for values in rows]
+        row = self.row
+        return [row(values) for values in rows]
+
+    def instance(self, obj):
+        return self.row(self._getter(obj))
+
+
+def _default(value):
+    # Types json/orjson don't handle natively (e.g. pandas/numpy scalars in the tracker sheets)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    # Encode `data` as compact JSON bytes
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib encoder decide
+            pass
+    return json.dumps(data, default=_default, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def output_json(data, code, headers=None):
+    # Flask-RESTful representation for application/json
+    response = make_response(dumps(data) + b'\n', code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
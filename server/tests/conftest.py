@@ -0,0 +1,59 @@
+"""Shared fixtures. The app is imported once, against a temporary SQLite database and
+temporary directories for everything it writes to disk, with cheap password hashing.
+
+Set TEST_DATABASE_URL to a scratch PostgreSQL database to run the suite against
+PostgreSQL instead; its tables are created and written to."""
+import os
+import tempfile
+import uuid
+
+import pytest
+
+TMP_DIR = tempfile.mkdtemp(prefix='jobtracker-tests-')
+os.environ.update({
+    'USE_POSTGRESQL': 'false',
+    'SQLITE_DATABASE_URL': f"sqlite:///{os.path.join(TMP_DIR, 'test.db')}",
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    'PASSWORD_HASH_WORKERS': '0',
+    'AUDIT_SPOOL_PATH': os.path.join(TMP_DIR, 'audit_spool.jsonl'),
+    'AUDIT_ARCHIVE_DIR': os.path.join(TMP_DIR, 'audit_archive'),
+    'RESPONSE_CACHE_PATH': os.path.join(TMP_DIR, 'response_cache.db'),
+    'RESUME_STORE_DIR': os.path.join(TMP_DIR, 'resume_store'),
+})
+if os.environ.get('TEST_DATABASE_URL'):
+    os.environ.update({'USE_POSTGRESQL': 'true', 'DATABASE_URL': os.environ['TEST_DATABASE_URL']})
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    with app_module.app.app_context():
+        yield app_module.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class TestUser:
+    def __init__(self, client):
+        name = f'test-{uuid.uuid4().hex[:12]}'
+        response = client.post('/api/auth/signup', json={'username': name, 'email': f'{name}@example.com',
+                                                         'password': 'password123'})
+        assert response.status_code == 201, response.get_json()
+        self.username = name
+        self.id = app_module.User.query.filter_by(username=name).one().id
+        self.headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def user(client):
+    # A freshly signed-up user; tests work on their own user's rows, so they don't need cleanup
+    return TestUser(client)
+
+
+@pytest.fixture
+def make_user(client):
+    return lambda: TestUser(client)
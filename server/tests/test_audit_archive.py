@@ -0,0 +1,117 @@
+"""The audit archive: per-user monthly files, reads that only touch the user's own files, and
+archives that stay readable when a file is torn."""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import audit_archive as audit_archive_module
+from app import AuditLog, db
+from audit_archive import AuditArchive
+
+
+def record(row_id, user_id, timestamp):
+    return {'id': row_id, 'user_id': user_id, 'action': 'UPDATE', 'timestamp': timestamp}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = AuditArchive(str(tmp_path / 'archive'))
+    archive.write_batch([record(1, 7, '2026-01-05T10:00:00'), record(2, 7, '2026-02-01T09:00:00'),
+                         record(3, 8, '2026-02-02T09:00:00'), record(4, 7, '2026-02-03T09:00:00')])
+    archive.finish_batch()
+    archive.write_batch([record(5, 7, '2026-03-01T00:00:00'), record(6, 8, '2026-03-02T00:00:00')])
+    archive.finish_batch()
+    return archive
+
+
+def ids(rows):
+    return [row['id'] for row in rows]
+
+
+def test_rows_page_newest_first_from_the_users_own_files(archive, monkeypatch):
+    opened = []
+    read_records = audit_archive_module._read_records
+    monkeypatch.setattr(audit_archive_module, '_read_records', lambda path: opened.append(path) or read_records(path))
+
+    assert ids(archive.read_before(7, None, 10)) == [5, 4, 2, 1]
+    assert all(os.path.dirname(path) == archive.user_directory(7) for path in opened)
+    assert sorted(os.listdir(archive.user_directory(7))) == [
+        'audit-2026-01.jsonl.gz', 'audit-2026-02.jsonl.gz', 'audit-2026-03.jsonl.gz']
+
+    # A page filled by newer months doesn't open older ones
+    opened.clear()
+    assert ids(archive.read_before(7, None, 1)) == [5]
+    assert [os.path.basename(path) for path in opened] == ['audit-2026-03.jsonl.gz']
+
+    assert ids(archive.read_before(7, (datetime(2026, 2, 3, 9), 4), 2)) == [2, 1]
+    assert ids(archive.read_before(8, (datetime(2026, 3, 2), 6), 10)) == [3]
+    assert archive.read_before(9, None, 10) == []
+
+
+def test_torn_trailing_member_is_skipped_and_then_rebuilt(archive):
+    path = os.path.join(archive.user_directory(7), 'audit-2026-02.jsonl.gz')
+    torn = gzip.compress(json.dumps(record(99, 7, '2026-02-20T00:00:00')).encode() + b'\n')
+    with open(path, 'ab') as file:
+        file.write(torn[:len(torn) // 2])
+
+    assert ids(archive.read_before(7, None, 10)) == [5, 4, 2, 1]
+
+    archive.write_batch([record(10, 7, '2026-02-10T00:00:00')])
+    archive.finish_batch()
+    assert ids(archive.read_before(7, None, 10)) == [5, 10, 4, 2, 1]
+    with gzip.open(path, 'rt') as file:
+        assert [json.loads(line)['id'] for line in file] == [2, 4, 10]
+    assert not any(name.endswith('.tmp') for name in os.listdir(archive.user_directory(7)))
+
+
+def test_shared_monthly_files_are_read_and_split(tmp_path):
+    # The layout of earlier releases: one file per month for every user, indexed in the manifest
+    archive = AuditArchive(str(tmp_path / 'archive'))
+    os.makedirs(archive.directory)
+    with gzip.open(os.path.join(archive.directory, 'audit-2025-12.jsonl.gz'), 'wt') as file:
+        for row in (record(1, 7, '2025-12-01T00:00:00'), record(2, 8, '2025-12-02T00:00:00'),
+                    record(3, 7, '2025-12-03T00:00:00')):
+            file.write(json.dumps(row) + '\n')
+    with open(archive.manifest_path, 'w') as manifest:
+        json.dump({'files': {'audit-2025-12.jsonl.gz': {'users': {
+            '7': ['2025-12-01T00:00:00', '2025-12-03T00:00:00', 2],
+            '8': ['2025-12-02T00:00:00', '2025-12-02T00:00:00', 1]}}}, 'pending_ids': []}, manifest)
+    archive.write_batch([record(4, 7, '2026-01-01T00:00:00')])
+    archive.finish_batch()
+
+    assert ids(archive.read_before(7, None, 10)) == [4, 3, 1]
+    assert archive.split_legacy_files() == 3
+    assert not os.path.exists(os.path.join(archive.directory, 'audit-2025-12.jsonl.gz'))
+    assert archive.load_manifest()['files'] == {}
+    assert ids(archive.read_before(7, None, 10)) == [4, 3, 1]
+    assert ids(archive.read_before(8, None, 10)) == [2]
+
+
+def test_archived_rows_page_after_the_live_ones(app, client, user):
+    now = datetime.utcnow()
+    db.session.execute(AuditLog.__table__.insert(), [
+        {'user_id': user.id, 'action': 'UPDATE', 'table_name': 'job_application', 'record_id': str(index),
+         'timestamp': now - timedelta(days=200 + index)}
+        for index in range(5)
+    ])
+    db.session.commit()
+    live = AuditLog.query.filter_by(user_id=user.id).count()
+
+    result = app.test_cli_runner().invoke(args=['archive-audit-log', '--older-than-days', '100'])
+    assert result.exit_code == 0, result.output
+    assert AuditLog.query.filter_by(user_id=user.id).count() == live - 5
+
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/audit-log', headers=user.headers, query_string={
+            'limit': 2, 'include_archived': 'true', **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        seen.extend(log['record_id'] for log in body['logs'] if log['table_name'] == 'job_application')
+        cursor = body['pagination']['next_cursor']
+        if not cursor:
+            break
+    assert seen == ['0', '1', '2', '3', '4']
@@ -0,0 +1,51 @@
+"""/api/audit-log: offset pages by default, as before cursors existed, and cursor pages on request."""
+from datetime import datetime, timedelta
+
+from app import AuditLog, db
+
+
+def seed_audit_rows(user_id, count):
+    now = datetime.utcnow()
+    db.session.execute(AuditLog.__table__.insert(), [
+        {'user_id': user_id, 'action': 'UPDATE', 'table_name': 'job_application', 'record_id': str(index),
+         'timestamp': now - timedelta(minutes=index)}
+        for index in range(count)
+    ])
+    db.session.commit()
+    return AuditLog.query.filter_by(user_id=user_id).count()
+
+
+def get_logs(client, user, **params):
+    response = client.get('/api/audit-log', headers=user.headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_default_response_is_offset_page_one(client, user):
+    total = seed_audit_rows(user.id, 25)
+
+    body = get_logs(client, user)
+    assert body['pagination'] == {'page': 1, 'per_page': 10, 'total': total, 'pages': -(-total // 10)}
+    assert len(body['logs']) == 10
+    timestamps = [log['timestamp'] for log in body['logs']]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+    body = get_logs(client, user, page=3, per_page=10)
+    assert len(body['logs']) == total - 20
+
+
+def test_cursor_mode_is_opt_in(client, user):
+    total = seed_audit_rows(user.id, 25)
+
+    seen, cursor = [], None
+    while True:
+        body = get_logs(client, user, limit=7, **({'cursor': cursor} if cursor else {}))
+        assert set(body['pagination']) == {'limit', 'next_cursor'}
+        seen.extend(log['id'] for log in body['logs'])
+        cursor = body['pagination']['next_cursor']
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == total
+
+    # The total is opt-in here too, read from the maintained counter
+    assert 'total' in get_logs(client, user, limit=5, include_total='true')['pagination']
@@ -0,0 +1,66 @@
+"""AsyncAuditWriter: records spooled by an earlier run are replayed by the flush thread, not by
+the request that happens to start the writer."""
+import json
+import threading
+import time
+from datetime import datetime
+
+from audit_writer import AsyncAuditWriter
+
+
+def write_spool(path, count):
+    with open(path, 'w') as spool:
+        for index in range(count):
+            spool.write(json.dumps({'id': f'spooled-{index}', 'timestamp': '2026-10-01T12:00:00'}) + '\n')
+
+
+def test_spool_replays_on_the_writer_thread(tmp_path):
+    spool_path = str(tmp_path / 'spool.jsonl')
+    write_spool(spool_path, 3)
+    release = threading.Event()
+    written = []
+
+    def write_batch(records):
+        release.wait(5)
+        written.extend(records)
+
+    writer = AsyncAuditWriter(write_batch, flush_interval=0.01, spool_path=spool_path)
+    started = time.perf_counter()
+    writer.submit({'id': 'new', 'timestamp': datetime(2026, 10, 18)})
+    # The first submit returns while the replay is still blocked in write_batch
+    assert time.perf_counter() - started < 1
+    assert written == []
+
+    release.set()
+    writer.stop()
+    assert [record['id'] for record in written] == ['spooled-0', 'spooled-1', 'spooled-2', 'new']
+    assert written[0]['timestamp'] == datetime(2026, 10, 1, 12)
+    assert not (tmp_path / 'spool.jsonl').exists() and not (tmp_path / 'spool.jsonl.replay').exists()
+    assert writer.metrics()['replayed'] == 3
+
+
+def test_failed_replay_keeps_the_unwritten_records(tmp_path):
+    spool_path = str(tmp_path / 'spool.jsonl')
+    write_spool(spool_path, 5)
+    written = []
+
+    def write_batch(records):
+        if records[0]['id'] == 'spooled-2':
+            raise RuntimeError('database unavailable')
+        written.extend(records)
+
+    writer = AsyncAuditWriter(write_batch, batch_size=2, flush_interval=0.01, spool_path=spool_path)
+    writer.start()
+    writer.stop()
+    assert [record['id'] for record in written] == ['spooled-0', 'spooled-1']
+    with open(spool_path + '.replay') as replay:
+        assert [json.loads(line)['id'] for line in replay] == ['spooled-2', 'spooled-3', 'spooled-4']
+
+    # The next start finishes the earlier replay before anything spooled since
+    write_spool(spool_path, 1)
+    written.clear()
+    writer = AsyncAuditWriter(lambda records: written.extend(records), flush_interval=0.01, spool_path=spool_path)
+    writer.start()
+    writer.stop()
+    assert [record['id'] for record in written] == ['spooled-2', 'spooled-3', 'spooled-4', 'spooled-0']
+    assert not (tmp_path / 'spool.jsonl').exists() and not (tmp_path / 'spool.jsonl.replay').exists()
@@ -0,0 +1,37 @@
+"""Token errors are answered by flask_jwt_extended's handlers; any other unhandled error is a
+plain 500 rather than an exception propagated to the WSGI server."""
+from datetime import timedelta
+
+from flask_jwt_extended import create_access_token
+
+import app as app_module
+
+
+def test_missing_expired_malformed_and_revoked_tokens(app, client, user):
+    response = client.get('/api/applications')
+    assert response.status_code == 401
+    assert 'msg' in response.get_json()
+
+    expired = create_access_token(identity=str(user.id), expires_delta=timedelta(seconds=-1))
+    response = client.get('/api/applications', headers={'Authorization': f'Bearer {expired}'})
+    assert response.status_code == 401
+    assert response.get_json() == {'msg': 'Token has expired'}
+
+    response = client.get('/api/applications', headers={'Authorization': 'Bearer not-a-token'})
+    assert response.status_code == 422
+
+    assert client.post('/api/auth/logout', headers=user.headers).status_code == 200
+    response = client.get('/api/applications', headers=user.headers)
+    assert response.status_code == 401
+    assert response.get_json() == {'msg': 'Token has been revoked'}
+
+
+def test_other_errors_are_500s(app, client, user, monkeypatch):
+    assert not app.config.get('PROPAGATE_EXCEPTIONS')
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(app_module, 'dashboard_payload', broken)
+    response = client.get('/api/tracker/dashboard', headers=user.headers)
+    assert response.status_code == 500
@@ -0,0 +1,46 @@
+"""Batch updates change only the fields they name: a null clears an optional field and is
+rejected for a required or defaulted one, instead of silently resetting it to its default."""
+from app import JobApplication, db
+
+
+def create_application(client, user, **data):
+    response = client.post('/api/applications/batch', headers=user.headers, json=[{'op': 'create', 'data': dict(
+        {'company': 'Acme', 'role_title': 'Engineer'}, **data)}])
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['results'][0]['id']
+
+
+def update(client, user, record_id, data):
+    response = client.post('/api/applications/batch', headers=user.headers,
+                           json=[{'op': 'update', 'id': record_id, 'data': data}])
+    return response.status_code, response.get_json()['results'][0]
+
+
+def test_update_null_clears_optional_fields(client, user):
+    record_id = create_application(client, user, status='Interview', location='Remote', applied_date='2026-03-14')
+
+    status, result = update(client, user, record_id, {'location': None, 'applied_date': ''})
+    assert status == 200, result
+    application = db.session.get(JobApplication, record_id)
+    db.session.refresh(application)
+    assert application.location is None
+    assert application.applied_date is None
+    # Fields the update didn't name keep their values
+    assert application.status == 'Interview'
+    assert application.company == 'Acme'
+
+
+def test_update_null_is_rejected_for_required_and_defaulted_fields(client, user):
+    record_id = create_application(client, user, status='Interview')
+
+    status, result = update(client, user, record_id, {'status': None, 'company': None})
+    assert status == 400
+    assert result['errors'] == {'status': 'status cannot be null', 'company': 'Company name is required'}
+    application = db.session.get(JobApplication, record_id)
+    db.session.refresh(application)
+    assert (application.status, application.company) == ('Interview', 'Acme')
+
+
+def test_create_null_still_takes_the_default(client, user):
+    record_id = create_application(client, user, status=None)
+    assert db.session.get(JobApplication, record_id).status == 'Applied'
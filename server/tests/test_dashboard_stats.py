@@ -0,0 +1,210 @@
+"""The maintained dashboard counters must give what the original per-row Python loop gave."""
+import random
+from datetime import date, datetime, timedelta
+
+import app as app_module
+from app import JobApplication, UserDailyApplicationCount, UserDashboardStats, db
+
+
+def baseline_dashboard(user_id):
+    # A copy of DashboardAPI.get before the counters: every application loaded and counted in Python.
+    # Note its rules: "this week" is any applied_date at most 7 days ago, future dates included, and
+    # a status mentioning both an interview and an offer counts as an interview only.
+    applications = JobApplication.query.filter_by(user_id=user_id).all()
+
+    if not applications:
+        return {
+            'total_applications': 0,
+            'applications_this_week': 0,
+            'interviews_scheduled': 0,
+            'offers_received': 0,
+            'high_priority_applications': 0,
+            'average_hourly_rate': 0.0,
+            'applications_today': 0,
+            'success_rate': 0.0
+        }
+
+    total_applications = len(applications)
+    applications_this_week = 0
+    interviews_scheduled = 0
+    offers_received = 0
+    high_priority_applications = 0
+
+    today = datetime.now().date()
+    valid_rates = [app.hourly_rate for app in applications if app.hourly_rate is not None]
+    avg_hourly_rate = sum(valid_rates) / len(valid_rates) if valid_rates else 0.0
+    applications_today = 0
+
+    for app in applications:
+        if app.applied_date and (today - app.applied_date).days <= 7:
+            applications_this_week += 1
+
+        if app.status and 'interview' in app.status.lower():
+            interviews_scheduled += 1
+        elif app.status and 'offer' in app.status.lower():
+            offers_received += 1
+
+        if app.priority_level and app.priority_level.lower() == 'high':
+            high_priority_applications += 1
+
+        if app.applied_date and app.applied_date == today:
+            applications_today += 1
+
+    success_rate = (offers_received / max(total_applications, 1)) * 100
+
+    return {
+        'total_applications': total_applications,
+        'applications_this_week': applications_this_week,
+        'interviews_scheduled': interviews_scheduled,
+        'offers_received': offers_received,
+        'high_priority_applications': high_priority_applications,
+        'average_hourly_rate': round(avg_hourly_rate, 2),
+        'applications_today': applications_today,
+        'success_rate': round(success_rate, 2)
+    }
+
+
+def dashboard(client, user):
+    response = client.get('/api/tracker/dashboard', headers=user.headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_counters_follow_creates_updates_and_deletes(client, user):
+    today = date.today()
+    created = []
+    for index, (status, priority, rate, applied) in enumerate([
+        ('Applied', 'High', 50.0, today),
+        ('Interview Scheduled', 'Low', None, today - timedelta(days=3)),
+        ('Offer', 'high', 80.0, today - timedelta(days=30)),
+        ('Rejected', None, 65.5, None),
+    ]):
+        response = client.post('/api/applications', headers=user.headers, json={
+            'company': f'Company {index}', 'role_title': 'Engineer', 'status': status, 'priority_level': priority,
+            'hourly_rate': rate, 'applied_date': applied.isoformat() if applied else None
+        })
+        assert response.status_code == 201, response.get_json()
+        created.append(response.get_json()['application']['id'])
+        assert dashboard(client, user) == baseline_dashboard(user.id)
+
+    response = client.put(f'/api/applications/{created[0]}', headers=user.headers,
+                          json={'company': 'Company 0', 'role_title': 'Engineer', 'status': 'Offer',
+                                'priority_level': 'Low', 'applied_date': (today - timedelta(days=1)).isoformat()})
+    assert response.status_code == 200, response.get_json()
+    assert dashboard(client, user) == baseline_dashboard(user.id)
+
+    assert client.delete(f'/api/applications/{created[1]}', headers=user.headers).status_code == 200
+    assert dashboard(client, user) == baseline_dashboard(user.id)
+    assert dashboard(client, user)['total_applications'] == 3
+
+
+def test_startup_backfill_seeds_users_without_counters(client, user):
+    # Applications written while the counter tables didn't exist (or by a path that bypasses them)
+    now = datetime.utcnow()
+    db.session.execute(JobApplication.__table__.insert(), [
+        {'user_id': user.id, 'company': f'Legacy {index}', 'role_title': 'Engineer',
+         'status': ('Applied', 'Offer', 'Interview')[index % 3], 'priority_level': 'High' if index % 2 else 'Low',
+         'hourly_rate': 40.0 + index, 'applied_date': date.today() - timedelta(days=index),
+         'created_at': now, 'updated_at': now}
+        for index in range(10)
+    ])
+    db.session.commit()
+    assert db.session.get(UserDashboardStats, user.id) is None
+
+    assert user.id in app_module.backfill_dashboard_stats()
+    assert dashboard(client, user) == baseline_dashboard(user.id)
+    assert dashboard(client, user)['total_applications'] == 10
+
+    # Later writes apply their deltas on top of the backfilled counters
+    oldest = JobApplication.query.filter_by(user_id=user.id, company='Legacy 9').one().id
+    assert client.delete(f'/api/applications/{oldest}', headers=user.headers).status_code == 200
+    client.post('/api/applications', headers=user.headers, json={'company': 'New', 'role_title': 'Engineer'})
+    assert dashboard(client, user) == baseline_dashboard(user.id)
+
+    # A second run finds nothing to do
+    assert user.id not in app_module.backfill_dashboard_stats()
+    buckets = UserDailyApplicationCount.query.filter(UserDailyApplicationCount.user_id == user.id,
+                                                     UserDailyApplicationCount.count > 0).count()
+    assert buckets == 9
+
+
+def test_first_counter_writes_for_a_user_do_not_collide(app, user):
+    # Another transaction creates the user's counter and bucket rows while this one is about to:
+    # the insert must wait for it and then increment its rows, not fail on the primary key
+    import threading
+
+    today = date.today()
+    other = db.engine.connect()
+    transaction = other.begin()
+    other.execute(UserDashboardStats.__table__.insert().values(
+        user_id=user.id, **dict.fromkeys(app_module.DASHBOARD_COUNTERS, 0)))
+    other.execute(UserDailyApplicationCount.__table__.insert().values(user_id=user.id, day=today, count=0))
+
+    errors = []
+
+    def write():
+        with app.app_context():
+            try:
+                app_module.update_dashboard_stats(user.id, added=[('Applied', 'High', 10.0, today)])
+                db.session.commit()
+            except Exception as error:
+                errors.append(error)
+                db.session.rollback()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    writer.join(0.3)
+    transaction.commit()
+    other.close()
+    writer.join()
+
+    assert errors == []
+    db.session.expire_all()
+    stats = db.session.get(UserDashboardStats, user.id)
+    assert (stats.total_applications, stats.high_priority_applications, stats.rate_count) == (1, 1, 1)
+    assert db.session.get(UserDailyApplicationCount, (user.id, today)).count == 1
+
+
+STATUSES = ['Applied', 'APPLIED', 'Interview Scheduled', 'phone interview', 'Offer', 'Offer Extended',
+            'Interview after offer', 'Offer after interview', 'Rejected', '', None]
+PRIORITIES = ['High', 'HIGH', 'high', ' high', 'Medium', 'Low', '', None]
+
+
+def random_fields(rng, index):
+    today = date.today()
+    applied = rng.choice([None, today, today + timedelta(days=rng.randint(1, 5)),
+                          today - timedelta(days=rng.randint(0, 20))])
+    return {
+        'company': f'Company {index}', 'role_title': 'Engineer',
+        'status': rng.choice(STATUSES), 'priority_level': rng.choice(PRIORITIES),
+        # Halves add up exactly in any order, so the averages can be compared after rounding
+        'hourly_rate': rng.choice([None, rng.randint(20, 200) / 2]),
+        'applied_date': applied.isoformat() if applied else None,
+    }
+
+
+def test_dashboard_matches_the_baseline_loop_on_random_data(client, user):
+    rng = random.Random(1234)
+    ids = []
+    for index in range(60):
+        response = client.post('/api/applications', headers=user.headers, json=random_fields(rng, index))
+        assert response.status_code == 201, response.get_json()
+        ids.append(response.get_json()['application']['id'])
+    assert dashboard(client, user) == baseline_dashboard(user.id)
+
+    for round_ in range(5):
+        for record_id in rng.sample(ids, 10):
+            response = client.put(f'/api/applications/{record_id}', headers=user.headers,
+                                  json=random_fields(rng, record_id))
+            assert response.status_code == 200, response.get_json()
+        # Batch updates and deletes go through the same counters
+        batch = [{'op': 'update', 'id': record_id, 'data': {'status': rng.choice(STATUSES[:-1])}}
+                 for record_id in rng.sample(ids, 5)]
+        removed = rng.sample(ids, 4)
+        batch += [{'op': 'delete', 'id': record_id} for record_id in removed]
+        batch += [{'op': 'create', 'data': random_fields(rng, 1000 + round_ * 10 + index)} for index in range(3)]
+        response = client.post('/api/applications/batch', headers=user.headers, json=batch)
+        assert response.status_code == 200, response.get_json()
+        ids = [record_id for record_id in ids if record_id not in removed]
+        ids += [result['id'] for result in response.get_json()['results'] if result['op'] == 'create']
+        assert dashboard(client, user) == baseline_dashboard(user.id)
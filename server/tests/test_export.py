@@ -0,0 +1,70 @@
+"""The application export streams: its memory use must not grow with the number of rows.
+
+EXPORT_TEST_ROWS sets the size of the large export (the default keeps the suite quick; set it
+to 1000000 to check a million-row export)."""
+import csv
+import io
+import json
+import os
+import tracemalloc
+from datetime import date, datetime
+
+import pytest
+
+from app import ApplicationExportAPI, JobApplication, db
+
+LARGE_EXPORT_ROWS = int(os.environ.get('EXPORT_TEST_ROWS', 20000))
+
+
+def seed_applications(user_id, count):
+    now = datetime.utcnow()
+    for start in range(0, count, 10000):
+        db.session.execute(JobApplication.__table__.insert(), [dict(
+            user_id=user_id, company=f'Company {i}', role_title='Engineer, Platform', status='Applied',
+            location='Remote', applied_date=date(2026, 1, 1), application_source='Referral',
+            created_at=now, updated_at=now
+        ) for i in range(start, min(start + 10000, count))])
+    db.session.commit()
+
+
+def stream_export(client, user, export_format):
+    # Consume the export chunk by chunk, as a client reading the socket would, and return
+    # (bytes received, lines received, peak traced memory over the request, the first chunk)
+    tracemalloc.start()
+    try:
+        response = client.get('/api/applications/export', headers=user.headers,
+                              query_string={'format': export_format}, buffered=False)
+        assert response.status_code == 200
+        size, lines, first = 0, 0, None
+        for chunk in response.response:
+            chunk = chunk.encode() if isinstance(chunk, str) else chunk
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+            first = chunk if first is None else first
+        response.close()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return size, lines, peak, first
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_export_memory_stays_flat_as_rows_grow(client, make_user, export_format):
+    small_user, large_user = make_user(), make_user()
+    small_rows = ApplicationExportAPI.EXPORT_BATCH_SIZE * 3
+    seed_applications(small_user.id, small_rows)
+    seed_applications(large_user.id, LARGE_EXPORT_ROWS)
+
+    _, _, small_peak, _ = stream_export(client, small_user, export_format)
+    size, lines, large_peak, first = stream_export(client, large_user, export_format)
+
+    # Every row arrived...
+    if export_format == 'ndjson':
+        assert lines == LARGE_EXPORT_ROWS
+        assert json.loads(first.split(b'\n')[0])['company'] == 'Company 0'
+    else:
+        assert lines == LARGE_EXPORT_ROWS + 1
+        assert next(csv.DictReader(io.StringIO(first.decode())))['role_title'] == 'Engineer, Platform'
+    # ...while memory stayed at a few batches' worth, however many rows there were
+    assert large_peak < small_peak * 2
+    assert large_peak < size
@@ -0,0 +1,92 @@
+"""Keyset pagination must visit every row exactly once, including rows whose sort value is NULL, and
+list endpoints only page when the client asks for it."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+from app import JobApplication, TargetCompany, db
+
+
+def walk(query, sort_column, limit, descending):
+    # Follow next_cursor from the first page to the last and return the ids in page order
+    ids, cursor = [], None
+    while True:
+        rows, cursor = app_module.keyset_page(query, sort_column, JobApplication.id, limit, cursor, descending)
+        ids.extend(row.id for row in rows)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize('descending', [True, False])
+def test_pages_cover_rows_with_null_sort_values(app, user, descending):
+    # created_at is nullable and stands in for any nullable sort column
+    now = datetime.utcnow()
+    db.session.execute(JobApplication.__table__.insert(), [
+        {'user_id': user.id, 'company': f'Company {index}', 'role_title': 'Engineer', 'updated_at': now,
+         'created_at': None if index in (1, 2, 5) else now - timedelta(minutes=index % 3)}
+        for index in range(7)
+    ])
+    db.session.commit()
+
+    query = JobApplication.query.filter(JobApplication.user_id == user.id)
+    assert query.filter(JobApplication.created_at.is_(None)).count() == 3
+    expected = [row.id for row in sorted(
+        query.all(),
+        key=lambda row: (row.created_at is not None, row.created_at or now, row.id),
+        reverse=descending)]
+    for limit in (1, 2, 3):
+        assert walk(query, JobApplication.created_at, limit, descending) == expected
+
+
+def test_cursor_with_null_sort_value_round_trips():
+    cursor = app_module.encode_cursor(None, 42)
+    assert app_module.decode_cursor(cursor) == (None, 42)
+
+
+def test_application_cursor_pages_cover_every_row(client, user):
+    for index in range(5):
+        response = client.post('/api/applications', headers=user.headers,
+                               json={'company': f'Company {index}', 'role_title': 'Engineer'})
+        assert response.status_code == 201
+    assert JobApplication.__table__.c.updated_at.nullable is False
+
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/applications', headers=user.headers,
+                              query_string={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        seen.extend(application['id'] for application in body['applications'])
+        cursor = body.get('next_cursor')
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.parametrize('path, model, key', [
+    ('/api/applications', JobApplication, 'applications'),
+    ('/api/target-companies', TargetCompany, 'companies'),
+])
+def test_lists_are_unpaginated_unless_a_page_is_asked_for(client, user, path, model, key):
+    now = datetime.utcnow()
+    count = app_module.DEFAULT_PAGE_SIZE + 10
+    name = 'company' if model is JobApplication else 'name'
+    db.session.execute(model.__table__.insert(), [
+        {'user_id': user.id, name: f'Company {index}', 'role_title': 'Engineer', 'created_at': now,
+         'updated_at': now - timedelta(minutes=index)}
+        for index in range(count)
+    ])
+    db.session.commit()
+
+    def get(**params):
+        response = client.get(path, headers=user.headers, query_string=params)
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()
+
+    # Existing clients send no paging parameters and get every row, as before pagination
+    for body in (get(), get(all='true')):
+        assert len(body[key]) == count and body['next_cursor'] is None
+    body = get(limit=app_module.DEFAULT_PAGE_SIZE)
+    assert len(body[key]) == app_module.DEFAULT_PAGE_SIZE and body['next_cursor']
+    assert len(get(cursor=body['next_cursor'])[key]) == 10
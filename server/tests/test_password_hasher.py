@@ -0,0 +1,34 @@
+"""PasswordHasher's process pool: hashes round-trip through it, and a hash that outlives its
+caller's timeout keeps its slot until it actually finishes."""
+import time
+
+import pytest
+
+from password_hasher import HasherBusy, PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=2, max_pending=1, timeout=0.5)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hashes_in_the_pool(hasher):
+    password_hash = hasher.hash('secret')
+    assert password_hash.startswith('pbkdf2:sha256:1000$')
+    assert hasher.verify(password_hash, 'secret')
+    assert not hasher.verify(password_hash, 'wrong')
+    assert not hasher.needs_rehash(password_hash)
+
+
+def test_timed_out_hash_holds_its_slot_until_it_finishes(hasher):
+    hasher.hash('warm up the pool')
+    started = time.monotonic()
+    with pytest.raises(HasherBusy):
+        hasher._call(time.sleep, 1.5)
+    # Still sleeping in its worker: the other worker is idle, but no slot is free
+    with pytest.raises(HasherBusy):
+        hasher.hash('secret')
+    time.sleep(max(0.0, 1.7 - (time.monotonic() - started)))
+    assert hasher.verify(hasher.hash('secret'), 'secret')
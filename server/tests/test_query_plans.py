@@ -0,0 +1,101 @@
+"""Every per-user API query must be served from an index, with the planner's default settings.
+
+The tables are seeded with enough users that a full scan costs far more than an index
+lookup, then ANALYZEd so the planner works from real statistics, as in production. On
+PostgreSQL a sequential scan of a relation (or partition) smaller than MIN_SCANNED_ROWS is
+allowed: reading a few pages straight through is what the planner should pick there."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+from app import (AuditLog, AuditLogCounter, Interview, JobApplication, TargetCompany, User,
+                 UserDailyApplicationCount, UserDashboardStats, UserDataVersion, db)
+
+SEED_USERS = 1000
+ROWS_PER_USER = 40
+MIN_SCANNED_ROWS = 500
+SEED_PREFIX = 'plan-check-'
+
+with app_module.app.app_context():
+    CHECKS = [name for name, _ in app_module.api_query_plan_checks()]
+
+
+def seq_scanned(plan):
+    # The relations a PostgreSQL JSON plan reads with a sequential scan
+    relations = [plan['Relation Name']] if plan['Node Type'] == 'Seq Scan' else []
+    for child in plan.get('Plans', ()):
+        relations += seq_scanned(child)
+    return relations
+
+
+def full_scans(query):
+    # (plan text, the plan lines or relations that read a whole table)
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'postgresql':
+        text = '\n'.join(row[0] for row in db.session.execute(db.text('EXPLAIN ' + sql)))
+        plan = db.session.execute(db.text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()[0]['Plan']
+        scans = [relation for relation in seq_scanned(plan) if db.session.execute(
+            db.text('SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)'), {'name': relation}
+        ).scalar() >= MIN_SCANNED_ROWS]
+        return text, scans
+    lines = [row[3] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql))]
+    return '\n'.join(lines), [line for line in lines if line.startswith('SCAN ') and 'USING' not in line
+                              and line != 'SCAN CONSTANT ROW']
+
+
+@pytest.fixture(scope='module')
+def seeded_user():
+    with app_module.app.app_context():
+        now = datetime.utcnow()
+        user_ids = db.session.scalars(User.__table__.insert().returning(User.__table__.c.id), [dict(
+            username=f'{SEED_PREFIX}{uuid.uuid4().hex[:12]}', email=f'{uuid.uuid4().hex}@example.invalid',
+            password_hash='!', created_at=now, is_active=True
+        ) for _ in range(SEED_USERS)]).all()
+        rows = range(ROWS_PER_USER)
+        db.session.execute(JobApplication.__table__.insert(), [dict(
+            user_id=user_id, company=f'Company {i}', role_title='Engineer',
+            status=('Applied', 'Interview', 'Rejected')[i % 3], applied_date=(now - timedelta(days=i * 3)).date(),
+            created_at=now, updated_at=now - timedelta(minutes=i)
+        ) for user_id in user_ids for i in rows])
+        db.session.execute(TargetCompany.__table__.insert(), [dict(
+            user_id=user_id, name=f'Company {i}', created_at=now, updated_at=now - timedelta(minutes=i)
+        ) for user_id in user_ids for i in rows[::4]])
+        db.session.execute(Interview.__table__.insert(), [dict(
+            user_id=user_id, company=f'Company {i}', role_title='Engineer', interview_type='Technical',
+            scheduled_at=now + timedelta(days=i), created_at=now, updated_at=now
+        ) for user_id in user_ids for i in rows[::4]])
+        db.session.execute(AuditLog.__table__.insert(), [dict(
+            user_id=user_id, action='UPDATE', table_name='job_application', record_id=str(i),
+            new_values='{}', timestamp=now - timedelta(minutes=i)
+        ) for user_id in user_ids for i in rows])
+        db.session.execute(UserDashboardStats.__table__.insert(), [dict(
+            user_id=user_id, **dict.fromkeys(app_module.DASHBOARD_COUNTERS, 0)
+        ) for user_id in user_ids])
+        db.session.execute(UserDailyApplicationCount.__table__.insert(), [dict(
+            user_id=user_id, day=(now - timedelta(days=i)).date(), count=1
+        ) for user_id in user_ids for i in rows])
+        db.session.execute(AuditLogCounter.__table__.insert(), [dict(
+            user_id=user_id, total=ROWS_PER_USER
+        ) for user_id in user_ids])
+        db.session.commit()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+
+        yield user_ids[SEED_USERS // 2]
+
+        db.session.rollback()
+        seeded = db.session.query(User.id).filter(User.username.like(f'{SEED_PREFIX}%')).scalar_subquery()
+        for model in (JobApplication, TargetCompany, Interview, AuditLog, UserDashboardStats,
+                      UserDailyApplicationCount, AuditLogCounter, UserDataVersion):
+            model.query.filter(model.user_id.in_(seeded)).delete(synchronize_session=False)
+        User.query.filter(User.username.like(f'{SEED_PREFIX}%')).delete(synchronize_session=False)
+        db.session.commit()
+
+
+@pytest.mark.parametrize('name', CHECKS)
+def test_api_query_uses_an_index(app, seeded_user, name):
+    plan, scans = full_scans(dict(app_module.api_query_plan_checks(seeded_user))[name])
+    assert scans == [], plan
@@ -0,0 +1,121 @@
+"""Read routing: GETs go to a replica, a user's own writes are read back from the primary, and
+a failing replica is skipped while its reads are re-run on the primary."""
+import time
+
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+from sqlalchemy import create_engine, event
+
+import app as app_module
+from app import JobApplication, db
+from replica_router import ReplicaRouter
+
+
+def idle_engine(name):
+    # Engines connect lazily, so these never touch a database
+    return create_engine(f'sqlite:///{name}.db')
+
+
+def test_reads_rotate_over_replicas():
+    a, b = idle_engine('a'), idle_engine('b')
+    router = ReplicaRouter([a, b])
+    assert [router.read_engine() for _ in range(4)] == [a, b, a, b]
+    assert router.metrics()['replica_reads'] == 4
+    assert ReplicaRouter([]).read_engine() is None
+
+
+def test_writers_read_from_the_primary_for_the_sticky_window():
+    replica = idle_engine('replica')
+    router = ReplicaRouter([replica], sticky_seconds=0.2)
+    router.note_writes({1})
+    assert router.read_engine(1) is None
+    assert router.read_engine(2) is replica
+    assert router.read_engine() is replica
+    assert router.metrics()['sticky_users'] == 1
+    time.sleep(0.25)
+    assert router.read_engine(1) is replica
+    assert router.metrics()['sticky_reads'] == 1
+
+
+def test_replicas_marked_down_are_skipped_until_the_retry_window_ends():
+    a, b = idle_engine('a'), idle_engine('b')
+    router = ReplicaRouter([a, b], retry_seconds=0.2)
+    router.mark_down(a)
+    assert {router.read_engine() for _ in range(4)} == {b}
+    router.mark_down(b)
+    assert router.read_engine() is None
+    assert router.metrics()['primary_reads'] == 1
+    time.sleep(0.25)
+    assert {router.read_engine() for _ in range(4)} == {a, b}
+    assert router.metrics()['failovers'] == 2
+
+
+@pytest.fixture
+def recording_replica(app, monkeypatch):
+    # A second engine on the primary's database standing in for a replica, recording the
+    # statements it runs, installed as the app's replica router
+    engine = create_engine(app.config['SQLALCHEMY_DATABASE_URI'])
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    monkeypatch.setattr(app_module, 'replica_router', ReplicaRouter([engine], sticky_seconds=60))
+    # A request's replica is chosen once per session, so each request gets a fresh one
+    db.session.remove()
+    yield statements
+    db.session.remove()
+    engine.dispose()
+
+
+def list_applications(client, user):
+    response = client.get('/api/applications', headers=user.headers)
+    db.session.remove()
+    assert response.status_code == 200
+    return [application['company'] for application in response.get_json()['applications']]
+
+
+def test_gets_read_from_the_replica_until_the_user_writes(client, make_user, recording_replica):
+    writer, reader = make_user(), make_user()
+    db.session.remove()
+    assert list_applications(client, writer) == []
+    assert any('job_application' in statement for statement in recording_replica)
+
+    response = client.post('/api/applications', headers=writer.headers,
+                           json={'company': 'Primary Co', 'role_title': 'Engineer'})
+    db.session.remove()
+    assert response.status_code == 201
+    # Writes always go to the primary
+    assert not any(statement.lstrip().upper().startswith(('INSERT', 'UPDATE')) for statement in recording_replica)
+
+    # The writer reads their own write from the primary; other users still use the replica
+    recording_replica.clear()
+    assert list_applications(client, writer) == ['Primary Co']
+    assert recording_replica == []
+    assert list_applications(client, reader) == []
+    assert recording_replica != []
+
+
+def test_failed_replica_read_is_retried_on_the_primary(app, user, monkeypatch, tmp_path):
+    db.session.add(JobApplication(user_id=user.id, company='Primary Co', role_title='Engineer'))
+    db.session.commit()
+    # A replica whose database can't be opened
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter([broken], retry_seconds=60)
+    monkeypatch.setattr(app_module, 'replica_router', router)
+    db.session.remove()
+
+    calls = []
+
+    def view():
+        calls.append(db.session.get_bind())
+        return [row.company for row in JobApplication.query.filter_by(user_id=user.id)]
+
+    with app.test_request_context('/api/applications', headers=user.headers):
+        verify_jwt_in_request()
+        assert app_module.retry_on_primary(view)() == ['Primary Co']
+    db.session.remove()
+
+    # Run once against the replica, then again on the primary, with the replica now skipped
+    assert calls == [broken, db.engine]
+    metrics = router.metrics()
+    assert metrics['failovers'] == 1
+    assert metrics['down'] == [broken.url.render_as_string(hide_password=True)]
+    assert router.read_engine() is None
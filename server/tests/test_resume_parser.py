@@ -0,0 +1,50 @@
+"""Resume parsing: DOCX and PDF text, and compressed content that would inflate past MAX_INFLATED_BYTES."""
+import zipfile
+import zlib
+
+import pytest
+
+from resume_parser import MAX_INFLATED_BYTES, UnsupportedResume, _pdf_fallback_text, parse_resume
+
+WORD = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def write_docx(path, paragraphs, padding=0):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    document = f'<w:document xmlns:w="{WORD}"><w:body>{body}{" " * padding}</w:body></w:document>'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', document)
+    return str(path)
+
+
+def pdf(*streams):
+    objects = b''.join(b'%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream\nendobj\n'
+                       % (index, len(stream), stream) for index, stream in enumerate(streams, 1))
+    return b'%PDF-1.4\n' + objects + b'%%EOF\n'
+
+
+def test_docx_paragraphs_become_lines(tmp_path):
+    result = parse_resume(write_docx(tmp_path / 'resume.docx', ['Jane Doe', 'jane@example.com']))
+    assert (result['format'], result['text'], result['emails']) == ('docx', 'Jane Doe\njane@example.com',
+                                                                    ['jane@example.com'])
+
+
+def test_docx_past_the_limit_is_rejected_before_parsing(tmp_path):
+    # A few kilobytes of zip that inflate to well past the limit
+    path = write_docx(tmp_path / 'bomb.docx', ['Jane Doe'], padding=MAX_INFLATED_BYTES * 5)
+    assert zipfile.ZipFile(path).getinfo('word/document.xml').compress_size < MAX_INFLATED_BYTES / 100
+    with pytest.raises(UnsupportedResume, match='too large'):
+        parse_resume(path)
+
+
+def test_pdf_streams_are_inflated_within_the_limit():
+    text = zlib.compress(b'BT (Jane Doe) Tj T* [(Python) -300 (engineer)] TJ ET')
+    assert _pdf_fallback_text(pdf(text)) == 'Jane Doe\nPython engineer'
+
+    # One stream inflating past the limit, or several that do together
+    padding = b'BT (Jane Doe) Tj ET' + b' ' * MAX_INFLATED_BYTES
+    with pytest.raises(UnsupportedResume, match='too large'):
+        _pdf_fallback_text(pdf(zlib.compress(padding)))
+    half = zlib.compress(b'BT (Jane Doe) Tj ET' + b' ' * (MAX_INFLATED_BYTES // 2))
+    with pytest.raises(UnsupportedResume, match='too large'):
+        _pdf_fallback_text(pdf(half, half, half))
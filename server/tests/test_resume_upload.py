@@ -0,0 +1,138 @@
+"""Resume uploads: parsed in the background behind a job to poll, stored once per content, finished
+at once when the same file comes again, refused past RESUME_MAX_BYTES, and deleted once their jobs
+expire."""
+import io
+import os
+import time
+import uuid
+
+import app as app_module
+from resume_store import ResumeStore
+
+
+def upload(client, user, content, filename='resume.txt'):
+    return client.post('/api/upload-resume', headers=user.headers, content_type='multipart/form-data',
+                       data={'resume': (io.BytesIO(content), filename)})
+
+
+def poll(client, user, location, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(location, headers=user.headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        if body['status'] not in ('queued', 'running') or time.monotonic() > deadline:
+            return response
+        assert response.headers['Location'] == location
+        time.sleep(0.05)
+
+
+def resume_text():
+    # Unique per test, since the store keeps every file it has parsed
+    return f'Jane Doe\njane@example.com\nPython engineer, Flask and PostgreSQL {uuid.uuid4().hex}\n'.encode()
+
+
+def test_upload_is_parsed_in_the_background(client, user):
+    assert app_module.resume_store.workers > 0
+    # A fresh pool takes a moment to start, so the upload is answered before its parse is done
+    app_module.resume_store.shutdown()
+    response = upload(client, user, resume_text())
+    assert response.status_code == 202, response.get_json()
+    body = response.get_json()
+    assert body['status'] in ('queued', 'running')
+    assert response.headers['Location'] == f"/api/upload-resume/{body['id']}"
+
+    response = poll(client, user, response.headers['Location'])
+    body = response.get_json()
+    assert body['status'] == 'done', body
+    assert body['resume']['format'] == 'text'
+    assert body['resume']['emails'] == ['jane@example.com']
+    assert 'Location' not in response.headers
+    assert isinstance(body['jobMatches'], list)
+
+
+def test_same_file_is_stored_once_and_finished_at_once(client, user, make_user):
+    content = resume_text()
+    first = upload(client, user, content)
+    assert poll(client, user, f"/api/upload-resume/{first.get_json()['id']}").get_json()['status'] == 'done'
+    metrics = app_module.resume_store.metrics()
+
+    # Another user, another name: same blob, and the cached parse answers straight away
+    other = make_user()
+    second = upload(client, other, content, filename='cv.txt')
+    assert second.status_code == 200, second.get_json()
+    body = second.get_json()
+    assert (body['status'], body['digest'], body['filename']) == ('done', first.get_json()['digest'], 'cv.txt')
+    assert body['id'] != first.get_json()['id']
+    after = app_module.resume_store.metrics()
+    assert after['deduplicated'] == metrics['deduplicated'] + 1
+    assert after['cache_hits'] == metrics['cache_hits'] + 1
+    assert after['parsed'] == metrics['parsed']
+
+
+def test_jobs_are_only_visible_to_their_owner(client, user, make_user):
+    job_id = upload(client, user, resume_text()).get_json()['id']
+    other = make_user()
+    assert client.get(f'/api/upload-resume/{job_id}', headers=other.headers).status_code == 404
+    assert client.get(f'/api/upload-resume/{job_id}', headers=user.headers).status_code == 200
+    assert client.get('/api/upload-resume/not-a-job', headers=user.headers).status_code == 404
+
+
+def test_oversized_upload_is_refused(client, user, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'RESUME_MAX_BYTES', 1024 * 1024)
+    monkeypatch.setattr(app_module.resume_store, 'max_bytes', 1024 * 1024)
+    uploads = app_module.resume_store.metrics()['uploads']
+
+    # Over the limit but within the multipart slack: the store stops copying it
+    response = upload(client, user, b'x' * (1024 * 1024 + 1))
+    assert response.status_code == 413
+    assert response.get_json()['message'] == 'Resumes are limited to 1 MB'
+    # Far over: refused before the form is read
+    assert upload(client, user, b'x' * (2 * 1024 * 1024)).status_code == 413
+
+    assert app_module.resume_store.metrics()['uploads'] == uploads
+    assert upload(client, user, resume_text()).status_code in (200, 202)
+
+
+def test_sweep_deletes_expired_jobs_and_the_files_only_they_refer_to(tmp_path):
+    store = ResumeStore(str(tmp_path), lambda path: {'length': os.path.getsize(path)}, workers=0,
+                        job_ttl=60, stale_after=30, sweep_interval=0)
+    shared, alone, fresh = (store.put(io.BytesIO(content))[0] for content in (b'shared', b'alone', b'fresh'))
+    expired = [store.submit(1, shared), store.submit(1, alone)]
+    live = store.submit(2, shared)
+    store.put(io.BytesIO(b'fresh'))
+    stored_at = time.time() - 120
+    for job in expired:
+        path = store._job_path(job['id'])
+        store._write_json(path, dict(store._read_json(path), created_at=stored_at))
+    for digest in (shared, alone):
+        os.utime(store.blob_path(digest), (stored_at, stored_at))
+        os.utime(store._result_path(digest), (stored_at, stored_at))
+
+    assert store.sweep() == {'jobs': 2, 'blobs': 1, 'results': 1}
+    assert [store.job(job['id'], 1) for job in expired] == [None, None]
+    assert store.job(live['id'], 2)['status'] == 'done'
+    assert os.path.exists(store.blob_path(shared)) and os.path.exists(store._result_path(shared))
+    assert not os.path.exists(store.blob_path(alone)) and not os.path.exists(store._result_path(alone))
+    # Stored within the grace period but no job yet: an upload between put() and submit()
+    assert os.path.exists(store.blob_path(fresh))
+    assert store.sweep() == {'jobs': 0, 'blobs': 0, 'results': 0}
+
+
+def test_sweep_runs_when_the_store_starts(tmp_path):
+    store = ResumeStore(str(tmp_path), lambda path: {}, workers=0, job_ttl=60, stale_after=0, sweep_interval=0)
+    digest = store.put(io.BytesIO(b'old'))[0]
+    job = store.submit(1, digest)
+    path = store._job_path(job['id'])
+    store._write_json(path, dict(store._read_json(path), created_at=time.time() - 120))
+
+    store.sweep_interval = 3600
+    try:
+        store.start()
+        deadline = time.monotonic() + 10
+        while store.metrics()['last_sweep_at'] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        store.stop()
+    assert not os.path.exists(path) and not os.path.exists(store.blob_path(digest))
+    assert store.metrics()['swept_jobs'] == 1
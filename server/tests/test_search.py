@@ -0,0 +1,78 @@
+"""/api/search: ranked, paginated, and limited to the user's own rows, on FTS5 and on tsvector."""
+from app import JobApplication, TargetCompany, db
+
+
+def add_rows(user_id, applications=(), companies=()):
+    db.session.add_all(JobApplication(user_id=user_id, company=company, role_title=role, location=location)
+                       for company, role, location in applications)
+    db.session.add_all(TargetCompany(user_id=user_id, name=name, role_title=role, industry=industry)
+                       for name, role, industry in companies)
+    db.session.commit()
+
+
+def search(client, user, **params):
+    response = client.get('/api/search', headers=user.headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def companies(results):
+    return [row['company'] for row in results]
+
+
+def test_matches_are_ranked_best_first(client, user):
+    add_rows(user.id, applications=[
+        ('Acme', 'Python Engineer', 'Remote'),
+        ('Python Labs', 'Python Engineer', 'Python City'),
+        ('Globex', 'Java Engineer', 'Remote'),
+        ('Initech', 'Pythonista', 'Berlin'),
+    ])
+
+    # The row matching in three columns comes first; the last term also matches as a prefix
+    body = search(client, user, q='python', type='applications')
+    assert companies(body['applications'])[0] == 'Python Labs'
+    assert sorted(companies(body['applications'])) == ['Acme', 'Initech', 'Python Labs']
+    scores = [row['score'] for row in body['applications']]
+    assert scores == sorted(scores, reverse=True) and scores[-1] > 0
+    # Every term must match
+    assert companies(search(client, user, q='python labs', type='applications')['applications']) == ['Python Labs']
+    assert companies(search(client, user, q='engineer pyth', type='applications')['applications']) == [
+        'Python Labs', 'Acme']
+    assert search(client, user, q='python globex', type='applications')['applications'] == []
+
+
+def test_results_page_with_limit_and_offset(client, user):
+    add_rows(user.id, applications=[(f'Company {index}', 'Data Engineer', 'Remote') for index in range(5)])
+
+    seen = []
+    for offset in range(0, 6, 2):
+        body = search(client, user, q='data', type='applications', limit=2, offset=offset)
+        seen.extend(companies(body['applications']))
+        assert body['pagination']['has_more']['applications'] == (offset + 2 < 5)
+    assert sorted(seen) == [f'Company {index}' for index in range(5)]
+
+
+def test_search_only_sees_the_users_own_rows(client, user, make_user):
+    other = make_user()
+    add_rows(user.id, applications=[('Umbrella', 'Rust Developer', 'Remote')],
+             companies=[('Umbrella Corp', 'Rust Developer', 'Biotech')])
+    # The other user's rows match better and are more numerous
+    add_rows(other.id, applications=[('Rust Works', 'Rust Developer', 'Rust Town')] * 20,
+             companies=[('Rust Foundry', 'Rust Developer', 'Rust')] * 20)
+
+    body = search(client, user, q='rust')
+    assert companies(body['applications']) == ['Umbrella']
+    assert [row['name'] for row in body['companies']] == ['Umbrella Corp']
+    body = search(client, other, q='rust', limit=50)
+    assert set(companies(body['applications'])) == {'Rust Works'} and len(body['applications']) == 20
+    assert {row['name'] for row in body['companies']} == {'Rust Foundry'}
+
+    # The owner is indexed as its own token, which no text can match
+    assert search(client, user, q=f'u{other.id}')['applications'] == []
+    add_rows(user.id, applications=[(f'u{other.id}', 'Tester', 'Remote')])
+    assert search(client, other, q=f'u{other.id}')['applications'] == []
+
+
+def test_query_is_required(client, user):
+    response = client.get('/api/search', headers=user.headers, query_string={'q': ' !? '})
+    assert response.status_code == 400
@@ -0,0 +1,39 @@
+"""The tracker workbook is parsed once per file mtime and parsed again when the file changes."""
+import os
+
+import pandas as pd
+
+from app import _workbook_cache, load_tracker_workbook
+
+
+def write_workbook(path, companies):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({'Company': companies}).to_excel(writer, sheet_name='Application Tracker', index=False)
+
+
+def test_cached_until_the_mtime_changes(tmp_path):
+    path = str(tmp_path / 'tracker.xlsx')
+    write_workbook(path, ['Acme', 'Globex'])
+    try:
+        workbook = load_tracker_workbook(path)
+        assert workbook['payloads']['Application Tracker'] == {'Company': ['Acme', 'Globex']}
+        assert load_tracker_workbook(path) is workbook
+
+        # Rewritten with its old mtime, the file is still answered from the cache
+        mtime_ns = os.stat(path).st_mtime_ns
+        write_workbook(path, ['Initech'])
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        assert load_tracker_workbook(path) is workbook
+
+        # A new mtime is a new parse
+        os.utime(path, ns=(mtime_ns, mtime_ns + 1_000_000_000))
+        workbook = load_tracker_workbook(path)
+        assert workbook['payloads']['Application Tracker'] == {'Company': ['Initech']}
+        assert workbook['sheets'] == {'Application Tracker': {'rows': 1, 'columns': 1}}
+        assert load_tracker_workbook(path) is workbook
+    finally:
+        _workbook_cache.pop(path, None)
+
+
+def test_missing_file_is_an_empty_workbook(tmp_path):
+    assert load_tracker_workbook(str(tmp_path / 'missing.xlsx')) == {'sheets': {}, 'payloads': {}}
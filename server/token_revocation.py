@@ -0,0 +1,85 @@
+"""Revoked JWT ids, checked in memory and persisted in the database.
+
+Every authenticated request asks is_revoked(), which is a set lookup. The set
+only holds revocations that have not expired yet, so it stays small: roughly
+one entry per token refresh or logout within the token lifetime.
+
+Revocations are written to a table first. The insert is the authority for
+refresh token rotation: a jti can only be inserted once, so two requests racing
+to rotate the same refresh token (in any worker) cannot both succeed. Other
+workers pick up new rows on their next sync, at most `sync_interval` seconds
+later; rows are read from a little before the last sync so commits that land
+out of order are not missed.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+
+
+class RevocationStore:
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, get_engine, table, sync_interval=5.0):
+        # get_engine() returns the engine to use; table has jti, token_type, user_id,
+        # expires_at and revoked_at columns
+        self.get_engine = get_engine
+        self.table = table
+        self.sync_interval = sync_interval
+        self._revoked = {}  # jti -> expires_at
+        self._lock = threading.Lock()
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        self._synced_through = None
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._next_sync:
+            self.sync()
+        return jti in self._revoked
+
+    def revoke(self, jti, expires_at, token_type, user_id=None):
+        # Record the revocation; False when the jti was already revoked
+        try:
+            with self.get_engine().begin() as connection:
+                connection.execute(self.table.insert().values(
+                    jti=jti, token_type=token_type, user_id=user_id,
+                    expires_at=expires_at, revoked_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            self._revoked[jti] = expires_at
+            return False
+        self._revoked[jti] = expires_at
+        return True
+
+    def sync(self, force=False):
+        # Load revocations recorded since the last sync, drop expired ones from memory and,
+        # once an hour, from the table. Without force, only when the sync interval has passed.
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_sync and not force:
+                return
+            self._next_sync = now + self.sync_interval
+
+            utcnow = datetime.utcnow()
+            table = self.table
+            query = sa.select(table.c.jti, table.c.expires_at, table.c.revoked_at).where(table.c.expires_at > utcnow)
+            if self._synced_through is not None:
+                # Overlap the previous window to cover clock skew and late commits
+                query = query.where(table.c.revoked_at >= self._synced_through - timedelta(seconds=self.sync_interval * 2 + 60))
+            with self.get_engine().begin() as connection:
+                for jti, expires_at, revoked_at in connection.execute(query):
+                    self._revoked[jti] = expires_at
+                    if self._synced_through is None or revoked_at > self._synced_through:
+                        self._synced_through = revoked_at
+                if now >= self._next_prune:
+                    connection.execute(table.delete().where(table.c.expires_at <= utcnow))
+                    self._next_prune = now + self.PRUNE_INTERVAL
+            if self._synced_through is None:
+                self._synced_through = utcnow
+
+            self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > utcnow}
+
+    def metrics(self):
+        return {'revoked_in_memory': len(self._revoked), 'sync_interval': self.sync_interval}
@@ -41,7 +41,7 @@ const Dashboard = ({ isAuthenticated, handleApiError }) => {
       });
 
       // Fetch recent applications
-      fetch(`${API_BASE_URL}/api/applications`, {
+      fetch(`${API_BASE_URL}/api/applications?limit=10`, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
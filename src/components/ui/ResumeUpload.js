@@ -60,11 +60,32 @@ const ResumeUpload = ({ handleApiError }) => {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
+      // The upload answers with a parse job; poll it until the resume has been parsed
+      let job = await response.json();
+      setUploadProgress(50);
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const poll = await fetch(`http://localhost:5000/api/upload-resume/${job.id}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!poll.ok) {
+          throw new Error(`HTTP error! status: ${poll.status}`);
+        }
+        job = await poll.json();
+      }
+
+      if (job.status === 'failed') {
+        if (handleApiError) {
+          handleApiError('Resume could not be read', job.error);
+        }
+        return;
+      }
       setUploadProgress(100);
       
       // Display search results
-      setSearchResults(data.jobMatches || []);
+      setSearchResults(job.jobMatches || []);
       
     } catch (error) {
       console.error('Error uploading resume:', error);
@@ -88,11 +109,11 @@ const ResumeUpload = ({ handleApiError }) => {
         },
         body: JSON.stringify({
           name: job.company,
-          role_title: job.position,
+          role: job.position,
           website: job.website || '',
-          company_size: job.company_size || '',
+          size: job.company_size || '',
           industry: job.industry || '',
-          remote_policy: job.remote_policy || '',
+          remote_policy: job.remotePolicy || '',
           application_status: 'To Apply',
           priority: 'Medium'
         })
@@ -186,13 +207,15 @@ const ResumeUpload = ({ handleApiError }) => {
                       <td>{job.salaryRange || 'N/A'}</td>
                       <td>{job.remotePolicy || 'N/A'}</td>
                       <td>
-                        <button 
-                          className="btn btn-sm btn-outline-success me-2"
-                          onClick={() => addJobToTargets(job)}
-                          title="Add to Target Companies"
-                        >
-                          <i className="fas fa-plus"></i>
-                        </button>
+                        {job.source !== 'target_company' && (
+                          <button 
+                            className="btn btn-sm btn-outline-success me-2"
+                            onClick={() => addJobToTargets(job)}
+                            title="Add to Target Companies"
+                          >
+                            <i className="fas fa-plus"></i>
+                          </button>
+                        )}
                         <a 
                           href={job.applyLink || '#'} 
                           target="_blank" 
@@ -11,6 +11,52 @@ export const useAuth = () => {
   return context;
 };
 
+// Access tokens last an hour; renew them a little before they expire
+const REFRESH_INTERVAL_MS = 50 * 60 * 1000;
+
+const saveTokens = (data) => {
+  localStorage.setItem('access_token', data.access_token);
+  localStorage.setItem('refresh_token', data.refresh_token);
+};
+
+const clearTokens = () => {
+  localStorage.removeItem('access_token');
+  localStorage.removeItem('refresh_token');
+};
+
+// A refresh token is single use, so concurrent callers share one refresh request
+let pendingRefresh = null;
+
+const refreshTokens = () => {
+  if (!pendingRefresh) {
+    pendingRefresh = (async () => {
+      const refreshToken = localStorage.getItem('refresh_token');
+      if (!refreshToken) {
+        return false;
+      }
+      try {
+        const response = await fetch('http://localhost:5000/api/auth/refresh', {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${refreshToken}`
+          }
+        });
+        if (!response.ok) {
+          return false;
+        }
+        saveTokens(await response.json());
+        return true;
+      } catch (error) {
+        console.error('Token refresh error:', error);
+        return false;
+      }
+    })().finally(() => {
+      pendingRefresh = null;
+    });
+  }
+  return pendingRefresh;
+};
+
 export const AuthProvider = ({ children }) => {
   const [isAuthenticated, setIsAuthenticated] = useState(false);
   const [loading, setLoading] = useState(true);
@@ -37,12 +83,13 @@ export const AuthProvider = ({ children }) => {
       const token = localStorage.getItem('access_token');
       if (token) {
         // Validate the token with the backend
-        const isValid = await validateToken(token);
+        // An expired access token can still be renewed with the refresh token
+        const isValid = await validateToken(token) || await refreshTokens();
         if (isValid) {
           setIsAuthenticated(true);
         } else {
-          // Token is invalid, remove it from localStorage
-          localStorage.removeItem('access_token');
+          // Both tokens are invalid, remove them from localStorage
+          clearTokens();
           setIsAuthenticated(false);
         }
       }
@@ -52,13 +99,22 @@ export const AuthProvider = ({ children }) => {
     checkToken();
   }, []);
 
-  const handleApiCall = async (url, options = {}) => {
-    const token = localStorage.getItem('access_token');
-    if (!token) {
-      throw new Error('No authentication token found');
+  useEffect(() => {
+    if (!isAuthenticated) {
+      return undefined;
     }
+    // Keep the stored access token fresh for pages that read it directly
+    const timer = setInterval(async () => {
+      if (!await refreshTokens()) {
+        clearTokens();
+        setIsAuthenticated(false);
+      }
+    }, REFRESH_INTERVAL_MS);
+    return () => clearInterval(timer);
+  }, [isAuthenticated]);
 
-    const response = await fetch(url, {
+  const handleApiCall = async (url, options = {}) => {
+    const send = (token) => fetch(url, {
       ...options,
       headers: {
         'Authorization': `Bearer ${token}`,
@@ -67,9 +123,20 @@ export const AuthProvider = ({ children }) => {
       }
     });
 
+    const token = localStorage.getItem('access_token');
+    if (!token) {
+      throw new Error('No authentication token found');
+    }
+
+    let response = await send(token);
+    if (response.status === 401 && await refreshTokens()) {
+      // The access token expired or was revoked; retry once with the renewed one
+      response = await send(localStorage.getItem('access_token'));
+    }
+
     if (response.status === 401 || response.status === 422) {
-      // Token might be expired, remove it and update auth state
-      localStorage.removeItem('access_token');
+      // The session can't be renewed, remove the tokens and update auth state
+      clearTokens();
       setIsAuthenticated(false);
       throw new Error('Authentication failed. Please login again.');
     }
@@ -88,7 +155,7 @@ export const AuthProvider = ({ children }) => {
       });
       const data = await response.json();
       if (response.ok) {
-        localStorage.setItem('access_token', data.access_token);
+        saveTokens(data);
         setIsAuthenticated(true);
         return { success: true };
       } else {
@@ -111,7 +178,7 @@ export const AuthProvider = ({ children }) => {
       });
       const data = await response.json();
       if (response.ok) {
-        localStorage.setItem('access_token', data.access_token);
+        saveTokens(data);
         setIsAuthenticated(true);
         return { success: true };
       } else {
@@ -123,9 +190,26 @@ export const AuthProvider = ({ children }) => {
     }
   };
 
-  const logout = () => {
-    localStorage.removeItem('access_token');
+  const logout = async () => {
+    const token = localStorage.getItem('access_token');
+    const refreshToken = localStorage.getItem('refresh_token');
+    clearTokens();
     setIsAuthenticated(false);
+    if (token) {
+      // Revoke both tokens server side; the local session ends either way
+      try {
+        await fetch('http://localhost:5000/api/auth/logout', {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+          },
+          body: JSON.stringify({ refresh_token: refreshToken })
+        });
+      } catch (error) {
+        console.error('Logout error:', error);
+      }
+    }
   };
 
   const value = {